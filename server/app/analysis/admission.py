@@ -0,0 +1,242 @@
+"""
+/api/analysis 입장 제어 (ADMISSION_ENABLED=1 일 때만 동작)
+
+영상 길이로 작업 비용(오디오 분)을 추정하고, 동시에 처리 중인 오디오 분 합계가
+예산을 넘지 않도록 작업을 바로 시작/대기열에 넣기/429로 거절
+- Shorts 레인(짧은 영상)이 긴 영상 레인보다 먼저 배정되고, 예산 일부는 Shorts 전용으로 남겨 둠
+- 예상 대기 시간이 상한을 넘거나 대기열이 가득 차면 Retry-After와 함께 바로 거절
+"""
+
+import asyncio
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import AsyncIterator, Awaitable, Callable, Deque, Dict, Optional
+
+from app.metrics import ADMISSION_AUDIO_MINUTES, ADMISSION_DECISIONS_TOTAL, QUEUE_DEPTH
+
+SHORT_LANE = "short"
+LONG_LANE = "long"
+
+
+class AdmissionRejected(Exception):
+    """입장 거절 (status_code와 재시도 권장 시간 포함)"""
+
+    def __init__(self, status_code: int, detail: str, retry_after: Optional[float] = None):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+@dataclass
+class AdmissionTicket:
+    lane: str
+    cost_minutes: float
+    queued_at: float
+    admitted_at: Optional[float] = None
+    future: Optional[asyncio.Future] = field(default=None, repr=False)
+
+    @property
+    def waited(self) -> float:
+        return (self.admitted_at or time.monotonic()) - self.queued_at
+
+
+class AdmissionController:
+    """
+    오디오 분 예산 기반 입장 제어기
+
+    환경 변수
+      ADMISSION_ENABLED: 1이면 사용 (기본 비활성)
+      ADMISSION_AUDIO_MINUTES_BUDGET: 동시에 처리할 오디오 분 합계 상한 (기본 60)
+      ADMISSION_SHORT_RESERVED_MINUTES: 긴 영상이 쓸 수 없는 Shorts 전용 예산 (기본 5)
+      ADMISSION_SHORT_SECONDS: 이 길이 이하면 Shorts 레인 (기본 180초)
+      ADMISSION_MAX_DURATION_SECONDS: 이보다 긴 영상은 거절 (기본 10800초, 0이면 제한 없음)
+      ADMISSION_UNKNOWN_DURATION_MINUTES: 길이를 모르는 영상(라이브 등)의 비용 (기본 30분)
+      ADMISSION_MIN_COST_MINUTES: 작업당 최소 비용 (다운로드/그래프 등 고정 비용, 기본 0.5분)
+      ADMISSION_MAX_WAIT_SECONDS: 예상 대기가 이보다 길면 대기 대신 429 (기본 120초)
+      ADMISSION_MAX_QUEUE_SHORT / ADMISSION_MAX_QUEUE_LONG: 레인별 대기열 길이 (기본 50 / 10)
+      ADMISSION_SECONDS_PER_AUDIO_MINUTE: 오디오 1분 처리 예상 시간 초기값 (기본 30초, 실측으로 보정)
+    """
+
+    _instance: Optional['AdmissionController'] = None
+    _lock = Lock()
+
+    def __init__(self):
+        self.enabled = os.getenv("ADMISSION_ENABLED", "0") == "1"
+        self.budget = float(os.getenv("ADMISSION_AUDIO_MINUTES_BUDGET", "60"))
+        self.short_reserved = float(os.getenv("ADMISSION_SHORT_RESERVED_MINUTES", "5"))
+        self.short_seconds = float(os.getenv("ADMISSION_SHORT_SECONDS", "180"))
+        self.max_duration = float(os.getenv("ADMISSION_MAX_DURATION_SECONDS", "10800"))
+        self.unknown_cost = float(os.getenv("ADMISSION_UNKNOWN_DURATION_MINUTES", "30"))
+        self.min_cost = float(os.getenv("ADMISSION_MIN_COST_MINUTES", "0.5"))
+        self.max_wait = float(os.getenv("ADMISSION_MAX_WAIT_SECONDS", "120"))
+        self.max_queue = {
+            SHORT_LANE: int(os.getenv("ADMISSION_MAX_QUEUE_SHORT", "50")),
+            LONG_LANE: int(os.getenv("ADMISSION_MAX_QUEUE_LONG", "10")),
+        }
+        self.seconds_per_minute = float(os.getenv("ADMISSION_SECONDS_PER_AUDIO_MINUTE", "30"))
+        self.in_flight_minutes = 0.0
+        self.in_flight = 0
+        self.queues: Dict[str, Deque[AdmissionTicket]] = {SHORT_LANE: deque(), LONG_LANE: deque()}
+
+    # ---------------- 비용/대기 추정 ---------------- #
+    def lane_for(self, duration: Optional[float]) -> str:
+        return SHORT_LANE if duration is not None and duration <= self.short_seconds else LONG_LANE
+
+    def cost_for(self, duration: Optional[float]) -> float:
+        """작업 비용 (오디오 분, 예산보다 큰 작업도 혼자서는 돌 수 있도록 예산으로 상한)"""
+        minutes = self.unknown_cost if duration is None else duration / 60
+        return min(self.budget, max(self.min_cost, minutes))
+
+    def _lane_budget(self, lane: str) -> float:
+        return self.budget if lane == SHORT_LANE else self.budget - self.short_reserved
+
+    def _fits(self, ticket: AdmissionTicket) -> bool:
+        # 예산을 혼자 다 쓰는 작업은 아무것도 돌지 않을 때 시작
+        if self.in_flight == 0:
+            return True
+        return self.in_flight_minutes + ticket.cost_minutes <= self._lane_budget(ticket.lane)
+
+    def estimate_wait(self, lane: str, cost: float) -> float:
+        """
+        예상 대기 시간 (초)
+
+        진행 중인 작업과 먼저 배정될 대기 작업(Shorts 레인 + 같은 레인)을 합쳐
+        예산을 넘는 만큼의 오디오 분이 끝나야 자리가 난다고 보고 오디오 1분당 처리 시간을 곱함
+        """
+        ahead = sum(t.cost_minutes for t in self.queues[SHORT_LANE])
+        if lane == LONG_LANE:
+            ahead += sum(t.cost_minutes for t in self.queues[LONG_LANE])
+        overflow = self.in_flight_minutes + ahead + cost - self._lane_budget(lane)
+        return max(0.0, overflow) * self.seconds_per_minute
+
+    # ---------------- 배정 ---------------- #
+    def _grant(self, ticket: AdmissionTicket):
+        ticket.admitted_at = time.monotonic()
+        self.in_flight += 1
+        self.in_flight_minutes += ticket.cost_minutes
+        ADMISSION_AUDIO_MINUTES.set(self.in_flight_minutes)
+
+    def _dispatch(self):
+        """자리가 나면 Shorts 레인부터 FIFO 순서로 배정"""
+        for lane in (SHORT_LANE, LONG_LANE):
+            queue = self.queues[lane]
+            while queue:
+                ticket = queue[0]
+                if ticket.future.done():
+                    # 대기 중 클라이언트가 끊긴 작업
+                    queue.popleft()
+                    continue
+                if not self._fits(ticket):
+                    break
+                queue.popleft()
+                self._grant(ticket)
+                ticket.future.set_result(None)
+            QUEUE_DEPTH.labels(queue=f"admission_{lane}").set(len(queue))
+
+    def _release(self, ticket: AdmissionTicket, succeeded: bool):
+        self.in_flight -= 1
+        self.in_flight_minutes = max(0.0, self.in_flight_minutes - ticket.cost_minutes)
+        ADMISSION_AUDIO_MINUTES.set(self.in_flight_minutes)
+        if succeeded and ticket.admitted_at is not None:
+            # 실제 처리 시간으로 오디오 1분당 처리 시간 보정 (동시 실행 영향 포함)
+            observed = (time.monotonic() - ticket.admitted_at) / ticket.cost_minutes
+            self.seconds_per_minute = 0.8 * self.seconds_per_minute + 0.2 * observed
+        self._dispatch()
+
+    @asynccontextmanager
+    async def admit(
+        self,
+        duration: Optional[float],
+        on_queued: Optional[Callable[[dict], Awaitable[None]]] = None,
+    ) -> AsyncIterator[Optional[AdmissionTicket]]:
+        """
+        작업 입장 (블록을 벗어나면 예산 반환)
+
+        Args:
+            duration: 영상 길이 (초, 모르면 None)
+            on_queued: 대기열에 들어갈 때 호출 (레인, 순번, 예상 대기 시간 전달)
+
+        Raises:
+            AdmissionRejected: 너무 긴 영상(413) 또는 대기열 포화/예상 대기 초과(429)
+        """
+        if not self.enabled:
+            yield None
+            return
+
+        lane = self.lane_for(duration)
+        if self.max_duration and duration is not None and duration > self.max_duration:
+            ADMISSION_DECISIONS_TOTAL.labels(lane=lane, decision="too_long").inc()
+            raise AdmissionRejected(
+                413, f"영상 길이 {duration / 60:.0f}분은 최대 {self.max_duration / 60:.0f}분을 넘습니다"
+            )
+
+        cost = self.cost_for(duration)
+        ticket = AdmissionTicket(lane=lane, cost_minutes=cost, queued_at=time.monotonic())
+        queue = self.queues[lane]
+
+        # 앞선 대기 작업이 없을 때만 바로 시작 (Shorts 대기 작업은 긴 영상보다 우선)
+        waiting_ahead = queue or (lane == LONG_LANE and self.queues[SHORT_LANE])
+        if not waiting_ahead and self._fits(ticket):
+            self._grant(ticket)
+            ADMISSION_DECISIONS_TOTAL.labels(lane=lane, decision="admitted").inc()
+        else:
+            wait = self.estimate_wait(lane, cost)
+            if len(queue) >= self.max_queue[lane] or wait > self.max_wait:
+                ADMISSION_DECISIONS_TOTAL.labels(lane=lane, decision="rejected").inc()
+                raise AdmissionRejected(
+                    429, f"서버가 혼잡합니다. 약 {wait:.0f}초 후 다시 시도해 주세요", retry_after=max(1.0, wait)
+                )
+            ticket.future = asyncio.get_running_loop().create_future()
+            queue.append(ticket)
+            QUEUE_DEPTH.labels(queue=f"admission_{lane}").set(len(queue))
+            ADMISSION_DECISIONS_TOTAL.labels(lane=lane, decision="queued").inc()
+            try:
+                if on_queued is not None:
+                    await on_queued({"lane": lane, "position": len(queue), "estimated_wait": round(wait, 1)})
+                await ticket.future
+            except BaseException:
+                # 알림 실패/취소 시 대기표를 회수 (이미 배정됐으면 예산 반환)
+                if ticket.admitted_at is not None:
+                    self._release(ticket, succeeded=False)
+                else:
+                    ticket.future.cancel()
+                    if ticket in queue:
+                        queue.remove(ticket)
+                    self._dispatch()
+                raise
+
+        succeeded = False
+        try:
+            yield ticket
+            succeeded = True
+        finally:
+            self._release(ticket, succeeded)
+
+    def snapshot(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "budget_minutes": self.budget,
+            "short_reserved_minutes": self.short_reserved,
+            "in_flight": self.in_flight,
+            "in_flight_minutes": round(self.in_flight_minutes, 2),
+            "queued": {lane: len(queue) for lane, queue in self.queues.items()},
+            "seconds_per_audio_minute": round(self.seconds_per_minute, 2),
+            "estimated_wait": {
+                SHORT_LANE: round(self.estimate_wait(SHORT_LANE, self.min_cost), 1),
+                LONG_LANE: round(self.estimate_wait(LONG_LANE, self.cost_for(self.short_seconds * 2)), 1),
+            },
+        }
+
+    @classmethod
+    def get_instance(cls) -> 'AdmissionController':
+        """싱글톤 인스턴스 반환"""
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
@@ -1,15 +1,161 @@
+import asyncio
+import math
+import os
 from fastapi import APIRouter, HTTPException, Query
 from app.youtube.service import YouTubeService
 from app.whisperx.service import WhisperXService
-from app.whisperx.router import extract_with_graph
+from app.whisperx.router import extract_with_graph, exist_text_translate
+from app.whisperx.cache_service import STTCacheService
+from app.whisperx.schemas import STTResponse
+from app.whisperx.tiering import DRAFT_TIER, TierPolicy
 from app.socket_manager import SocketManager
+from app.timing import stage
+from app.metrics import QUEUE_DEPTH
+from app.artifacts import ArtifactStore
+from app.analysis.admission import AdmissionController, AdmissionRejected
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, Set
 
 router = APIRouter()
 youtube_service = YouTubeService()
 whisperx_service = WhisperXService.get_instance()
 socket_manager = SocketManager.get_instance()
+admission = AdmissionController.get_instance()
+artifacts = ArtifactStore.get_instance()
+
+# 분석 파이프라인의 STT 캐시 언어 키 (언어 자동 감지)
+STT_CACHE_LANGUAGE = "auto"
+# 백그라운드 최종 전사 태스크 (GC 방지 및 중복 실행 방지용)
+_refine_tasks: Set[asyncio.Task] = set()
+_refining: Set[str] = set()
+
+
+async def _refine_transcription(file_path: str, model_size: str):
+    """초안 이후 큰 모델로 다시 전사해 캐시를 갱신하고 소켓으로 최종 전사 전송"""
+    try:
+        result = await whisperx_service.transcribe_audio(file_path=file_path, model_size=model_size)
+        STTCacheService().save_result(file_path, STT_CACHE_LANGUAGE, result)
+        artifacts.mark_transcribed(file_path, aligned=whisperx_service.has_alignment(file_path, result))
+        await socket_manager.emit_transcription({
+            'script': result.full_text,
+            'tier': result.tier,
+            'model_size': result.model_size
+        })
+    except Exception as e:
+        print(f"Refine transcription error: {str(e)}")
+    finally:
+        _refining.discard(file_path)
+        artifacts.release(file_path)
+
+
+def _start_refine(file_path: str, model_size: str):
+    if file_path in _refining:
+        return
+    _refining.add(file_path)
+    # 최종 전사가 끝날 때까지 오디오 보관 (태스크 시작 전에 pin)
+    artifacts.acquire(file_path)
+    task = asyncio.create_task(_refine_transcription(file_path, model_size))
+    _refine_tasks.add(task)
+    task.add_done_callback(_refine_tasks.discard)
+
+
+async def transcribe_for_analysis(file_path: str, duration: Optional[int]) -> STTResponse:
+    """
+    분석용 전사 (모델 크기 선택 정책 적용)
+
+    캐시에 최종 전사가 있으면 그대로 사용하고, 초안 단계가 켜져 있으면
+    작은 모델의 초안을 먼저 반환한 뒤 선택된 모델로 백그라운드에서 다시 전사
+
+    Args:
+        file_path: 오디오 파일 경로
+        duration: 영상 길이 (초)
+
+    Returns:
+        STTResponse: 전사 결과 (tier로 초안/최종 구분)
+    """
+    cached = exist_text_translate(file_path, STT_CACHE_LANGUAGE)
+    if cached and cached.tier != DRAFT_TIER:
+        artifacts.mark_transcribed(file_path, aligned=whisperx_service.has_alignment(file_path, cached))
+        return cached
+
+    policy = TierPolicy.get_instance()
+    model_size = policy.select(duration)
+    if cached:
+        # 초안만 캐시된 상태 (서버 재시작 등으로 최종 전사가 끊긴 경우 다시 시작)
+        _start_refine(file_path, model_size)
+        return cached
+
+    draft_model = policy.draft_model(model_size)
+    if draft_model is None:
+        result = await whisperx_service.transcribe_audio(file_path=file_path, model_size=model_size)
+    else:
+        result = await whisperx_service.transcribe_audio(
+            file_path=file_path, model_size=draft_model, tier=DRAFT_TIER
+        )
+        _start_refine(file_path, model_size)
+
+    STTCacheService().save_result(file_path, STT_CACHE_LANGUAGE, result)
+    if result.tier != DRAFT_TIER:
+        artifacts.mark_transcribed(file_path, aligned=whisperx_service.has_alignment(file_path, result))
+    return result
+
+
+async def _run_pipeline(videoURL: str, duration: Optional[int], stt_result: Optional[STTResponse],
+                        max_seconds: Optional[int] = None):
+    """분석 2~5단계 (다운로드/전사 -> 논증 그래프 -> 결론, 각 단계 결과를 소켓으로 전송)"""
+    if stt_result is None:
+        # 다운로드/전사가 끝날 때까지 오디오 파일이 용량 정리로 삭제되지 않도록 pin
+        file_path = youtube_service.audio_path(videoURL, max_seconds)
+        with artifacts.pin(file_path):
+            # 최종 전사가 캐시된 뒤 오디오만 삭제된 영상이면 다시 다운로드하지 않음
+            if file_path and not os.path.exists(file_path):
+                cached = exist_text_translate(file_path, STT_CACHE_LANGUAGE)
+                if cached and cached.tier != DRAFT_TIER:
+                    stt_result = cached
+
+            if stt_result is None:
+                # 2. 오디오 다운로드
+                print(f"Downloading audio...")
+                with stage("download"):
+                    download_result = await youtube_service.download_audio(videoURL, max_seconds=max_seconds)
+                file_path = download_result['file_path']
+                duration = download_result.get('duration') or duration
+
+                # 3. STT 전사
+                print(f"Transcribing audio...")
+                with artifacts.pin(file_path):
+                    stt_result = await transcribe_for_analysis(file_path, duration)
+
+    # Socket으로 transcription 전송 (초안이면 최종 전사가 나중에 한 번 더 전송됨)
+    await socket_manager.emit_transcription({
+        'script': stt_result.full_text,
+        'tier': stt_result.tier,
+        'model_size': stt_result.model_size
+    })
+
+    # 4. Extract (논증 그래프 생성)
+    print(f"Generating argument graph...")
+    extract_result = await extract_with_graph(stt_result)
+
+    # Socket으로 extract 전송
+    await socket_manager.emit_extract({
+        'full_text': extract_result.full_text,
+        'argument_graph': extract_result.argument_graph.dict(),
+        'summary': extract_result.summary
+    })
+
+    # 5. Conclusion
+    print(f"Generating conclusion...")
+    conclusion_data = {
+        'total_segments': extract_result.summary.get('total_segments', 0),
+        'claims': extract_result.summary.get('claims', 0),
+        'facts': extract_result.summary.get('facts', 0),
+        'relationships': extract_result.summary.get('relationships', 0),
+        'avg_confidence': extract_result.summary.get('avg_confidence', 0.0)
+    }
+
+    # Socket으로 conclusion 전송
+    await socket_manager.emit_conclusion(conclusion_data)
 
 
 class AnalysisResponse(BaseModel):
@@ -20,26 +166,32 @@ class AnalysisResponse(BaseModel):
 @router.get("/analysis", response_model=AnalysisResponse)
 async def analyze_video(
     videoURL: str = Query(..., description="YouTube 비디오 URL"),
+    maxSeconds: Optional[int] = Query(None, description="앞부분 N초만 다운로드해 분석 (빠른 판정용)"),
 ):
     """
     YouTube 비디오 분석 엔드포인트
 
     1. YouTube 정보 가져오기 -> Socket 전송 (step: 'info')
-    2. 오디오 다운로드
+       입장 제어로 대기하면 Socket 전송 (step: 'queued'), 예산 초과 시 429 + Retry-After
+    2. 오디오 다운로드 (CAPTION_FIRST=1 이고 자막이 충분하면 2~3 대신 자막 사용)
     3. STT 전사 -> Socket 전송 (step: 'transcription')
     4. Extract (논증 그래프) -> Socket 전송 (step: 'extract')
     5. Conclusion -> Socket 전송 (step: 'conclusion')
 
     Args:
         videoURL: YouTube 비디오 URL
+        maxSeconds: 앞부분 N초만 분석 (없으면 DOWNLOAD_MAX_SECONDS, 0이면 전체)
 
     Returns:
         status: true
     """
+    in_flight = QUEUE_DEPTH.labels(queue="analysis_in_flight")
+    in_flight.inc()
     try:
         # 1. YouTube 정보 가져오기
         print(f"Fetching YouTube info for: {videoURL}")
-        youtube_info = await youtube_service.get_info(videoURL)
+        with stage("info"):
+            youtube_info = await youtube_service.get_info(videoURL)
 
         # Socket으로 info 전송
         await socket_manager.emit_info({
@@ -47,51 +199,39 @@ async def analyze_video(
             'thumbnail': youtube_info.thumbnail
         })
 
-        # 2. 오디오 다운로드
-        print(f"Downloading audio...")
-        download_result = await youtube_service.download_audio(videoURL)
-        file_path = download_result['file_path']
-
-        # 3. STT 전사
-        print(f"Transcribing audio...")
-        stt_result = await whisperx_service.transcribe_audio(
-            file_path=file_path,
-        )
-
-        # Socket으로 transcription 전송
-        await socket_manager.emit_transcription({
-            'script': stt_result.full_text
-        })
-
-        # 4. Extract (논증 그래프 생성)
-        print(f"Generating argument graph...")
-        extract_result = await extract_with_graph(stt_result)
-
-        # Socket으로 extract 전송
-        await socket_manager.emit_extract({
-            'full_text': extract_result.full_text,
-            'argument_graph': extract_result.argument_graph.dict(),
-            'summary': extract_result.summary
-        })
-
-        # 5. Conclusion
-        print(f"Generating conclusion...")
-        conclusion_data = {
-            'total_segments': extract_result.summary.get('total_segments', 0),
-            'claims': extract_result.summary.get('claims', 0),
-            'facts': extract_result.summary.get('facts', 0),
-            'relationships': extract_result.summary.get('relationships', 0),
-            'avg_confidence': extract_result.summary.get('avg_confidence', 0.0)
-        }
+        # 자막 우선 모드: 쓸 만한 자막 트랙이 있으면 다운로드와 STT 생략
+        with stage("captions"):
+            stt_result = await youtube_service.get_caption_transcript(videoURL)
 
-        # Socket으로 conclusion 전송
-        await socket_manager.emit_conclusion(conclusion_data)
+        # 입장 제어: 영상 길이로 비용을 추정해 바로 시작/대기/거절 (자막을 쓰면 그래프 비용만 남음)
+        duration = youtube_info.duration
+        if maxSeconds and duration:
+            duration = min(duration, maxSeconds)
+        admit_duration = 0 if stt_result is not None else duration
+        async with admission.admit(admit_duration, on_queued=socket_manager.emit_queued) as ticket:
+            if ticket is not None and ticket.waited > 0.1:
+                print(f"Admitted after {ticket.waited:.1f}s in {ticket.lane} lane")
+            await _run_pipeline(videoURL, duration, stt_result, max_seconds=maxSeconds)
 
         return AnalysisResponse(status=True)
 
+    except AdmissionRejected as e:
+        print(f"Analysis rejected ({e.status_code}): {e.detail}")
+        headers = {"Retry-After": str(math.ceil(e.retry_after))} if e.retry_after else None
+        raise HTTPException(status_code=e.status_code, detail=e.detail, headers=headers)
     except Exception as e:
         print(f"Analysis error: {str(e)}")
         raise HTTPException(
             status_code=500,
             detail=f"분석 중 오류가 발생했습니다: {str(e)}"
         )
+    finally:
+        in_flight.dec()
+
+
+@router.get("/analysis/admission")
+async def admission_status():
+    """
+    입장 제어 상태 (처리 중인 오디오 분, 레인별 대기 수, 예상 대기 시간)
+    """
+    return admission.snapshot()
@@ -0,0 +1,312 @@
+"""
+downloads/ 오디오 파일 보관소
+
+다운로드한 오디오의 크기/마지막 사용 시각을 인덱스로 관리하고
+- 용량 상한(ARTIFACT_MAX_BYTES)을 넘으면 오래 쓰지 않은 파일부터 삭제 (LRU)
+- 진행 중인 작업이 pin한 파일은 삭제하지 않음
+- ARTIFACT_DELETE_AFTER_TRANSCRIPT=1 이면 최종 전사가 캐시된 뒤 작업이 끝나는 즉시 삭제
+  WHISPERX_ALIGN_MODE가 eager/background면 단어 정렬까지 캐시된 뒤 삭제
+  lazy(기본)면 전사 직후 삭제하고, 이후 /align 요청은 오디오가 없으므로 410으로 거절 (ArtifactEvictedError)
+
+STT/정렬 캐시 키는 오디오 파일의 (mtime, size)를 포함하므로
+삭제한 파일의 stat을 기록해 두고(fingerprint) 파일이 없어도 같은 캐시 키를 만들 수 있게 함
+"""
+
+import json
+import os
+import time
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from threading import Lock
+from typing import Iterator, Optional
+
+# 삭제된 파일의 stat 기록 최대 개수
+_MAX_TOMBSTONES = 10000
+
+
+class ArtifactEvictedError(FileNotFoundError):
+    """보관소가 이미 삭제한 오디오가 다시 필요함 (다시 다운로드해야 함)"""
+
+
+class ArtifactStore:
+    """
+    다운로드 오디오 LRU 보관소
+
+    환경 변수
+      ARTIFACT_DIR: 오디오 디렉토리 (기본 downloads)
+      ARTIFACT_MAX_BYTES: 보관 용량 상한 (기본 10GiB, 0이면 제한 없음)
+      ARTIFACT_DELETE_AFTER_TRANSCRIPT: 1이면 최종 전사 캐시 후 오디오 삭제, eager/background 정렬 모드면 정렬 캐시까지 기다림 (기본 비활성)
+      ARTIFACT_INDEX_PATH: 인덱스 파일 (기본 cache/artifacts/index.json)
+    """
+
+    _instance: Optional['ArtifactStore'] = None
+    _lock = Lock()
+
+    def __init__(self):
+        self.root = Path(os.getenv("ARTIFACT_DIR", "downloads"))
+        self.max_bytes = int(os.getenv("ARTIFACT_MAX_BYTES", str(10 * 1024 ** 3)))
+        self.delete_after_transcript = os.getenv("ARTIFACT_DELETE_AFTER_TRANSCRIPT", "0") == "1"
+        # 전사와 함께/직후에 정렬하는 모드에서만 정렬 캐시까지 기다렸다 삭제 (lazy 정렬은 요청이 올지 알 수 없음)
+        self.wait_for_alignment = os.getenv("WHISPERX_ALIGN_MODE", "lazy") in ("eager", "background")
+        self.index_path = Path(os.getenv("ARTIFACT_INDEX_PATH", "cache/artifacts/index.json"))
+        # 파일 이름 -> {size, mtime, last_access, transcribed, aligned} (앞쪽이 가장 오래 쓰지 않은 파일)
+        self._entries: "OrderedDict[str, dict]" = OrderedDict()
+        # 삭제된 파일 이름 -> 삭제 직전 {mtime, size}
+        self._tombstones: "OrderedDict[str, dict]" = OrderedDict()
+        self._pins: Counter = Counter()
+        self._store_lock = Lock()
+        self.evictions = 0
+        self.evicted_bytes = 0
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._load()
+        self._reconcile()
+
+    # ---------------- 인덱스 ---------------- #
+    def _load(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            entries = sorted(data.get("entries", {}).items(), key=lambda item: item[1].get("last_access", 0))
+            self._entries = OrderedDict(entries)
+            self._tombstones = OrderedDict(data.get("tombstones", {}))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"오디오 보관소 인덱스 로드 오류: {e}")
+
+    def _save(self):
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.index_path.with_suffix(".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"entries": self._entries, "tombstones": self._tombstones}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.index_path)
+        except Exception as e:
+            print(f"오디오 보관소 인덱스 저장 오류: {e}")
+
+    def _reconcile(self):
+        """인덱스와 실제 디렉토리 상태 맞추기 (서버 재시작, 수동 삭제/복사 대비)"""
+        with self._store_lock:
+            on_disk = {p.name: p for p in self.root.iterdir() if p.is_file() and not p.name.startswith(".")}
+            for name in list(self._entries):
+                if name not in on_disk:
+                    del self._entries[name]
+            for name, path in sorted(on_disk.items(), key=lambda item: item[1].stat().st_mtime):
+                if name not in self._entries:
+                    stat = path.stat()
+                    self._entries[name] = {
+                        "size": stat.st_size, "mtime": stat.st_mtime,
+                        "last_access": stat.st_mtime, "transcribed": False, "aligned": False,
+                    }
+                    self._entries.move_to_end(name, last=False)
+            self._enforce_quota()
+            self._save()
+
+    def _name(self, file_path: str) -> Optional[str]:
+        """보관소가 관리하는 파일이면 파일 이름, 아니면 None"""
+        path = Path(file_path)
+        if path.parent.resolve() != self.root.resolve():
+            return None
+        return path.name
+
+    # ---------------- 사용 기록 ---------------- #
+    def register(self, file_path: str):
+        """다운로드 완료된 파일 등록 후 용량 상한 적용"""
+        name = self._name(file_path)
+        if name is None:
+            return
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return
+        with self._store_lock:
+            self._entries[name] = {
+                "size": stat.st_size, "mtime": stat.st_mtime,
+                "last_access": time.time(), "transcribed": False, "aligned": False,
+            }
+            self._entries.move_to_end(name)
+            self._tombstones.pop(name, None)
+            self._enforce_quota()
+            self._save()
+
+    def touch(self, file_path: str):
+        name = self._name(file_path)
+        with self._store_lock:
+            if name in self._entries:
+                self._entries[name]["last_access"] = time.time()
+                self._entries.move_to_end(name)
+
+    def mark_transcribed(self, file_path: str, aligned: bool = False):
+        """
+        최종 전사가 캐시됨 (삭제 옵션이 켜져 있고 필요한 정렬도 끝났고 pin이 없으면 바로 삭제)
+
+        Args:
+            file_path: 오디오 파일 경로
+            aligned: 단어 정렬 결과도 이미 캐시되어 있는지
+        """
+        name = self._name(file_path)
+        with self._store_lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                return
+            if entry["transcribed"] and (entry.get("aligned") or not aligned):
+                # 바뀐 상태 없음
+                return
+            entry["transcribed"] = True
+            entry["aligned"] = entry.get("aligned", False) or aligned
+            self._evict_if_done(name)
+            self._save()
+
+    def mark_aligned(self, file_path: str):
+        """단어 정렬이 캐시됨 (최종 전사도 끝났으면 삭제 옵션에 따라 삭제)"""
+        name = self._name(file_path)
+        with self._store_lock:
+            entry = self._entries.get(name)
+            if entry is None or entry.get("aligned"):
+                return
+            entry["aligned"] = True
+            self._evict_if_done(name)
+            self._save()
+
+    def _evict_if_done(self, name: str):
+        """전사(와 정렬 모드에 따라 정렬)가 캐시됐고 pin이 없으면 삭제 옵션에 따라 삭제 (_store_lock 안에서 호출)"""
+        entry = self._entries.get(name)
+        if (
+            self.delete_after_transcript and entry is not None and not self._pins[name]
+            and entry["transcribed"] and (entry.get("aligned") or not self.wait_for_alignment)
+        ):
+            self._evict(name)
+
+    def acquire(self, file_path: Optional[str]):
+        """파일 pin (파일이 아직 없어도 가능, release와 짝을 맞춰 호출)"""
+        name = self._name(file_path) if file_path else None
+        if name is None:
+            return
+        with self._store_lock:
+            self._pins[name] += 1
+
+    def release(self, file_path: Optional[str]):
+        """pin 해제 (마지막 pin이면 전사 후 삭제/용량 상한 적용)"""
+        name = self._name(file_path) if file_path else None
+        if name is None:
+            return
+        with self._store_lock:
+            self._pins[name] -= 1
+            if self._pins[name] > 0:
+                return
+            del self._pins[name]
+            entry = self._entries.get(name)
+            if entry is not None:
+                entry["last_access"] = time.time()
+                self._entries.move_to_end(name)
+                self._evict_if_done(name)
+            self._enforce_quota()
+            self._save()
+
+    @contextmanager
+    def pin(self, file_path: Optional[str]) -> Iterator[None]:
+        """작업이 끝날 때까지 파일 삭제 금지"""
+        self.acquire(file_path)
+        try:
+            yield
+        finally:
+            self.release(file_path)
+
+    def ensure_available(self, file_path: str):
+        """
+        오디오를 다시 읽기 전에 파일 존재 확인
+
+        Raises:
+            ArtifactEvictedError: 보관소가 삭제한 파일
+            FileNotFoundError: 그 밖의 이유로 없는 파일
+        """
+        if os.path.exists(file_path):
+            return
+        name = self._name(file_path)
+        with self._store_lock:
+            evicted = name is not None and name in self._tombstones
+        if evicted:
+            raise ArtifactEvictedError(f"Audio file was deleted after transcription: {file_path}")
+        raise FileNotFoundError(f"Audio file not found: {file_path}")
+
+    def fingerprint(self, file_path: str) -> Optional[str]:
+        """
+        캐시 키용 오디오 식별값 '<mtime>_<size>'
+
+        파일이 있으면 현재 stat, 보관소가 삭제한 파일이면 삭제 직전 stat (둘 다 없으면 None)
+        """
+        try:
+            stat = os.stat(file_path)
+            return f"{stat.st_mtime}_{stat.st_size}"
+        except OSError:
+            pass
+        name = self._name(file_path)
+        with self._store_lock:
+            tombstone = self._tombstones.get(name) if name else None
+        if tombstone is None:
+            return None
+        return f"{tombstone['mtime']}_{tombstone['size']}"
+
+    # ---------------- 삭제 ---------------- #
+    def _evict(self, name: str):
+        entry = self._entries.pop(name, None)
+        if entry is None:
+            return
+        try:
+            (self.root / name).unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"오디오 파일 삭제 오류 ({name}): {e}")
+            self._entries[name] = entry
+            return
+        self._tombstones[name] = {"mtime": entry["mtime"], "size": entry["size"]}
+        self._tombstones.move_to_end(name)
+        while len(self._tombstones) > _MAX_TOMBSTONES:
+            self._tombstones.popitem(last=False)
+        self.evictions += 1
+        self.evicted_bytes += entry["size"]
+        print(f"오디오 파일 삭제: {name} ({entry['size'] / (1024 * 1024):.1f}MB)")
+
+    def _enforce_quota(self):
+        """용량 상한을 넘으면 pin되지 않은 파일을 오래된 순으로 삭제"""
+        if self.max_bytes <= 0:
+            return
+        total = sum(entry["size"] for entry in self._entries.values())
+        for name in list(self._entries):
+            if total <= self.max_bytes:
+                break
+            if self._pins[name]:
+                continue
+            size = self._entries[name]["size"]
+            self._evict(name)
+            if name not in self._entries:
+                total -= size
+
+    def get_stats(self) -> dict:
+        with self._store_lock:
+            total = sum(entry["size"] for entry in self._entries.values())
+            return {
+                "dir": str(self.root),
+                "files": len(self._entries),
+                "total_size_bytes": total,
+                "total_size_mb": round(total / (1024 * 1024), 2),
+                "max_bytes": self.max_bytes,
+                "pinned": len(self._pins),
+                "transcribed": sum(1 for entry in self._entries.values() if entry["transcribed"]),
+                "aligned": sum(1 for entry in self._entries.values() if entry.get("aligned")),
+                "delete_after_transcript": self.delete_after_transcript,
+                "wait_for_alignment": self.wait_for_alignment,
+                "evictions": self.evictions,
+                "evicted_mb": round(self.evicted_bytes / (1024 * 1024), 2),
+            }
+
+    @classmethod
+    def get_instance(cls) -> 'ArtifactStore':
+        """싱글톤 인스턴스 반환"""
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
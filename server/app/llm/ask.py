@@ -2,11 +2,22 @@ import os, json, asyncio, httpx
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv, find_dotenv
+from app.llm.verdict_cache import VerdictCache
+from app.llm.consensus import PanelRunner, ProviderLatencyTracker
+from app.llm.resilience import ResilienceManager, estimate_tokens, resilient_call
+from app.llm.backends import get_llm_backend
+from app.llm.triage import CheckWorthinessTriage
+from app.timing import stage
+from app.metrics import JUDGE_BATCH_CLAIMS_TOTAL, record_cache
 
 load_dotenv(find_dotenv(usecwd=True), override=True)
 
 router = APIRouter()
 
+# 1이면 여러 claim을 provider당 한 요청으로 판정 (JUDGE_BATCH_SIZE개씩)
+JUDGE_BATCH = os.getenv("JUDGE_BATCH", "0") == "1"
+JUDGE_BATCH_SIZE = max(1, int(os.getenv("JUDGE_BATCH_SIZE", "10")))
+
 # ---------------- 입력 스키마 (변경됨) ---------------- #
 class Node(BaseModel):
     id: str
@@ -87,6 +98,64 @@ For medical or legal guidance, simply note: “Consult a qualified professional
 CLAIM: {claim}
 """
 
+# 배치 판정 프롬프트: 판정 지침(역할~검증 절차)은 JSON_PROMPT와 공유하고 출력 형식만 claim 배열로 바꿈
+_JUDGE_GUIDELINES = JSON_PROMPT[JSON_PROMPT.index("[Role]"):JSON_PROMPT.index("[Output Format]")]
+BATCH_JSON_PROMPT = """You are a factuality judge.
+Judge EACH numbered claim below independently.
+""" + _JUDGE_GUIDELINES + """[Output Format]
+
+Translate all the contents into Korean, return STRICT JSON ONLY in this form, with exactly one entry per claim id:
+{"verdicts": [{"id": "<claim id>", "verdict": "TRUE|FALSE|UNCERTAIN", "confidence": <0.0-1.0>, "rationale": "<text>"}]}
+
+[Cautions]
+
+Do not disclose any personal or private information.
+
+For medical or legal guidance, simply note: "Consult a qualified professional is recommended."
+
+CLAIMS:
+"""
+# 배치 응답의 claim당 출력 토큰 상한
+_BATCH_TOKENS_PER_CLAIM = 320
+
+def build_batch_prompt(claims: dict[str, str]) -> str:
+    """claim id -> 텍스트를 배치 판정 프롬프트로 변환"""
+    lines = [f"[{cid}] {' '.join(text.split())}" for cid, text in claims.items()]
+    return BATCH_JSON_PROMPT + "\n".join(lines) + "\n"
+
+def _batch_max_tokens(claims: dict[str, str]) -> int:
+    return min(8192, 256 + _BATCH_TOKENS_PER_CLAIM * len(claims))
+
+def parse_batch_verdicts(data: dict, claims: dict[str, str]) -> dict[str, dict]:
+    """
+    배치 응답에서 claim id별 판정 추출
+
+    Args:
+        data: 모델이 반환한 JSON 객체 ({"verdicts": [...]})
+        claims: 요청한 claim id -> 텍스트
+
+    Returns:
+        dict[str, dict]: 정상 응답이 있는 claim id -> verdict/confidence/rationale
+        (누락되었거나 verdict가 형식에 맞지 않는 claim은 빠짐)
+    """
+    lower = {str(k).strip().lower(): v for k, v in data.items()}
+    entries = lower.get("verdicts", lower.get("results", []))
+    parsed: dict[str, dict] = {}
+    if not isinstance(entries, list):
+        return parsed
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        fields = {str(k).strip().lower(): v for k, v in entry.items()}
+        cid = str(fields.get("id", "")).strip().strip("[]")
+        verdict = fields.get("verdict")
+        if cid not in claims or cid in parsed:
+            continue
+        if not isinstance(verdict, str) or verdict.strip().upper() not in ("TRUE", "FALSE", "UNCERTAIN"):
+            continue
+        parsed[cid] = _normalize_judgement(fields)
+    return parsed
+
 def _calibrate_confidence(verdict: str, confidence: float) -> float:
     try:
         floor_val = float(os.getenv("MIN_CONFIDENCE_FOR_DECISION", "0"))
@@ -99,7 +168,7 @@ def _calibrate_confidence(verdict: str, confidence: float) -> float:
 
 def _safe_json(s: str) -> dict:
     if not isinstance(s, str):
-        raise HTTPException(500, f"Model returned non-text payload: {type(s)}")
+        raise ValueError(f"Model returned non-text payload: {type(s)}")
     txt = s.strip()
     if txt.startswith("```"):
         lines = txt.splitlines()
@@ -115,7 +184,7 @@ def _safe_json(s: str) -> dict:
         cleaned = candidate.strip("\ufeff \n\r\t")
         data = json.loads(cleaned)
     if not isinstance(data, dict):
-        raise HTTPException(500, f"Model JSON is not an object: {type(data)}")
+        raise ValueError(f"Model JSON is not an object: {type(data)}")
     return data
 
 def _normalize_judgement(data: dict) -> dict:
@@ -137,6 +206,11 @@ def _normalize_judgement(data: dict) -> dict:
     confidence = _calibrate_confidence(verdict, confidence)
     return {"verdict": verdict, "confidence": confidence, "rationale": str(rationale)}
 
+def _retry_headers(response: httpx.Response) -> dict | None:
+    """재시도 대기 시간을 알려주는 Retry-After 헤더만 HTTPException으로 전달"""
+    retry_after = response.headers.get("Retry-After")
+    return {"Retry-After": retry_after} if retry_after else None
+
 async def _wrap(provider_name: str, coro):
     try:
         out = await coro
@@ -147,7 +221,7 @@ async def _wrap(provider_name: str, coro):
         return {"provider": provider_name, "error": str(e)}
 
 # ---------------- 모델 호출 (기존 유지) ---------------- #
-async def call_openai(model_id: str, claim: str) -> dict:
+async def _openai_json(model_id: str, prompt: str, max_tokens: int = 1024) -> dict:
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         raise HTTPException(500, "OPENAI_API_KEY is not set")
@@ -159,10 +233,10 @@ async def call_openai(model_id: str, claim: str) -> dict:
         "response_format": {"type": "json_object"},
         "messages": [
             {"role": "system", "content": "You are a factuality judge. Respond in JSON format."},
-            {"role": "user", "content": JSON_PROMPT.format(claim=claim)}
+            {"role": "user", "content": prompt}
         ],
         "temperature": 0.0,
-        "max_tokens": 1024
+        "max_tokens": max_tokens
     }
 
     try:
@@ -173,16 +247,19 @@ async def call_openai(model_id: str, claim: str) -> dict:
         content = payload["choices"][0]["message"]["content"]
         if not content:
             raise ValueError("Empty response from OpenAI")
-        parsed = _safe_json(content)
-        return _normalize_judgement(parsed)
+        return _safe_json(content)
     except httpx.HTTPStatusError as e:
-        raise HTTPException(e.response.status_code, f"OpenAI API error: {e.response.text}")
+        raise HTTPException(
+            e.response.status_code,
+            f"OpenAI API error: {e.response.text}",
+            headers=_retry_headers(e.response),
+        )
     except httpx.ConnectError:
         raise HTTPException(504, "Failed to connect to OpenAI API.")
     except Exception as e:
         raise HTTPException(502, f"OpenAI request error ({model_id}): {e}")
 
-async def call_gemini(model_id: str, claim: str) -> dict:
+async def _gemini_json(model_id: str, prompt: str, max_tokens: int = 1024) -> dict:
     api_key = os.getenv("GEMINI_API_KEY")
     if not api_key:
         raise HTTPException(500, "GEMINI_API_KEY is not set")
@@ -190,7 +267,7 @@ async def call_gemini(model_id: str, claim: str) -> dict:
     async def _try_once(mid: str):
         url = f"https://generativelanguage.googleapis.com/v1beta/models/{mid}:generateContent?key={api_key}"
         body = {
-            "contents": [{"role": "user", "parts": [{"text": JSON_PROMPT.format(claim=claim)}]}],
+            "contents": [{"role": "user", "parts": [{"text": prompt}]}],
             "generationConfig": {"responseMimeType": "application/json"},
         }
         async with httpx.AsyncClient(timeout=60.0) as client:
@@ -202,7 +279,7 @@ async def call_gemini(model_id: str, claim: str) -> dict:
         parts = data.get("candidates", [{}])[0].get("content", {}).get("parts", [])
         if not parts or not parts[0].get("text"):
             raise HTTPException(502, f"Gemini empty response: {data}")
-        return _normalize_judgement(_safe_json(parts[0]["text"]))
+        return _safe_json(parts[0]["text"])
 
     try:
         try:
@@ -212,11 +289,15 @@ async def call_gemini(model_id: str, claim: str) -> dict:
                 return await _try_once(model_id + "-latest")
             raise
     except httpx.HTTPStatusError as e:
-        raise HTTPException(e.response.status_code, f"Gemini API error: {e.response.text}")
+        raise HTTPException(
+            e.response.status_code,
+            f"Gemini API error: {e.response.text}",
+            headers=_retry_headers(e.response),
+        )
     except Exception as e:
         raise HTTPException(502, f"Gemini request error ({model_id}): {e}")
 
-async def call_groq(model_id: str, claim: str) -> dict:
+async def _groq_json(model_id: str, prompt: str, max_tokens: int = 1024) -> dict:
     api_key = os.getenv("GROQ_API_KEY")
     if not api_key:
         raise HTTPException(500, "GROQ_API_KEY is not set")
@@ -229,10 +310,10 @@ async def call_groq(model_id: str, claim: str) -> dict:
             "model": mid,
             "messages": [
                 {"role": "system", "content": "You are a factuality judge. Respond in JSON."},
-                {"role": "user", "content": JSON_PROMPT.format(claim=claim)}
+                {"role": "user", "content": prompt}
             ],
             "temperature": 0.0,
-            "max_tokens": 1024,
+            "max_tokens": max_tokens,
             "response_format": {"type": "json_object"}
         }
         async with httpx.AsyncClient(timeout=60.0) as client:
@@ -249,7 +330,7 @@ async def call_groq(model_id: str, claim: str) -> dict:
         content = payload["choices"][0]["message"]["content"]
         if not content:
             raise HTTPException(502, f"Groq empty response: {payload}")
-        return _normalize_judgement(_safe_json(content))
+        return _safe_json(content)
 
     try:
         try:
@@ -267,10 +348,36 @@ async def call_groq(model_id: str, claim: str) -> dict:
                     continue
             raise HTTPException(502, f"Groq model decommissioned and no fallback available for: {model_id}")
     except httpx.HTTPStatusError as e:
-        raise HTTPException(e.response.status_code, f"Groq API error: {e.response.text}")
+        raise HTTPException(
+            e.response.status_code,
+            f"Groq API error: {e.response.text}",
+            headers=_retry_headers(e.response),
+        )
     except Exception as e:
         raise HTTPException(502, f"Groq request error ({model_id}): {e}")
 
+async def call_openai(model_id: str, claim: str) -> dict:
+    return _normalize_judgement(await _openai_json(model_id, JSON_PROMPT.format(claim=claim)))
+
+async def call_gemini(model_id: str, claim: str) -> dict:
+    return _normalize_judgement(await _gemini_json(model_id, JSON_PROMPT.format(claim=claim)))
+
+async def call_groq(model_id: str, claim: str) -> dict:
+    return _normalize_judgement(await _groq_json(model_id, JSON_PROMPT.format(claim=claim)))
+
+# ---------------- 배치 판정 (여러 claim을 한 요청으로) ---------------- #
+async def call_openai_batch(model_id: str, claims: dict[str, str]) -> dict[str, dict]:
+    data = await _openai_json(model_id, build_batch_prompt(claims), _batch_max_tokens(claims))
+    return parse_batch_verdicts(data, claims)
+
+async def call_gemini_batch(model_id: str, claims: dict[str, str]) -> dict[str, dict]:
+    data = await _gemini_json(model_id, build_batch_prompt(claims), _batch_max_tokens(claims))
+    return parse_batch_verdicts(data, claims)
+
+async def call_groq_batch(model_id: str, claims: dict[str, str]) -> dict[str, dict]:
+    data = await _groq_json(model_id, build_batch_prompt(claims), _batch_max_tokens(claims))
+    return parse_batch_verdicts(data, claims)
+
 
 # ---------------- 결과 구성/소켓 전송 ---------------- #
 def _build_output_entry(node: Node, score: float, explanation: str) -> dict:
@@ -290,28 +397,36 @@ def _build_output_entry(node: Node, score: float, explanation: str) -> dict:
         "references": []  # 현재 모델 응답 포맷에서는 근거 출처 링크를 직접적으로 받지 않으므로 빈 배열
     }
 
-async def _judge_once(claim: str) -> tuple[str, float, str, list[dict]]:
+def _build_skipped_entry(node: Node, check_worthiness: float) -> dict:
     """
-    기존 패널 합의 로직을 그대로 재사용해 단일 claim에 대한
-    최종 verdict, score, explanation, raw panel을 반환
+    triage에서 판정하지 않은 노드의 출력 (trustScore 없음)
     """
+    return {
+        "trustScore": None,
+        "id": node.id,
+        "reasoning": "검증이 필요한 주장이나 사실이 아니라고 판단되어 판정하지 않았습니다.",
+        "references": [],
+        "skipped": True,
+        "checkWorthiness": check_worthiness,
+    }
+
+def _panel_models() -> list[tuple[str, str]]:
+    """판정 패널에 포함할 (provider, model_id) 목록"""
     openai_model = os.getenv("OPENAI_MODEL") or "gpt-4o-mini"
     gemini_model = os.getenv("GEMINI_MODEL") or "gemini-1.5-flash-latest"
     groq_model   = os.getenv("GROQ_MODEL")   or "llama-3.1-70b-versatile"
-
-    tasks = []
-    if os.getenv("OPENAI_API_KEY"):
-        tasks.append(asyncio.create_task(_wrap(f"openai:{openai_model}", call_openai(openai_model, claim))))
-    if os.getenv("GEMINI_API_KEY"):
-        tasks.append(asyncio.create_task(_wrap(f"gemini:{gemini_model}", call_gemini(gemini_model, claim))))
-    if os.getenv("GROQ_API_KEY"):
-        tasks.append(asyncio.create_task(_wrap(f"groq:{groq_model}", call_groq(groq_model, claim))))
-
-    if not tasks:
+    backend = get_llm_backend()
+    panel = [
+        (provider, model_id)
+        for provider, model_id in (("openai", openai_model), ("gemini", gemini_model), ("groq", groq_model))
+        if backend.provider_enabled(provider)
+    ]
+    if not panel:
         raise HTTPException(500, "No providers configured. Set OPENAI_API_KEY or GEMINI_API_KEY or GROQ_API_KEY")
+    return panel
 
-    results = await asyncio.gather(*tasks)
-
+def _aggregate_panel(results: list[dict]) -> tuple[str, float, str]:
+    """provider 결과들을 다수결 verdict, 평균 신뢰도, 근거 요약으로 집계"""
     counts = {"TRUE": 0, "FALSE": 0, "UNCERTAIN": 0}
     confs = []
     rationales = []
@@ -330,8 +445,136 @@ async def _judge_once(claim: str) -> tuple[str, float, str, list[dict]]:
     final = max(counts.items(), key=lambda kv: (kv[1], kv[0] == "UNCERTAIN"))[0]
     score = round(sum(confs) / max(len(confs), 1), 3)
     explanation = " | ".join(rationales[:3]) if rationales else "No rationale available."
+    return final, score, explanation
+
+async def _judge_once(claim: str) -> tuple[str, float, str, list[dict]]:
+    """
+    기존 패널 합의 로직을 그대로 재사용해 단일 claim에 대한
+    최종 verdict, score, explanation, raw panel을 반환
+    """
+    # 헤지 요청을 위해 코루틴 대신 호출 팩토리를 등록
+    # 각 호출은 provider별 rate limit / 재시도 / 서킷 브레이커를 거침
+    # LLM_BACKEND=standin 이면 외부 API 대신 로컬 대역 백엔드가 응답
+    backend = get_llm_backend()
+    tokens = estimate_tokens(JSON_PROMPT.format(claim=claim), max_output_tokens=1024)
+    calls = {}
+    for provider, model_id in _panel_models():
+        name = f"{provider}:{model_id}"
+        calls[name] = lambda name=name, provider=provider, model_id=model_id: _wrap(name, resilient_call(
+            provider, model_id, lambda: backend.judge(provider, model_id, claim), tokens))
+
+    # JUDGE_MODE=quorum 이면 합의 시 조기 종료 (verdict 집계 방식은 동일)
+    results = await PanelRunner().run(calls)
+
+    final, score, explanation = _aggregate_panel(results)
     return final, score, explanation, results
 
+async def _judge_batch_once(claims: dict[str, str]) -> dict[str, tuple[str, float, str, list[dict]]]:
+    """
+    여러 claim을 provider당 한 번의 요청으로 판정
+
+    배치 응답에서 누락되었거나 형식이 잘못된 claim(배치 요청 자체가 실패한 경우 포함)만
+    해당 provider에 단일 claim 요청으로 다시 물어봄
+
+    Args:
+        claims: claim id -> 텍스트
+
+    Returns:
+        dict: claim id -> (verdict, score, explanation, panel)
+    """
+    backend = get_llm_backend()
+    prompt = build_batch_prompt(claims)
+    tokens = estimate_tokens(prompt, max_output_tokens=_batch_max_tokens(claims))
+
+    async def _provider(provider: str, model_id: str) -> dict[str, dict]:
+        name = f"{provider}:{model_id}"
+        try:
+            verdicts = await resilient_call(
+                provider, model_id, lambda: backend.judge_batch(provider, model_id, claims), tokens)
+        except Exception as e:
+            detail = e.detail if isinstance(e, HTTPException) else e
+            print(f"[WARN] Batched judge failed ({name}, {len(claims)} claims): {detail}")
+            verdicts = {}
+        entries = {cid: {"provider": name, **verdicts[cid]} for cid in claims if cid in verdicts}
+        missing = [cid for cid in claims if cid not in entries]
+        JUDGE_BATCH_CLAIMS_TOTAL.labels(provider=provider, result="batched").inc(len(entries))
+        JUDGE_BATCH_CLAIMS_TOTAL.labels(provider=provider, result="reasked").inc(len(missing))
+        if missing:
+            retried = await asyncio.gather(*(
+                _wrap(name, resilient_call(
+                    provider, model_id,
+                    lambda cid=cid: backend.judge(provider, model_id, claims[cid]),
+                    estimate_tokens(JSON_PROMPT.format(claim=claims[cid]), max_output_tokens=1024),
+                ))
+                for cid in missing
+            ))
+            entries.update(zip(missing, retried))
+        return entries
+
+    per_provider = await asyncio.gather(*(_provider(p, m) for p, m in _panel_models()))
+    judged = {}
+    for cid in claims:
+        panel = [entries[cid] for entries in per_provider]
+        judged[cid] = (*_aggregate_panel(panel), panel)
+    return judged
+
+def _memo_lookup(claim: str) -> tuple[str, float, str, list[dict]] | None:
+    """판정 캐시에서 유사 claim의 판정 조회"""
+    memo = VerdictCache.get_instance()
+    match = memo.lookup(claim)
+    record_cache("verdict", hit=match is not None)
+    if match is None:
+        return None
+    entry = match.entry
+    panel = [{
+        "provider": "verdict_cache",
+        "matched_claim": entry.claim,
+        "similarity": round(match.similarity, 3),
+    }]
+    return entry.verdict, entry.score, entry.explanation, panel
+
+def _memo_store(claim: str, final: str, score: float, explanation: str, panel: list[dict]):
+    # 모든 provider가 실패한 판정은 캐시하지 않음
+    if any("error" not in r for r in panel):
+        VerdictCache.get_instance().store(claim, final, score, explanation)
+
+async def _judge_with_memo(claim: str) -> tuple[str, float, str, list[dict]]:
+    """
+    판정 캐시에서 유사 claim을 먼저 찾고, 없을 때만 패널 판정(_judge_once) 수행
+    """
+    cached = _memo_lookup(claim)
+    if cached is not None:
+        return cached
+
+    final, score, explanation, panel = await _judge_once(claim)
+    _memo_store(claim, final, score, explanation, panel)
+    return final, score, explanation, panel
+
+async def _judge_batch_with_memo(claims: dict[str, str]) -> dict[str, tuple[str, float, str, list[dict]]]:
+    """
+    판정 캐시에 없는 claim만 JUDGE_BATCH_SIZE개씩 묶어 배치 판정
+    """
+    judged = {}
+    misses = {}
+    for cid, claim in claims.items():
+        cached = _memo_lookup(claim)
+        if cached is not None:
+            judged[cid] = cached
+        else:
+            misses[cid] = claim
+
+    ids = list(misses)
+    chunks = [ids[i:i + JUDGE_BATCH_SIZE] for i in range(0, len(ids), JUDGE_BATCH_SIZE)]
+    with stage("judge", claims=len(ids), batches=len(chunks)):
+        results = await asyncio.gather(*(
+            _judge_batch_once({cid: misses[cid] for cid in chunk}) for chunk in chunks
+        ))
+    for part in results:
+        for cid, (final, score, explanation, panel) in part.items():
+            _memo_store(misses[cid], final, score, explanation, panel)
+            judged[cid] = (final, score, explanation, panel)
+    return judged
+
 async def _emit_to_socket(payload: dict) -> dict:
     """
     1) HTTP POST 우선 시도 (기본: http://localhost:5174/api/socket)
@@ -408,12 +651,34 @@ async def ask_llm(req: AskRequest):
     result_map: dict[str, dict] = {}
     per_node_debug: dict[str, dict] = {}
 
-    for idx, node in enumerate(nodes, start=1):
+    # 검증 가치가 낮은 노드는 건너뛰고, 같은 텍스트의 노드는 한 번만 판정
+    decisions = CheckWorthinessTriage.get_instance().select(nodes)
+    judged: dict[str, tuple[str, float, str, list[dict]]] = {}
+
+    # JUDGE_BATCH=1 이면 판정할 노드를 provider당 몇 번의 배치 요청으로 미리 판정
+    if JUDGE_BATCH:
+        targets = [node for node, decision in zip(nodes, decisions) if decision.action == "judge"]
+        batch_ids = {f"c{i}": node.id for i, node in enumerate(targets, start=1)}
+        batch = await _judge_batch_with_memo({cid: node.text for cid, node in zip(batch_ids, targets)})
+        judged = {batch_ids[cid]: result for cid, result in batch.items()}
+
+    for idx, (node, decision) in enumerate(zip(nodes, decisions), start=1):
         cls = (node.classification or "").strip().upper()
         key_prefix = "fact" if cls == "FACT" else "claim"
         out_key = f"{key_prefix}_{idx}"
 
-        final, score, explanation, panel = await _judge_once(node.text)
+        if decision.action == "skip":
+            result_map[out_key] = _build_skipped_entry(node, decision.score)
+            per_node_debug[out_key] = {"node_id": node.id, "classification": cls, "skipped": True}
+            continue
+        if decision.action == "duplicate":
+            final, score, explanation, panel = judged[decision.duplicate_of]
+        elif node.id in judged:
+            final, score, explanation, panel = judged[node.id]
+        else:
+            with stage("judge", node_id=node.id):
+                final, score, explanation, panel = await _judge_with_memo(node.text)
+            judged[node.id] = (final, score, explanation, panel)
 
         result_map[out_key] = _build_output_entry(node, score, explanation)
         per_node_debug[out_key] = {
@@ -421,6 +686,7 @@ async def ask_llm(req: AskRequest):
             "classification": cls,
             "model_verdict": final,
             "model_score_mean": score,
+            "check_worthiness": decision.score,
             "panel": panel
         }
 
@@ -433,3 +699,45 @@ async def ask_llm(req: AskRequest):
         "result": result_map,
         # "debug": per_node_debug
     }
+
+@router.get("/ask/cache/info")
+async def get_verdict_cache_info():
+    """
+    판정 캐시 정보 조회
+    """
+    return VerdictCache.get_instance().get_cache_info()
+
+@router.get("/ask/triage/info")
+async def get_triage_info():
+    """
+    check-worthiness triage 설정과 판정/중복/건너뜀 노드 수 조회
+    """
+    return CheckWorthinessTriage.get_instance().get_info()
+
+@router.get("/ask/providers/latency")
+async def get_provider_latency():
+    """
+    provider별 관측 지연시간(p50/p95) 조회
+    """
+    return ProviderLatencyTracker.get_instance().snapshot()
+
+@router.get("/ask/providers/resilience")
+async def get_provider_resilience():
+    """
+    provider별 서킷 브레이커 상태와 rate limit 대기 지표 조회
+    """
+    return ResilienceManager.get_instance().get_metrics()
+
+@router.delete("/ask/cache/clear")
+async def clear_verdict_cache():
+    """
+    판정 캐시 모두 삭제
+    """
+    try:
+        VerdictCache.get_instance().clear()
+        return {"message": "Verdict cache cleared successfully"}
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"판정 캐시 삭제 중 오류가 발생했습니다: {str(e)}"
+        )
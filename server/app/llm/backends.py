@@ -0,0 +1,256 @@
+"""
+LLM 백엔드 추상화
+- remote: 실제 OpenAI / Gemini / Groq API 호출 (기본값)
+- standin: 외부 API 없이 동작하는 결정적(deterministic) 로컬 대역 백엔드
+  지연시간 분포, 오류율, rate limit을 환경 변수로 설정해 오프라인 부하 테스트에 사용
+
+LLM_BACKEND=standin 으로 전환
+"""
+
+import asyncio
+import hashlib
+import math
+import os
+import random
+import re
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from threading import Lock
+from typing import Deque, Dict, Optional
+
+from fastapi import HTTPException
+
+PROVIDER_KEYS = {
+    "openai": "OPENAI_API_KEY",
+    "gemini": "GEMINI_API_KEY",
+    "groq": "GROQ_API_KEY",
+}
+
+
+class LLMBackend(ABC):
+    """파이프라인이 사용하는 LLM 호출 인터페이스 (메서드를 하나라도 빠뜨린 백엔드는 생성 시 TypeError)"""
+
+    name = "base"
+
+    @abstractmethod
+    def provider_enabled(self, provider: str) -> bool:
+        """판정 패널에 해당 provider를 포함할지 여부"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def judge(self, provider: str, model_id: str, claim: str) -> dict:
+        """
+        단일 claim 판정
+
+        Returns:
+            dict: verdict, confidence, rationale
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def judge_batch(self, provider: str, model_id: str, claims: Dict[str, str]) -> Dict[str, dict]:
+        """
+        여러 claim을 한 요청으로 판정
+
+        Args:
+            claims: claim id -> 텍스트
+
+        Returns:
+            Dict[str, dict]: 정상 응답을 받은 claim id -> verdict, confidence, rationale
+            (누락/형식 오류 claim은 빠짐, 호출자가 개별 재요청)
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def generate_text(self, model_id: str, prompt: str) -> str:
+        """Gemini 텍스트 생성 (문장 분류, 관계 분석에 사용)"""
+        raise NotImplementedError
+
+
+class RemoteBackend(LLMBackend):
+    """실제 provider API를 호출하는 백엔드"""
+
+    name = "remote"
+
+    def __init__(self):
+        import google.generativeai as genai
+        self.client = genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+
+    def provider_enabled(self, provider: str) -> bool:
+        return bool(os.getenv(PROVIDER_KEYS[provider]))
+
+    async def judge(self, provider: str, model_id: str, claim: str) -> dict:
+        # ask 모듈이 이 모듈을 import 하므로 순환 참조를 피하기 위해 지연 import
+        from app.llm import ask
+        callers = {
+            "openai": ask.call_openai,
+            "gemini": ask.call_gemini,
+            "groq": ask.call_groq,
+        }
+        return await callers[provider](model_id, claim)
+
+    async def judge_batch(self, provider: str, model_id: str, claims: Dict[str, str]) -> Dict[str, dict]:
+        from app.llm import ask
+        callers = {
+            "openai": ask.call_openai_batch,
+            "gemini": ask.call_gemini_batch,
+            "groq": ask.call_groq_batch,
+        }
+        return await callers[provider](model_id, claims)
+
+    async def generate_text(self, model_id: str, prompt: str) -> str:
+        response = self.client.models.generate_content(
+            model=model_id,
+            contents=prompt
+        )
+        return response.text
+
+
+def _parse_latency_spec(spec: str) -> tuple[str, tuple[float, ...]]:
+    """
+    지연시간 분포 설정 파싱
+
+    형식: "fixed:0.5" | "uniform:0.2,1.5" | "lognormal:<median>,<sigma>" | "exp:<mean>"
+    """
+    kind, _, args = spec.partition(":")
+    values = tuple(float(x) for x in args.split(",") if x.strip())
+    return kind.strip().lower(), values
+
+
+class StandInBackend(LLMBackend):
+    """
+    결정적 로컬 대역 백엔드
+
+    같은 시드 / provider / 입력 / 호출 순번이면 항상 같은 지연시간, 오류, 응답을 생성
+
+    환경 변수
+      STANDIN_SEED: 난수 시드 (기본 0)
+      STANDIN_LATENCY: 기본 지연시간 분포 (기본 "lognormal:0.8,0.4")
+      STANDIN_LATENCY_<PROVIDER>: provider별 분포 (OPENAI, GEMINI, GROQ)
+      STANDIN_ERROR_RATE: 503 오류 확률 (0~1)
+      STANDIN_RATE_LIMIT_RPM: provider별 분당 허용 요청 수 (초과 시 429 + Retry-After)
+      STANDIN_BATCH_MISSING_RATE: 배치 판정 응답에서 claim을 빠뜨릴 확률 (0~1)
+    """
+
+    name = "standin"
+
+    def __init__(self):
+        self.seed = os.getenv("STANDIN_SEED", "0")
+        self.default_latency = os.getenv("STANDIN_LATENCY", "lognormal:0.8,0.4")
+        self.error_rate = float(os.getenv("STANDIN_ERROR_RATE", "0"))
+        self.rate_limit_rpm = int(os.getenv("STANDIN_RATE_LIMIT_RPM", "0"))
+        self.batch_missing_rate = float(os.getenv("STANDIN_BATCH_MISSING_RATE", "0"))
+        self._call_counts: Dict[str, int] = {}
+        self._windows: Dict[str, Deque[float]] = {}
+        self.stats = {"calls": 0, "errors": 0, "rate_limited": 0}
+
+    def provider_enabled(self, provider: str) -> bool:
+        return True
+
+    def _rng(self, provider: str, payload: str) -> random.Random:
+        base = f"{self.seed}:{provider}:{payload}"
+        count = self._call_counts.get(base, 0)
+        self._call_counts[base] = count + 1
+        digest = hashlib.sha256(f"{base}:{count}".encode()).hexdigest()
+        return random.Random(int(digest[:16], 16))
+
+    def _sample_latency(self, provider: str, rng: random.Random) -> float:
+        spec = os.getenv(f"STANDIN_LATENCY_{provider.upper()}", self.default_latency)
+        kind, args = _parse_latency_spec(spec)
+        if kind == "fixed":
+            return args[0]
+        if kind == "uniform":
+            return rng.uniform(args[0], args[1])
+        if kind == "exp":
+            return rng.expovariate(1.0 / args[0])
+        if kind == "lognormal":
+            median, sigma = args
+            return rng.lognormvariate(math.log(median), sigma)
+        raise ValueError(f"Unknown latency distribution: {spec}")
+
+    def _check_rate_limit(self, provider: str):
+        if self.rate_limit_rpm <= 0:
+            return
+        now = time.monotonic()
+        window = self._windows.setdefault(provider, deque())
+        while window and now - window[0] >= 60.0:
+            window.popleft()
+        if len(window) >= self.rate_limit_rpm:
+            self.stats["rate_limited"] += 1
+            retry_after = max(0.0, 60.0 - (now - window[0]))
+            raise HTTPException(
+                429,
+                f"Stand-in {provider} rate limit exceeded",
+                headers={"Retry-After": f"{retry_after:.2f}"},
+            )
+        window.append(now)
+
+    async def _simulate(self, provider: str, payload: str) -> random.Random:
+        """rate limit → 지연 → 오류 주입 순으로 실제 API 동작을 흉내"""
+        self.stats["calls"] += 1
+        self._check_rate_limit(provider)
+        rng = self._rng(provider, payload)
+        await asyncio.sleep(self._sample_latency(provider, rng))
+        if rng.random() < self.error_rate:
+            self.stats["errors"] += 1
+            raise HTTPException(503, f"Stand-in {provider} injected error")
+        return rng
+
+    async def judge(self, provider: str, model_id: str, claim: str) -> dict:
+        rng = await self._simulate(provider, claim)
+        verdict = rng.choices(["TRUE", "FALSE", "UNCERTAIN"], weights=[5, 2, 3])[0]
+        return {
+            "verdict": verdict,
+            "confidence": round(rng.uniform(0.4, 0.95), 3),
+            "rationale": f"[stand-in {provider}:{model_id}] {verdict}",
+        }
+
+    async def judge_batch(self, provider: str, model_id: str, claims: Dict[str, str]) -> Dict[str, dict]:
+        # 요청 하나의 지연/오류를 흉내낸 뒤 claim별 판정은 단일 판정과 같은 방식으로 생성
+        rng = await self._simulate(provider, "\n".join(claims.values()))
+        verdicts = {}
+        for cid, claim in claims.items():
+            if rng.random() < self.batch_missing_rate:
+                continue
+            claim_rng = self._rng(provider, claim)
+            verdict = claim_rng.choices(["TRUE", "FALSE", "UNCERTAIN"], weights=[5, 2, 3])[0]
+            verdicts[cid] = {
+                "verdict": verdict,
+                "confidence": round(claim_rng.uniform(0.4, 0.95), 3),
+                "rationale": f"[stand-in {provider}:{model_id} batch] {verdict}",
+            }
+        return verdicts
+
+    async def generate_text(self, model_id: str, prompt: str) -> str:
+        rng = await self._simulate("gemini", prompt)
+        if "두 문장 간의 관계" in prompt:
+            relationship = rng.choices(["supports", "contradicts", "relates", "none"], weights=[3, 1, 3, 3])[0]
+            return f"관계: {relationship}\n신뢰도: {rng.uniform(0.3, 0.95):.2f}\n이유: stand-in"
+        # 분류 요청: 숫자/통계 표현이 있으면 FACT, 아니면 CLAIM
+        text = prompt.rsplit("분류할 텍스트:", 1)[-1].strip()
+        label = "FACT" if re.search(r"\d|%|퍼센트|연구|조사", text) else "CLAIM"
+        return f"문장: {text}\n분류: {label}"
+
+
+_backend: Optional[LLMBackend] = None
+_backend_lock = Lock()
+
+
+def get_llm_backend() -> LLMBackend:
+    """LLM_BACKEND 환경 변수에 따른 백엔드 싱글톤 반환"""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                kind = os.getenv("LLM_BACKEND", "remote").strip().lower()
+                _backend = StandInBackend() if kind == "standin" else RemoteBackend()
+                print(f"LLM backend: {_backend.name}")
+    return _backend
+
+
+def set_llm_backend(backend: LLMBackend):
+    """백엔드 교체 (벤치마크/부하 테스트용)"""
+    global _backend
+    with _backend_lock:
+        _backend = backend
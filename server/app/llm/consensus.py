@@ -0,0 +1,183 @@
+"""
+판정 패널 실행 전략
+- provider별 관측 지연시간(p95) 기반 적응형 타임아웃
+- p95를 넘긴 요청에 대한 헤지(hedged) 재요청
+- 정족수(quorum) 합의 시 조기 종료 및 남은 요청 취소
+"""
+
+import asyncio
+import math
+import os
+import time
+from collections import deque
+from threading import Lock
+from typing import Awaitable, Callable, Deque, Dict, List, Optional
+
+# provider 호출 하나를 새로 만들어 주는 팩토리 (헤지 시 같은 요청을 한 번 더 만들 수 있어야 함)
+CallFactory = Callable[[], Awaitable[dict]]
+
+
+class ProviderLatencyTracker:
+    """provider별 최근 응답 지연시간을 보관하고 p95 기반 타임아웃을 계산"""
+
+    _instance: Optional['ProviderLatencyTracker'] = None
+    _lock = Lock()
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        """
+        Args:
+            window: provider별로 보관할 최근 관측치 수
+            min_samples: p95를 신뢰하기 위한 최소 관측치 수
+        """
+        self.window = window
+        self.min_samples = min_samples
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(self, provider: str, latency: float):
+        """성공한 호출의 지연시간(초) 기록"""
+        self._samples.setdefault(provider, deque(maxlen=self.window)).append(latency)
+
+    def percentile(self, provider: str, q: float = 0.95) -> Optional[float]:
+        """관측치가 충분하면 분위수 반환, 아니면 None"""
+        samples = self._samples.get(provider)
+        if not samples or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        idx = min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))
+        return ordered[idx]
+
+    def timeout_for(self, provider: str, default: float, factor: float, floor: float) -> float:
+        """
+        p95 * factor 를 [floor, default] 범위로 자른 타임아웃 반환
+
+        Args:
+            provider: provider 이름 (예: "openai:gpt-4o-mini")
+            default: 관측치가 부족할 때 사용할 기본/최대 타임아웃
+            factor: p95에 곱할 여유 배수
+            floor: 최소 타임아웃
+        """
+        p95 = self.percentile(provider)
+        if p95 is None:
+            return default
+        return max(floor, min(default, p95 * factor))
+
+    def snapshot(self) -> Dict[str, dict]:
+        """provider별 관측치 수와 p50/p95"""
+        return {
+            provider: {
+                "samples": len(samples),
+                "p50": self.percentile(provider, 0.5),
+                "p95": self.percentile(provider, 0.95),
+            }
+            for provider, samples in self._samples.items()
+        }
+
+    @classmethod
+    def get_instance(cls) -> 'ProviderLatencyTracker':
+        """싱글톤 인스턴스 반환"""
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+
+class PanelRunner:
+    """
+    판정 패널 실행기
+
+    JUDGE_MODE
+      - all: 모든 provider 결과를 기다림 (기존 동작)
+      - quorum: JUDGE_QUORUM 개 provider의 verdict가 일치하면 즉시 반환하고 나머지는 취소
+    JUDGE_ADAPTIVE_TIMEOUT=1: provider별 p95 * JUDGE_TIMEOUT_FACTOR 로 타임아웃 단축
+    JUDGE_HEDGE=1: p95 안에 응답이 없으면 같은 요청을 한 번 더 보내 먼저 온 응답 사용
+    """
+
+    def __init__(self, tracker: Optional[ProviderLatencyTracker] = None):
+        self.tracker = tracker or ProviderLatencyTracker.get_instance()
+        self.mode = os.getenv("JUDGE_MODE", "all").strip().lower()
+        self.quorum = int(os.getenv("JUDGE_QUORUM", "2"))
+        self.adaptive_timeout = os.getenv("JUDGE_ADAPTIVE_TIMEOUT", "0") == "1"
+        self.hedge = os.getenv("JUDGE_HEDGE", "0") == "1"
+        self.max_timeout = float(os.getenv("JUDGE_MAX_TIMEOUT", "120"))
+        self.timeout_factor = float(os.getenv("JUDGE_TIMEOUT_FACTOR", "2.0"))
+        self.min_timeout = float(os.getenv("JUDGE_MIN_TIMEOUT", "5.0"))
+
+    async def _hedged(self, provider: str, factory: CallFactory) -> dict:
+        """첫 요청이 p95 안에 끝나지 않으면 헤지 요청을 추가로 보내고 먼저 성공한 응답 사용"""
+        hedge_delay = self.tracker.percentile(provider) if self.hedge else None
+        primary = asyncio.create_task(factory())
+        if hedge_delay is None:
+            return await primary
+
+        pending = {primary}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=hedge_delay)
+            if done:
+                return primary.result()
+            pending.add(asyncio.create_task(factory()))
+            last: Optional[dict] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    last = task.result()
+                    if "error" not in last:
+                        return last
+            return last
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _run_one(self, provider: str, factory: CallFactory) -> dict:
+        """타임아웃/헤지를 적용해 provider 하나 실행하고 성공 지연시간 기록"""
+        timeout = self.max_timeout
+        if self.adaptive_timeout:
+            timeout = self.tracker.timeout_for(
+                provider, self.max_timeout, self.timeout_factor, self.min_timeout
+            )
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(self._hedged(provider, factory), timeout=timeout)
+        except asyncio.TimeoutError:
+            return {"provider": provider, "error": f"timeout after {timeout:.1f}s"}
+        if "error" not in result:
+            self.tracker.record(provider, time.perf_counter() - started)
+        return result
+
+    def _has_quorum(self, results: List[dict]) -> bool:
+        counts: Dict[str, int] = {}
+        for r in results:
+            if "error" in r:
+                continue
+            v = str(r.get("verdict", "UNCERTAIN")).upper()
+            counts[v] = counts.get(v, 0) + 1
+            if counts[v] >= self.quorum:
+                return True
+        return False
+
+    async def run(self, calls: Dict[str, CallFactory]) -> List[dict]:
+        """
+        provider 호출들을 실행 전략에 따라 수행
+
+        Args:
+            calls: provider 이름 -> 호출 팩토리
+
+        Returns:
+            List[dict]: 완료된 provider 결과들 (취소된 provider는 제외)
+        """
+        tasks = [asyncio.create_task(self._run_one(name, factory)) for name, factory in calls.items()]
+        if self.mode != "quorum":
+            return list(await asyncio.gather(*tasks))
+
+        results: List[dict] = []
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                results.extend(task.result() for task in done)
+                if self._has_quorum(results):
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+        return results
@@ -0,0 +1,376 @@
+"""
+LLM 호출 공통 복원력(resilience) 계층
+- provider/모델별 토큰 버킷 (RPM/TPM) 제한
+- Retry-After를 존중하는 지터(jitter) 포함 지수 백오프 재시도
+- 연속 실패 시 provider를 일시적으로 건너뛰는 서킷 브레이커
+"""
+
+import asyncio
+import json
+import os
+import random
+import time
+from threading import Lock
+from typing import Awaitable, Callable, Dict, List, Optional, TypeVar
+
+import httpx
+from fastapi import HTTPException
+
+from app.metrics import (
+    LLM_BREAKER_OPEN,
+    LLM_CALL_SECONDS,
+    LLM_CALLS_TOTAL,
+    LLM_RETRIES_TOTAL,
+    LLM_THROTTLE_WAIT_SECONDS,
+    LLM_TOKENS_TOTAL,
+)
+from app.timing import span
+
+T = TypeVar("T")
+
+_BREAKER_GAUGE = {"closed": 0.0, "half_open": 0.5, "open": 1.0}
+
+# 재시도할 HTTP 상태 코드 (rate limit / 일시적 서버 오류)
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+# 상태 코드와 관계없이 재시도할 네트워크 오류 (타임아웃, 연결 실패/끊김)
+TRANSIENT_ERRORS = (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)
+
+
+def estimate_tokens(text: str, max_output_tokens: int = 0) -> int:
+    """프롬프트 길이로 대략적인 토큰 수 추정 (TPM 버킷용)"""
+    return max(1, len(text or "") // 3) + max_output_tokens
+
+
+def _status_of(exc: BaseException) -> Optional[int]:
+    """예외에서 HTTP 상태 코드 추출 (HTTPException, httpx, Google SDK 예외)"""
+    if isinstance(exc, HTTPException):
+        return exc.status_code
+    response = getattr(exc, "response", None)
+    status = getattr(response, "status_code", None)
+    if isinstance(status, int):
+        return status
+    for attr in ("status_code", "code"):
+        value = getattr(exc, attr, None)
+        try:
+            return int(value) if value is not None else None
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def _exception_chain(exc: BaseException) -> List[BaseException]:
+    """예외와 그 원인들 (raise ... from / except 블록 안에서 감싼 예외 포함)"""
+    chain = []
+    while exc is not None and exc not in chain:
+        chain.append(exc)
+        exc = exc.__cause__ or exc.__context__
+    return chain
+
+
+def _is_transient(exc: BaseException) -> bool:
+    """
+    재시도하고 서킷 브레이커 실패로 셀 일시적 오류인지
+
+    네트워크 타임아웃/연결 오류, 또는 provider가 돌려준 재시도 가능 상태 코드만 해당
+    응답 파싱 실패나 코드 오류(KeyError, AttributeError, JSONDecodeError 등)는
+    HTTPException으로 감싸져 있어도 다시 호출해도 같은 결과라 재시도하지 않음
+    """
+    chain = _exception_chain(exc)
+    if any(isinstance(e, TRANSIENT_ERRORS) for e in chain):
+        return True
+    if any(_status_of(e) is None for e in chain):
+        return False
+    return _status_of(exc) in RETRYABLE_STATUS
+
+
+def _retry_after_of(exc: BaseException) -> Optional[float]:
+    """예외에 담긴 Retry-After 헤더 값(초) 추출"""
+    headers = getattr(exc, "headers", None)
+    if headers is None:
+        headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    value = headers.get("Retry-After") or headers.get("retry-after")
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """분당 허용량 기반 토큰 버킷"""
+
+    def __init__(self, per_minute: float):
+        self.rate = per_minute / 60.0
+        self.capacity = per_minute
+        self.tokens = float(per_minute)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float = 1.0) -> float:
+        """
+        토큰을 확보할 때까지 대기
+
+        Returns:
+            float: 대기한 시간 (초)
+        """
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return waited
+                delay = (amount - self.tokens) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+
+
+class CircuitBreaker:
+    """연속 실패 횟수 기반 서킷 브레이커 (closed → open → half_open)"""
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.open_count = 0
+        self._probe_in_flight = False
+
+    def allow(self) -> bool:
+        """요청을 보내도 되는지 여부 (half_open에서는 탐색 요청 하나만 허용)"""
+        if self.state == "open":
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            self.state = "half_open"
+            self._probe_in_flight = False
+        if self.state == "half_open":
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+        return True
+
+    def release_probe(self):
+        """결과 판정 없이 끝난 요청(취소, 4xx)의 탐색 슬롯 반납"""
+        self._probe_in_flight = False
+
+    def record_success(self):
+        self.state = "closed"
+        self.failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        self._probe_in_flight = False
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                self.open_count += 1
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+
+class _ProviderGuard:
+    """provider/모델 하나에 대한 버킷 + 브레이커 + 지표"""
+
+    def __init__(self, rpm: float, tpm: float, failure_threshold: int, reset_timeout: float):
+        self.rpm_bucket = TokenBucket(rpm) if rpm > 0 else None
+        self.tpm_bucket = TokenBucket(tpm) if tpm > 0 else None
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.metrics = {
+            "calls": 0,
+            "successes": 0,
+            "failures": 0,
+            "retries": 0,
+            "rejected_by_breaker": 0,
+            "throttle_wait_seconds": 0.0,
+        }
+
+
+class ResilienceManager:
+    """
+    provider별 복원력 정책 관리 (싱글톤)
+
+    환경 변수
+      LLM_RATE_LIMITS: '{"gemini": {"rpm": 60, "tpm": 200000}, "gemini:gemini-2.5-flash-lite": {"rpm": 300}}'
+                       ("provider:model" 항목이 "provider" 항목보다 우선, 0이면 제한 없음)
+      LLM_MAX_RETRIES, LLM_BACKOFF_BASE, LLM_BACKOFF_MAX: 재시도 정책
+      LLM_BREAKER_FAILURES, LLM_BREAKER_RESET_SECONDS: 서킷 브레이커 정책
+    """
+
+    _instance: Optional['ResilienceManager'] = None
+    _lock = Lock()
+
+    def __init__(self):
+        try:
+            self.limits: Dict[str, dict] = json.loads(os.getenv("LLM_RATE_LIMITS", "{}") or "{}")
+        except json.JSONDecodeError as e:
+            print(f"LLM_RATE_LIMITS 파싱 오류: {e}")
+            self.limits = {}
+        self.max_retries = int(os.getenv("LLM_MAX_RETRIES", "3"))
+        self.backoff_base = float(os.getenv("LLM_BACKOFF_BASE", "0.5"))
+        self.backoff_max = float(os.getenv("LLM_BACKOFF_MAX", "30"))
+        self.failure_threshold = int(os.getenv("LLM_BREAKER_FAILURES", "5"))
+        self.reset_timeout = float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30"))
+        self._guards: Dict[str, _ProviderGuard] = {}
+
+    def _guard(self, provider: str, model: str) -> _ProviderGuard:
+        key = f"{provider}:{model}"
+        guard = self._guards.get(key)
+        if guard is None:
+            limit = {**self.limits.get(provider, {}), **self.limits.get(key, {})}
+            guard = _ProviderGuard(
+                rpm=float(limit.get("rpm", 0)),
+                tpm=float(limit.get("tpm", 0)),
+                failure_threshold=self.failure_threshold,
+                reset_timeout=self.reset_timeout,
+            )
+            self._guards[key] = guard
+        return guard
+
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        if retry_after is not None:
+            return min(self.backoff_max, retry_after) + random.uniform(0, self.backoff_base)
+        # full jitter
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    async def call(
+        self,
+        provider: str,
+        model: str,
+        factory: Callable[[], Awaitable[T]],
+        tokens: int = 0,
+    ) -> T:
+        """
+        제한/재시도/브레이커를 적용해 LLM 호출 수행
+
+        Args:
+            provider: provider 이름 (openai, gemini, groq)
+            model: 모델 ID
+            factory: 호출 코루틴을 새로 만드는 함수 (재시도마다 호출)
+            tokens: TPM 버킷에서 차감할 예상 토큰 수
+
+        Returns:
+            factory 결과
+
+        Raises:
+            HTTPException: 브레이커가 열려 있을 때 503, 그 외에는 마지막 오류를 그대로 전달
+        """
+        guard = self._guard(provider, model)
+        guard.metrics["calls"] += 1
+        LLM_TOKENS_TOTAL.labels(provider=provider, model=model).inc(tokens)
+
+        started = time.perf_counter()
+        with span("llm_call", provider=provider, model=model, tokens=tokens) as attrs:
+            try:
+                result = await self._call_guarded(guard, provider, model, factory, tokens, attrs)
+                attrs["outcome"] = "ok"
+                return result
+            except asyncio.CancelledError:
+                attrs["outcome"] = "cancelled"
+                raise
+            except Exception as e:
+                attrs["outcome"] = attrs.get("outcome_detail") or f"error_{_status_of(e) or 'unknown'}"
+                raise
+            finally:
+                outcome = attrs["outcome"]
+                LLM_CALLS_TOTAL.labels(provider=provider, model=model, outcome=outcome).inc()
+                LLM_CALL_SECONDS.labels(provider=provider, model=model, outcome=outcome).observe(
+                    time.perf_counter() - started
+                )
+                LLM_BREAKER_OPEN.labels(provider=provider, model=model).set(
+                    _BREAKER_GAUGE[guard.breaker.state]
+                )
+
+    async def _call_guarded(
+        self,
+        guard: _ProviderGuard,
+        provider: str,
+        model: str,
+        factory: Callable[[], Awaitable[T]],
+        tokens: int,
+        attrs: dict,
+    ) -> T:
+        """브레이커 확인 → 토큰 버킷 대기 → 호출 → 실패 시 백오프 재시도"""
+        attempt = 0
+        while True:
+            if not guard.breaker.allow():
+                guard.metrics["rejected_by_breaker"] += 1
+                attrs["outcome_detail"] = "circuit_open"
+                raise HTTPException(503, f"{provider}:{model} circuit open - skipping provider")
+
+            waited = 0.0
+            if guard.rpm_bucket:
+                waited += await guard.rpm_bucket.acquire(1)
+            if guard.tpm_bucket and tokens:
+                waited += await guard.tpm_bucket.acquire(tokens)
+            if waited:
+                guard.metrics["throttle_wait_seconds"] += waited
+                LLM_THROTTLE_WAIT_SECONDS.labels(provider=provider, model=model).inc(waited)
+                attrs["throttle_wait"] = attrs.get("throttle_wait", 0.0) + waited
+
+            try:
+                attrs["attempts"] = attempt + 1
+                result = await factory()
+            except asyncio.CancelledError:
+                # 취소는 provider 실패가 아니므로 탐색 슬롯만 반납
+                guard.breaker.release_probe()
+                raise
+            except Exception as e:
+                if not _is_transient(e):
+                    # 요청 자체의 문제 (4xx, 응답 파싱/코드 오류) - provider 장애로 보지 않음
+                    guard.breaker.release_probe()
+                    guard.metrics["failures"] += 1
+                    raise
+                guard.breaker.record_failure()
+                if attempt >= self.max_retries or guard.breaker.state == "open":
+                    guard.metrics["failures"] += 1
+                    raise
+                delay = self._backoff(attempt, _retry_after_of(e))
+                attempt += 1
+                guard.metrics["retries"] += 1
+                LLM_RETRIES_TOTAL.labels(provider=provider, model=model).inc()
+                await asyncio.sleep(delay)
+                continue
+
+            guard.breaker.record_success()
+            guard.metrics["successes"] += 1
+            return result
+
+    def get_metrics(self) -> Dict[str, dict]:
+        """provider/모델별 브레이커 상태와 호출/대기 지표"""
+        return {
+            key: {
+                **guard.metrics,
+                "throttle_wait_seconds": round(guard.metrics["throttle_wait_seconds"], 3),
+                "breaker_state": guard.breaker.state,
+                "breaker_open_count": guard.breaker.open_count,
+                "consecutive_failures": guard.breaker.failures,
+            }
+            for key, guard in self._guards.items()
+        }
+
+    @classmethod
+    def get_instance(cls) -> 'ResilienceManager':
+        """싱글톤 인스턴스 반환"""
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+
+async def resilient_call(
+    provider: str,
+    model: str,
+    factory: Callable[[], Awaitable[T]],
+    tokens: int = 0,
+) -> T:
+    """ResilienceManager 싱글톤을 통한 LLM 호출 단축 함수"""
+    return await ResilienceManager.get_instance().call(provider, model, factory, tokens)
@@ -0,0 +1,160 @@
+"""
+/ask 판정 전 검증 가치(check-worthiness) 분류
+
+인사말, 구독/좋아요 요청 같은 문장까지 세 provider에 판정을 맡기지 않도록
+분류, 수치, 고유명사, 길이로 노드별 점수를 매기고 점수가 높은 노드만 판정 대상으로 고름
+같은 그래프 안에서 텍스트가 같은 노드(공백 차이만 무시)는 한 번만 판정
+"""
+
+import os
+import re
+import unicodedata
+from dataclasses import dataclass
+from threading import Lock
+from typing import Dict, List, Optional, Sequence
+
+from app.llm.verdict_cache import normalize_claim
+from app.metrics import ASK_TRIAGE_TOTAL
+
+# 수치/통계 표현 (연도, 퍼센트, 금액, 인원 등)
+_NUMBER_RE = re.compile(r"\d|퍼센트|프로|절반|배\b|[십백천만억조]\s?(?:원|명|개|달러|건|톤)")
+# 고유명사 단서: 라틴 대문자 단어/약어, 기관/지명 접미사, 따옴표로 묶인 이름
+_ENTITY_RE = re.compile(
+    r"\b[A-Z][A-Za-z]+|[가-힣]{2,}(?:정부|대학교|대학|연구소|연구원|협회|기구|위원회|재단|병원|공사|은행|부|청)\b"
+    r"|[\"“'‘「『][^\"”'’」』]{2,}[\"”'’」』]"
+)
+# 검증할 내용이 없는 채널 운영/인사 문장
+_FILLER_RE = re.compile(
+    r"구독|좋아요|알림\s*설정|댓글|안녕하세요|감사합니다|고맙습니다|시청해|다음\s*(?:영상|시간)|여러분|"
+    r"subscribe|like and|see you",
+    re.IGNORECASE,
+)
+
+# 분류별 기본 점수 (사실 진술이 판정 가치가 가장 높음)
+_CLASS_WEIGHT = {"FACT": 0.35, "CLAIM": 0.25}
+
+
+@dataclass
+class TriageDecision:
+    """노드별 triage 결과"""
+    node_id: str
+    score: float
+    # judge: 판정, duplicate: 앞선 노드(duplicate_of) 결과 재사용, skip: 판정하지 않음
+    action: str
+    duplicate_of: Optional[str] = None
+
+
+def dedup_key(text: str) -> str:
+    """
+    중복 판정 제거용 키
+
+    normalize_claim은 조사/문장부호/추임새를 지워 "3.6%"와 "36%", 주어/목적어가 바뀐 문장까지
+    같은 문자열로 만들기 때문에 여기서는 유니코드 정규화와 공백 정리만 함
+    """
+    return " ".join(unicodedata.normalize("NFKC", text or "").split())
+
+
+def check_worthiness(text: str, classification: str) -> float:
+    """
+    문장의 검증 가치 점수
+
+    Args:
+        text: 노드 텍스트
+        classification: FACT / CLAIM 등 노드 분류
+
+    Returns:
+        float: 0~1 점수 (높을수록 판정 가치가 큼)
+    """
+    text = (text or "").strip()
+    if not text:
+        return 0.0
+    score = _CLASS_WEIGHT.get((classification or "").strip().upper(), 0.1)
+    if _NUMBER_RE.search(text):
+        score += 0.25
+    if _ENTITY_RE.search(text):
+        score += 0.2
+    score += 0.2 * min(1.0, len(normalize_claim(text)) / 40)
+    if _FILLER_RE.search(text):
+        score -= 0.5
+    if text.endswith("?"):
+        score -= 0.1
+    return round(max(0.0, min(1.0, score)), 3)
+
+
+class CheckWorthinessTriage:
+    """
+    /ask 판정 대상 선택기
+
+    환경 변수
+      ASK_TRIAGE: 1이면 점수가 낮은 노드는 판정하지 않고 skipped로 반환 (기본 비활성, 중복 제거는 항상 적용)
+      ASK_TRIAGE_MIN_SCORE: 판정할 최소 점수 (기본 0.4)
+      ASK_TRIAGE_MAX_NODES: 요청당 최대 판정 노드 수, 점수 높은 순 (기본 0 = 제한 없음)
+    """
+
+    _instance: Optional['CheckWorthinessTriage'] = None
+    _lock = Lock()
+
+    def __init__(self):
+        self.enabled = os.getenv("ASK_TRIAGE", "0") == "1"
+        self.min_score = float(os.getenv("ASK_TRIAGE_MIN_SCORE", "0.4"))
+        self.max_nodes = int(os.getenv("ASK_TRIAGE_MAX_NODES", "0"))
+        self.stats = {"judge": 0, "duplicate": 0, "skip": 0}
+
+    def select(self, nodes: Sequence) -> List[TriageDecision]:
+        """
+        노드별 판정 여부 결정
+
+        Args:
+            nodes: id, text, classification을 가진 노드 목록
+
+        Returns:
+            List[TriageDecision]: 입력과 같은 순서의 결정
+        """
+        decisions: List[TriageDecision] = []
+        first_by_text: Dict[str, str] = {}
+        for node in nodes:
+            score = check_worthiness(node.text, node.classification)
+            canonical = dedup_key(node.text)
+            original = first_by_text.get(canonical)
+            if original is not None:
+                decisions.append(TriageDecision(node.id, score, "duplicate", duplicate_of=original))
+                continue
+            first_by_text[canonical] = node.id
+            decisions.append(TriageDecision(node.id, score, "judge"))
+
+        if self.enabled:
+            candidates = [d for d in decisions if d.action == "judge"]
+            for decision in candidates:
+                if decision.score < self.min_score:
+                    decision.action = "skip"
+            if self.max_nodes > 0:
+                kept = sorted((d for d in candidates if d.action == "judge"), key=lambda d: -d.score)
+                for decision in kept[self.max_nodes:]:
+                    decision.action = "skip"
+            # 건너뛴 노드의 중복도 건너뜀
+            skipped = {d.node_id for d in decisions if d.action == "skip"}
+            for decision in decisions:
+                if decision.action == "duplicate" and decision.duplicate_of in skipped:
+                    decision.action = "skip"
+
+        for decision in decisions:
+            self.stats[decision.action] += 1
+            ASK_TRIAGE_TOTAL.labels(decision=decision.action).inc()
+        return decisions
+
+    def get_info(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "min_score": self.min_score,
+            "max_nodes": self.max_nodes,
+            **self.stats,
+        }
+
+    @classmethod
+    def get_instance(cls) -> 'CheckWorthinessTriage':
+        """싱글톤 인스턴스 반환"""
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
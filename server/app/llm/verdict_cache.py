@@ -0,0 +1,359 @@
+"""
+Claim 단위 판정(verdict) 캐시
+ASR 표기 차이(띄어쓰기, 조사, 추임새)를 흡수하도록 claim을 정규화하고
+문자 n-gram 역색인으로 거의 같은 claim의 이전 판정을 찾아 재사용
+"""
+
+import json
+import os
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Optional, Set, Tuple
+
+# 문장 의미에 영향이 적은 추임새/군말 (ASR 결과에 자주 섞여 들어옴)
+FILLER_WORDS = {
+    "음", "어", "아", "그", "저", "뭐", "막", "이제", "그냥", "약간", "진짜",
+    "정말", "좀", "네", "예", "자", "저기", "그러니까", "근데", "아니",
+}
+
+# 어절 끝에서 떼어낼 조사/어미 (긴 것부터 매칭)
+TRAILING_PARTICLES = sorted([
+    "에서는", "으로는", "에게서", "이라고", "라고", "에서", "에게", "으로", "까지",
+    "부터", "처럼", "보다", "이나", "이랑", "하고", "은", "는", "이", "가", "을",
+    "를", "의", "에", "로", "와", "과", "도", "만", "요", "나", "랑",
+], key=len, reverse=True)
+
+_PUNCT_RE = re.compile(r"[^\w\s%]", re.UNICODE)
+_SPACE_RE = re.compile(r"\s+")
+
+# 유사도가 높아도 값이 다르면 다른 claim으로 봐야 하는 표현 (수치, 부정)
+_NUMBER_RE = re.compile(r"\d+(?:[.,]\d+)*")
+_NEGATION_RE = re.compile(r"(?<![가-힣])(?:안|못)(?![가-힣])|않|아니|없")
+
+
+def _strip_particle(token: str) -> str:
+    """어절 끝의 조사를 제거 (어간이 한 글자 이하로 남으면 유지)"""
+    for particle in TRAILING_PARTICLES:
+        if token.endswith(particle) and len(token) - len(particle) >= 2:
+            return token[: -len(particle)]
+    return token
+
+
+def normalize_claim(text: str) -> str:
+    """
+    claim 텍스트를 비교용 정규형으로 변환
+
+    유니코드 정규화 → 소문자화 → 문장부호 제거 → 추임새 제거 → 조사 제거 → 공백 제거
+
+    Args:
+        text: 원본 claim 텍스트
+
+    Returns:
+        str: 띄어쓰기/조사에 무관한 정규화 문자열
+    """
+    txt = unicodedata.normalize("NFKC", text or "").lower()
+    txt = _PUNCT_RE.sub(" ", txt)
+    # 띄어 쓰여 분리된 조사 단독 어절도 추임새와 함께 제거
+    tokens = [
+        t for t in _SPACE_RE.split(txt)
+        if t and t not in FILLER_WORDS and t not in TRAILING_PARTICLES
+    ]
+    return "".join(_strip_particle(t) for t in tokens)
+
+
+def claim_signature(text: str) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """
+    유사 claim 재사용 전에 정확히 일치해야 하는 부분
+
+    "3.6%"와 "5.6%", "2023년"과 "2013년", "있다"와 "없다"처럼 n-gram은 거의 같지만
+    판정이 달라지는 claim을 구분하기 위해 원문에서 수치와 부정 표현을 순서대로 추출
+
+    Args:
+        text: 원본 claim 텍스트
+
+    Returns:
+        Tuple: (수치 목록, 부정 표현 목록)
+    """
+    txt = unicodedata.normalize("NFKC", text or "")
+    numbers = tuple(n.replace(",", "") for n in _NUMBER_RE.findall(txt))
+    return numbers, tuple(_NEGATION_RE.findall(txt))
+
+
+def char_ngrams(canonical: str, n: int = 3) -> Set[str]:
+    """정규화 문자열의 문자 n-gram 집합 (짧은 문자열은 통째로 사용)"""
+    if len(canonical) <= n:
+        return {canonical} if canonical else set()
+    return {canonical[i:i + n] for i in range(len(canonical) - n + 1)}
+
+
+@dataclass
+class CachedVerdict:
+    """캐시된 판정 결과"""
+    claim: str
+    canonical: str
+    verdict: str
+    score: float
+    explanation: str
+    created_at: float
+
+
+@dataclass
+class VerdictMatch:
+    """캐시 조회 결과"""
+    entry: CachedVerdict
+    similarity: float
+
+
+class VerdictCache:
+    """
+    정규화 + 문자 n-gram Jaccard 유사도 기반 claim 판정 캐시
+
+    - 정규형이 완전히 같으면 dict 조회 한 번으로 반환
+    - 아니면 n-gram 역색인으로 후보만 골라 유사도 계산
+    - 유사도 임계값(VERDICT_CACHE_SIMILARITY)과 유효 기간(VERDICT_CACHE_TTL_SECONDS)으로 제어
+    - 수치/부정 표현이 다른 claim은 유사도와 관계없이 적중으로 보지 않음
+    - JSONL 기록은 살아 있는 항목의 2배를 넘으면 현재 항목만 남기도록 다시 씀
+    """
+
+    _instance: Optional['VerdictCache'] = None
+    _lock = Lock()
+
+    def __init__(
+        self,
+        similarity_threshold: Optional[float] = None,
+        ttl_seconds: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        persist_path: Optional[str] = None,
+        ngram_size: int = 3,
+    ):
+        """
+        판정 캐시 초기화
+
+        Args:
+            similarity_threshold: 캐시 적중으로 볼 최소 Jaccard 유사도 (0~1)
+            ttl_seconds: 캐시 유효 기간 (초)
+            max_entries: 최대 보관 항목 수 (초과 시 오래된 항목부터 제거)
+            persist_path: 판정 기록 JSONL 경로 (빈 문자열이면 메모리에만 보관)
+            ngram_size: 문자 n-gram 크기
+        """
+        self.enabled = os.getenv("VERDICT_CACHE_ENABLED", "1") != "0"
+        self.similarity_threshold = similarity_threshold if similarity_threshold is not None \
+            else float(os.getenv("VERDICT_CACHE_SIMILARITY", "0.85"))
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None \
+            else float(os.getenv("VERDICT_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+        self.max_entries = max_entries if max_entries is not None \
+            else int(os.getenv("VERDICT_CACHE_MAX_ENTRIES", "50000"))
+        if persist_path is None:
+            persist_path = os.getenv("VERDICT_CACHE_PATH", "cache/verdict/verdicts.jsonl")
+        self.persist_path = Path(persist_path) if persist_path else None
+        self.ngram_size = ngram_size
+
+        self._entries: "OrderedDict[str, CachedVerdict]" = OrderedDict()  # canonical -> entry
+        self._grams: Dict[str, Set[str]] = {}  # canonical -> n-gram 집합
+        self._index: Dict[str, Set[str]] = {}  # n-gram -> canonical 집합
+        self._entry_lock = Lock()
+        self._file_lock = Lock()
+        self._persisted_lines = 0
+        self.hits = 0
+        self.misses = 0
+
+        self._load()
+
+    # ---------------- 내부 색인 관리 ---------------- #
+    def _add_entry(self, entry: CachedVerdict):
+        canonical = entry.canonical
+        if canonical in self._entries:
+            self._remove_entry(canonical)
+        grams = char_ngrams(canonical, self.ngram_size)
+        self._entries[canonical] = entry
+        self._grams[canonical] = grams
+        for g in grams:
+            self._index.setdefault(g, set()).add(canonical)
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._remove_entry(oldest)
+
+    def _remove_entry(self, canonical: str):
+        self._entries.pop(canonical, None)
+        for g in self._grams.pop(canonical, set()):
+            bucket = self._index.get(g)
+            if bucket is not None:
+                bucket.discard(canonical)
+                if not bucket:
+                    del self._index[g]
+
+    def _is_fresh(self, entry: CachedVerdict, now: float) -> bool:
+        return now - entry.created_at <= self.ttl_seconds
+
+    def _load(self):
+        """JSONL 기록에서 유효 기간 내 항목만 복원"""
+        if not self.enabled or not self.persist_path or not self.persist_path.exists():
+            return
+        now = time.time()
+        try:
+            with open(self.persist_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    self._persisted_lines += 1
+                    entry = CachedVerdict(**json.loads(line))
+                    if self._is_fresh(entry, now):
+                        self._add_entry(entry)
+        except Exception as e:
+            print(f"판정 캐시 로드 오류: {e}")
+        self._maybe_compact()
+
+    def _append(self, entry: CachedVerdict):
+        if not self.persist_path:
+            return
+        try:
+            self.persist_path.parent.mkdir(parents=True, exist_ok=True)
+            with self._file_lock:
+                with open(self.persist_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(asdict(entry), ensure_ascii=False) + "\n")
+                self._persisted_lines += 1
+        except Exception as e:
+            print(f"판정 캐시 저장 오류: {e}")
+        self._maybe_compact()
+
+    def _maybe_compact(self):
+        """제거/만료/덮어쓴 항목이 쌓여 기록이 살아 있는 항목의 2배를 넘으면 다시 씀"""
+        if not self.persist_path or self._persisted_lines <= 2 * max(len(self._entries), 100):
+            return
+        tmp_path = self.persist_path.with_suffix(self.persist_path.suffix + ".tmp")
+        with self._file_lock:
+            with self._entry_lock:
+                entries = list(self._entries.values())
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    for entry in entries:
+                        f.write(json.dumps(asdict(entry), ensure_ascii=False) + "\n")
+                os.replace(tmp_path, self.persist_path)
+                print(f"판정 캐시 기록 정리: {self._persisted_lines} -> {len(entries)} 줄")
+                self._persisted_lines = len(entries)
+            except Exception as e:
+                print(f"판정 캐시 정리 오류: {e}")
+
+    # ---------------- 공개 API ---------------- #
+    def lookup(self, claim: str) -> Optional[VerdictMatch]:
+        """
+        유사 claim의 캐시된 판정 조회
+
+        Args:
+            claim: 판정할 claim 텍스트
+
+        Returns:
+            Optional[VerdictMatch]: 임계값 이상으로 일치하는 최신 판정 (없으면 None)
+        """
+        if not self.enabled:
+            return None
+        canonical = normalize_claim(claim)
+        if not canonical:
+            return None
+        now = time.time()
+        signature = claim_signature(claim)
+
+        with self._entry_lock:
+            exact = self._entries.get(canonical)
+            if exact is not None:
+                # 정규화에서 문장부호/군말이 빠지므로 정규형이 같아도 수치/부정 표현 확인
+                if self._is_fresh(exact, now) and claim_signature(exact.claim) == signature:
+                    self._entries.move_to_end(canonical)
+                    self.hits += 1
+                    return VerdictMatch(entry=exact, similarity=1.0)
+                if not self._is_fresh(exact, now):
+                    self._remove_entry(canonical)
+
+            grams = char_ngrams(canonical, self.ngram_size)
+            overlap: Dict[str, int] = {}
+            for g in grams:
+                for cand in self._index.get(g, ()):
+                    overlap[cand] = overlap.get(cand, 0) + 1
+
+            best: Optional[VerdictMatch] = None
+            stale = []
+            for cand, inter in overlap.items():
+                union = len(grams) + len(self._grams[cand]) - inter
+                similarity = inter / union if union else 0.0
+                if similarity < self.similarity_threshold:
+                    continue
+                entry = self._entries[cand]
+                if not self._is_fresh(entry, now):
+                    stale.append(cand)
+                    continue
+                if claim_signature(entry.claim) != signature:
+                    continue
+                if best is None or similarity > best.similarity:
+                    best = VerdictMatch(entry=entry, similarity=similarity)
+            for cand in stale:
+                self._remove_entry(cand)
+
+            if best is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(best.entry.canonical)
+            self.hits += 1
+            return best
+
+    def store(self, claim: str, verdict: str, score: float, explanation: str):
+        """
+        판정 결과 저장
+
+        Args:
+            claim: 원본 claim 텍스트
+            verdict: 최종 판정 (TRUE/FALSE/UNCERTAIN)
+            score: 평균 신뢰도
+            explanation: 판정 근거
+        """
+        if not self.enabled:
+            return
+        canonical = normalize_claim(claim)
+        if not canonical:
+            return
+        entry = CachedVerdict(
+            claim=claim,
+            canonical=canonical,
+            verdict=verdict,
+            score=score,
+            explanation=explanation,
+            created_at=time.time(),
+        )
+        with self._entry_lock:
+            self._add_entry(entry)
+        self._append(entry)
+
+    def clear(self):
+        """모든 캐시 항목 삭제"""
+        with self._entry_lock:
+            self._entries.clear()
+            self._grams.clear()
+            self._index.clear()
+        if self.persist_path and self.persist_path.exists():
+            self.persist_path.unlink()
+        self._persisted_lines = 0
+
+    def get_cache_info(self) -> dict:
+        """캐시 상태 정보 반환"""
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "similarity_threshold": self.similarity_threshold,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    @classmethod
+    def get_instance(cls) -> 'VerdictCache':
+        """싱글톤 인스턴스 반환"""
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
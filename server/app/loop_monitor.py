@@ -0,0 +1,164 @@
+"""
+이벤트 루프 상태 모니터 (LOOP_MONITOR_ENABLED=1 일 때만 동작)
+- 루프 안의 샘플러 태스크가 주기적으로 깨어나며 스케줄링 지연(lag)을 측정
+- 별도 watchdog 스레드가 샘플러의 heartbeat가 임계값 이상 멈추면
+  루프 스레드의 스택을 캡처해 어떤 라우트/단계가 루프를 막았는지 기록
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+from fastapi import APIRouter
+
+from app import timing
+from app.metrics import EVENT_LOOP_BLOCKED_SECONDS, EVENT_LOOP_BLOCKED_TOTAL, EVENT_LOOP_LAG_SECONDS
+
+router = APIRouter()
+
+
+class LoopHealthMonitor:
+    """
+    이벤트 루프 지연/블로킹 감지기
+
+    환경 변수
+      LOOP_MONITOR_ENABLED: 1이면 서버 시작 시 활성화
+      LOOP_MONITOR_INTERVAL_MS: 지연 샘플링 주기 (기본 100ms)
+      LOOP_BLOCK_THRESHOLD_MS: 블로킹으로 볼 최소 정지 시간 (기본 250ms)
+    """
+
+    _instance: Optional['LoopHealthMonitor'] = None
+    _lock = threading.Lock()
+
+    def __init__(self):
+        self.enabled = os.getenv("LOOP_MONITOR_ENABLED", "0") == "1"
+        self.interval = float(os.getenv("LOOP_MONITOR_INTERVAL_MS", "100")) / 1000
+        self.threshold = float(os.getenv("LOOP_BLOCK_THRESHOLD_MS", "250")) / 1000
+        self.lag_samples: Deque[float] = deque(maxlen=600)
+        self.stalls: Deque[dict] = deque(maxlen=100)
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._endpoint_codes: Dict[object, str] = {}
+        self._current_stall: Optional[dict] = None
+        self._stall_lock = threading.Lock()
+        self._sampler: Optional[asyncio.Task] = None
+        self._stop = threading.Event()
+
+    # ---------------- 루프 안 샘플러 ---------------- #
+    async def _sample(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            self._heartbeat = time.monotonic()
+            self.lag_samples.append(lag)
+            EVENT_LOOP_LAG_SECONDS.observe(lag)
+            self._finish_stall(lag)
+
+    def _finish_stall(self, lag: float):
+        """루프가 다시 돌기 시작하면 진행 중이던 정지 기록을 마감"""
+        with self._stall_lock:
+            stall = self._current_stall
+            if stall is None:
+                return
+            self._current_stall = None
+        # 샘플러의 sleep 초과분이 곧 루프가 멈춰 있던 시간
+        stall["duration"] = round(lag, 3)
+        EVENT_LOOP_BLOCKED_SECONDS.labels(route=stall["route"], stage=stall["stage"]).observe(stall["duration"])
+
+    # ---------------- watchdog 스레드 ---------------- #
+    def _attribute(self, frame) -> str:
+        """스택에서 FastAPI 엔드포인트 함수 프레임을 찾아 라우트 경로 반환"""
+        while frame is not None:
+            path = self._endpoint_codes.get(frame.f_code)
+            if path:
+                return path
+            frame = frame.f_back
+        return "unknown"
+
+    def _watch(self):
+        while not self._stop.wait(self.interval / 2):
+            stalled_for = time.monotonic() - self._heartbeat
+            if stalled_for < self.threshold or self._current_stall is not None:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            route = self._attribute(frame)
+            stage = timing.current_stage_hint(self._loop) or "unknown"
+            stall = {
+                "detected_at": time.time(),
+                "route": route,
+                "stage": stage,
+                "duration": None,
+                "stack": traceback.format_stack(frame)[-30:],
+            }
+            with self._stall_lock:
+                self._current_stall = stall
+            self.stalls.append(stall)
+            EVENT_LOOP_BLOCKED_TOTAL.labels(route=route, stage=stage).inc()
+            print(f"[loop-monitor] event loop blocked > {self.threshold * 1000:.0f}ms "
+                  f"(route={route}, stage={stage})")
+
+    # ---------------- 시작/종료 ---------------- #
+    def start(self, app):
+        """실행 중인 이벤트 루프에서 샘플러와 watchdog 시작"""
+        if not self.enabled or self._sampler is not None:
+            return
+        for route in app.routes:
+            endpoint = getattr(route, "endpoint", None)
+            code = getattr(endpoint, "__code__", None)
+            if code is not None:
+                self._endpoint_codes[code] = getattr(route, "path", str(route))
+        self._loop_thread_id = threading.get_ident()
+        self._loop = asyncio.get_running_loop()
+        self._heartbeat = time.monotonic()
+        self._sampler = self._loop.create_task(self._sample())
+        threading.Thread(target=self._watch, name="loop-watchdog", daemon=True).start()
+        print(f"Loop health monitor started (threshold {self.threshold * 1000:.0f}ms)")
+
+    def stop(self):
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.cancel()
+            self._sampler = None
+
+    def snapshot(self, limit: int = 20) -> dict:
+        """최근 지연 통계와 블로킹 기록"""
+        samples: List[float] = sorted(self.lag_samples)
+        p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))] if samples else 0.0
+        return {
+            "enabled": self.enabled,
+            "interval_ms": self.interval * 1000,
+            "threshold_ms": self.threshold * 1000,
+            "lag": {
+                "last": self.lag_samples[-1] if self.lag_samples else 0.0,
+                "p95": p95,
+                "max": samples[-1] if samples else 0.0,
+            },
+            "stalls": list(self.stalls)[-limit:][::-1],
+        }
+
+    @classmethod
+    def get_instance(cls) -> 'LoopHealthMonitor':
+        """싱글톤 인스턴스 반환"""
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+
+@router.get("/debug/loop")
+async def get_loop_health(limit: int = 20):
+    """
+    이벤트 루프 지연 통계와 최근 블로킹 스택 조회
+    """
+    return LoopHealthMonitor.get_instance().snapshot(limit)
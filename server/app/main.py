@@ -1,4 +1,8 @@
-from fastapi import FastAPI
+import asyncio
+import logging
+import os
+import time
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from app.youtube import router as youtube_router
 from app.whisperx.router import router as whisperx_router
@@ -6,6 +10,20 @@ from app.whisperx import WhisperXService
 from app.llm.ask import router as llm_router
 from app.analysis import router as analysis_router
 from app.socket_manager import socket_app
+from app.metrics import router as metrics_router, HTTP_REQUEST_SECONDS
+from app.timing import current_trace_id, record_stages, trace_context
+from app.profiler import RequestProfiler
+from app.loop_monitor import LoopHealthMonitor, router as loop_monitor_router
+
+# TRACE_LOG_LEVEL=DEBUG 이면 단계/LLM 호출 span을 JSON 로그로 출력
+_trace_logger = logging.getLogger("app.trace")
+_trace_logger.setLevel(os.getenv("TRACE_LOG_LEVEL", "WARNING").upper())
+if _trace_logger.isEnabledFor(logging.INFO) and not _trace_logger.handlers:
+    # 루트 로거에 핸들러가 없어도 출력되도록 한 줄에 JSON 하나씩 stderr로 출력
+    _trace_handler = logging.StreamHandler()
+    _trace_handler.setFormatter(logging.Formatter("%(message)s"))
+    _trace_logger.addHandler(_trace_handler)
+    _trace_logger.propagate = False
 
 app = FastAPI(
     title="STT & OpenAI API",
@@ -32,6 +50,53 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def profile_requests(request: Request, call_next):
+    """PROFILING_ENABLED=1 일 때 선택된 /api/analysis, /ask 요청을 샘플링 프로파일"""
+    profiler = RequestProfiler.get_instance()
+    if not profiler.should_profile(request.url.path, request.headers, request.query_params):
+        return await call_next(request)
+    session = profiler.begin(current_trace_id())
+    if session is None:
+        return await call_next(request)
+
+    status = 500
+    with record_stages() as recorder:
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            response.headers["X-Profile-Id"] = session.profile_id
+            return response
+        finally:
+            meta = {
+                "method": request.method,
+                "path": request.url.path,
+                "query": str(request.query_params),
+                "status": status,
+                "stages": recorder.totals(),
+            }
+            await asyncio.to_thread(profiler.end, session, meta)
+
+# trace_requests가 바깥쪽 미들웨어가 되도록 나중에 등록 (프로파일 메타데이터에 trace id 기록)
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    """요청마다 trace id를 부여하고 라우트별 처리 시간 기록"""
+    with trace_context(request.headers.get("X-Trace-Id")) as trace_id:
+        started = time.perf_counter()
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            response.headers["X-Trace-Id"] = trace_id
+            return response
+        finally:
+            route = request.scope.get("route")
+            HTTP_REQUEST_SECONDS.labels(
+                method=request.method,
+                route=getattr(route, "path", "unmatched"),
+                status=str(status),
+            ).observe(time.perf_counter() - started)
+
 # WhisperX 싱글톤 인스턴스 초기화
 WhisperXService.get_instance()
 
@@ -39,6 +104,19 @@ app.include_router(youtube_router, prefix="/api/youtube", tags=["YouTube"])
 app.include_router(whisperx_router, prefix="/api/stt", tags=["STT"])
 app.include_router(llm_router)
 app.include_router(analysis_router, prefix="/api", tags=["Analysis"])
+app.include_router(metrics_router, tags=["Metrics"])
+app.include_router(loop_monitor_router, tags=["Debug"])
+
+@app.on_event("startup")
+async def start_loop_monitor():
+    """LOOP_MONITOR_ENABLED=1 이면 이벤트 루프 블로킹 감지 시작"""
+    LoopHealthMonitor.get_instance().start(app)
+
+
+@app.on_event("shutdown")
+async def stop_loop_monitor():
+    LoopHealthMonitor.get_instance().stop()
+
 
 # Socket.IO 마운트
 app.mount("/socket.io", socket_app)
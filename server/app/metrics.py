@@ -0,0 +1,101 @@
+"""
+Prometheus 지표 정의 및 /metrics 엔드포인트
+"""
+
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+router = APIRouter()
+
+# 수 ms(캐시 적중)부터 수 분(긴 영상 전사)까지 다루는 버킷
+_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "HTTP 요청 처리 시간",
+    ["method", "route", "status"], buckets=_LATENCY_BUCKETS,
+)
+PIPELINE_STAGE_SECONDS = Histogram(
+    "pipeline_stage_duration_seconds", "파이프라인 단계별 소요 시간",
+    ["stage"], buckets=_LATENCY_BUCKETS,
+)
+WHISPERX_SECONDS = Histogram(
+    "whisperx_duration_seconds", "WhisperX 전사/정렬 소요 시간",
+    ["phase", "model"], buckets=_LATENCY_BUCKETS,
+)
+WHISPERX_BATCH_SIZE = Histogram(
+    "whisperx_batch_size", "요청 간 동적 배치 하나에 담긴 VAD 구간 수",
+    buckets=(1, 2, 4, 8, 12, 16, 24, 32),
+)
+WHISPERX_AUDIO_SKIPPED_RATIO = Histogram(
+    "whisperx_audio_skipped_ratio", "전사 전에 비발화 구간으로 건너뛴 오디오 비율",
+    buckets=(0.01, 0.05, 0.1, 0.2, 0.3, 0.5, 0.7, 0.9),
+)
+LLM_CALL_SECONDS = Histogram(
+    "llm_call_duration_seconds", "LLM provider 호출 소요 시간 (재시도 포함)",
+    ["provider", "model", "outcome"], buckets=_LATENCY_BUCKETS,
+)
+LLM_CALLS_TOTAL = Counter(
+    "llm_calls_total", "LLM provider 호출 수", ["provider", "model", "outcome"],
+)
+LLM_TOKENS_TOTAL = Counter(
+    "llm_estimated_tokens_total", "LLM 호출에 사용된 추정 토큰 수", ["provider", "model"],
+)
+LLM_RETRIES_TOTAL = Counter(
+    "llm_retries_total", "LLM 호출 재시도 수", ["provider", "model"],
+)
+LLM_THROTTLE_WAIT_SECONDS = Counter(
+    "llm_throttle_wait_seconds_total", "rate limit 토큰 버킷 대기 시간 합계", ["provider", "model"],
+)
+LLM_BREAKER_OPEN = Gauge(
+    "llm_circuit_breaker_open", "서킷 브레이커 상태 (0=closed, 0.5=half_open, 1=open)", ["provider", "model"],
+)
+CACHE_REQUESTS_TOTAL = Counter(
+    "cache_requests_total", "캐시 조회 수", ["cache", "result"],
+)
+QUEUE_DEPTH = Gauge(
+    "pipeline_queue_depth", "단계별 대기/진행 중인 작업 수", ["queue"],
+)
+DOWNLOAD_BYTES_TOTAL = Counter(
+    "youtube_download_bytes_total", "YouTube 오디오 다운로드 전송 바이트", ["profile"],
+)
+SEGMENT_CLASSIFICATIONS_TOTAL = Counter(
+    "segment_classifications_total", "세그먼트 CLAIM/FACT 분류 수 (local=로컬 분류기, llm=Gemini)", ["source"],
+)
+JUDGE_BATCH_CLAIMS_TOTAL = Counter(
+    "llm_judge_batch_claims_total", "배치 판정 claim 수 (batched=배치 응답 사용, reasked=단일 요청으로 재판정)",
+    ["provider", "result"],
+)
+ASK_TRIAGE_TOTAL = Counter(
+    "ask_triage_decisions_total", "/ask 노드별 판정 여부 (judge/duplicate/skip)", ["decision"],
+)
+ADMISSION_DECISIONS_TOTAL = Counter(
+    "analysis_admission_decisions_total", "분석 요청 입장 결정 수", ["lane", "decision"],
+)
+ADMISSION_AUDIO_MINUTES = Gauge(
+    "analysis_admission_audio_minutes", "처리 중인 분석 작업의 추정 오디오 분 합계",
+)
+
+EVENT_LOOP_LAG_SECONDS = Histogram(
+    "event_loop_lag_seconds", "이벤트 루프 스케줄링 지연",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+EVENT_LOOP_BLOCKED_TOTAL = Counter(
+    "event_loop_blocked_total", "임계값 이상 이벤트 루프를 막은 횟수", ["route", "stage"],
+)
+EVENT_LOOP_BLOCKED_SECONDS = Histogram(
+    "event_loop_blocked_seconds", "이벤트 루프가 막혀 있던 시간", ["route", "stage"],
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300),
+)
+
+
+def record_cache(cache: str, hit: bool):
+    """캐시 적중/실패 기록 (적중률 = hit / (hit + miss))"""
+    CACHE_REQUESTS_TOTAL.labels(cache=cache, result="hit" if hit else "miss").inc()
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """
+    Prometheus 스크레이프 엔드포인트
+    """
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
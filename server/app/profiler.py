@@ -0,0 +1,201 @@
+"""
+요청 단위 샘플링 프로파일러 (PROFILING_ENABLED=1 일 때만 동작)
+
+/api/analysis, /ask 요청에 대해
+- 헤더 X-Profile: 1 또는 쿼리 ?profile=1 로 요청하거나
+- PROFILE_SAMPLE_RATE 확률로 무작위 선택되면
+작업이 끝날 때까지 모든 스레드(이벤트 루프, executor 스레드 포함)의 스택을 주기적으로 샘플링해
+flamegraph 도구(flamegraph.pl, speedscope 등)가 읽는 folded stack 형식으로 저장
+
+PROFILE_DIR/<profile_id>.wall.folded  벽시계 기준 (대기 포함)
+PROFILE_DIR/<profile_id>.cpu.folded   CPU 사용 중이던 샘플만 (Linux /proc 기반)
+PROFILE_DIR/<profile_id>.json         요청 정보, 샘플 수, 단계별 소요 시간
+
+profile_id는 항상 서버가 만든 uuid이며, 클라이언트가 보낸 trace id는 파일 경로에 쓰지 않고 JSON에만 기록
+"""
+
+import json
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Optional
+
+# 이벤트 루프가 I/O를 기다리는 중임을 나타내는 프레임 (LLM/네트워크 대기)
+_IDLE_FUNCTIONS = {"select", "poll", "epoll", "_run_once", "wait"}
+_EXCLUDED_THREADS = {"loop-watchdog"}
+
+
+def _read_thread_cpu_ticks(native_id: int) -> Optional[int]:
+    """/proc에서 스레드의 누적 user+system CPU tick 읽기 (Linux 외에는 None)"""
+    try:
+        with open(f"/proc/self/task/{native_id}/stat", 'r') as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        return int(fields[11]) + int(fields[12])
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+
+
+class ProfileSession:
+    """요청 하나 동안 실행되는 샘플링 스레드"""
+
+    def __init__(self, profile_id: str, interval: float, trace_id: Optional[str] = None):
+        self.profile_id = profile_id
+        self.trace_id = trace_id
+        self.interval = interval
+        self.wall: Counter = Counter()
+        self.cpu: Counter = Counter()
+        self.samples = 0
+        self._last_ticks: Dict[int, Optional[int]] = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"profiler-{profile_id[:8]}", daemon=True)
+        self.started_at = 0.0
+        self.cpu_started = 0.0
+        self.duration = 0.0
+        self.cpu_time = 0.0
+
+    def _sample_once(self):
+        me = threading.get_ident()
+        threads = {t.ident: t for t in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == me:
+                continue
+            thread = threads.get(ident)
+            name = thread.name if thread else f"thread-{ident}"
+            if name in _EXCLUDED_THREADS or name.startswith("profiler-"):
+                continue
+
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            stack.reverse()
+            if stack and stack[-1].split(" ", 1)[0] in _IDLE_FUNCTIONS:
+                stack.append("(idle)")
+            folded = ";".join([name, *stack])
+            self.wall[folded] += 1
+
+            native_id = getattr(thread, "native_id", None)
+            ticks = _read_thread_cpu_ticks(native_id) if native_id else None
+            previous = self._last_ticks.get(ident)
+            self._last_ticks[ident] = ticks
+            if ticks is not None and previous is not None and ticks > previous:
+                self.cpu[folded] += 1
+        self.samples += 1
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample_once()
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        self.cpu_started = time.process_time()
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.duration = time.perf_counter() - self.started_at
+        self.cpu_time = time.process_time() - self.cpu_started
+
+
+class RequestProfiler:
+    """
+    프로파일링 대상 요청 선택 및 결과 저장
+
+    환경 변수
+      PROFILING_ENABLED: 1이면 활성화 (기본 비활성)
+      PROFILE_SAMPLE_RATE: 헤더/쿼리 없이도 프로파일할 요청 비율 (0~1, 기본 0)
+      PROFILE_INTERVAL_MS: 샘플링 주기 (기본 10ms)
+      PROFILE_MAX_CONCURRENT: 동시에 프로파일할 최대 요청 수 (기본 2)
+      PROFILE_DIR: 결과 저장 디렉토리 (기본 profiles)
+    """
+
+    PROFILED_PATHS = ("/api/analysis", "/ask")
+
+    _instance: Optional['RequestProfiler'] = None
+    _lock = threading.Lock()
+
+    def __init__(self):
+        self.enabled = os.getenv("PROFILING_ENABLED", "0") == "1"
+        self.sample_rate = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+        self.interval = float(os.getenv("PROFILE_INTERVAL_MS", "10")) / 1000
+        self.max_concurrent = int(os.getenv("PROFILE_MAX_CONCURRENT", "2"))
+        self.profile_dir = Path(os.getenv("PROFILE_DIR", "profiles"))
+        self._active = 0
+        self._active_lock = threading.Lock()
+
+    def should_profile(self, path: str, headers, query_params) -> bool:
+        """요청이 프로파일 대상인지 판단"""
+        if not self.enabled or path not in self.PROFILED_PATHS:
+            return False
+        requested = headers.get("X-Profile") == "1" or query_params.get("profile") == "1"
+        return requested or random.random() < self.sample_rate
+
+    def begin(self, trace_id: Optional[str] = None) -> Optional[ProfileSession]:
+        """
+        동시 프로파일 한도 안에서 세션 시작
+
+        Args:
+            trace_id: 요청의 trace id (메타데이터에만 기록, 파일 이름은 서버가 생성한 ID 사용)
+
+        Returns:
+            Optional[ProfileSession]: 한도 초과 시 None
+        """
+        with self._active_lock:
+            if self._active >= self.max_concurrent:
+                return None
+            self._active += 1
+        session = ProfileSession(uuid.uuid4().hex, self.interval, trace_id=trace_id)
+        session.start()
+        return session
+
+    def end(self, session: ProfileSession, meta: dict) -> str:
+        """
+        세션을 멈추고 folded stack / 메타데이터 저장
+
+        Returns:
+            str: 프로파일 ID
+        """
+        session.stop()
+        with self._active_lock:
+            self._active -= 1
+            concurrent = self._active
+
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        base = self.profile_dir / session.profile_id
+        for kind, counter in (("wall", session.wall), ("cpu", session.cpu)):
+            with open(f"{base}.{kind}.folded", 'w', encoding='utf-8') as f:
+                for stack, count in counter.most_common():
+                    f.write(f"{stack} {count}\n")
+        with open(f"{base}.json", 'w', encoding='utf-8') as f:
+            json.dump({
+                "profile_id": session.profile_id,
+                "trace_id": session.trace_id,
+                "interval_ms": session.interval * 1000,
+                "samples": session.samples,
+                "duration_seconds": round(session.duration, 4),
+                "process_cpu_seconds": round(session.cpu_time, 4),
+                # 다른 요청과 겹친 경우 스택에 그 요청의 샘플도 섞여 있음
+                "other_profiles_running": concurrent,
+                **meta,
+            }, f, ensure_ascii=False, indent=2)
+        return session.profile_id
+
+    @classmethod
+    def get_instance(cls) -> 'RequestProfiler':
+        """싱글톤 인스턴스 반환"""
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
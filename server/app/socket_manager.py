@@ -1,13 +1,20 @@
 import socketio
+import logging
+import os
 from typing import Optional
 import asyncio
 
+logger = logging.getLogger(__name__)
+
+# socket.io / engine.io 내부 로그는 매 패킷마다 출력되므로 필요할 때만 켬
+_SOCKETIO_DEBUG = os.getenv("SOCKETIO_DEBUG", "0") == "1"
+
 # Socket.IO 서버 생성 (CORS 설정 포함)
 sio = socketio.AsyncServer(
     async_mode='asgi',
     cors_allowed_origins='*',  # 프론트엔드 localhost:5173 허용
-    logger=True,
-    engineio_logger=True
+    logger=_SOCKETIO_DEBUG,
+    engineio_logger=_SOCKETIO_DEBUG
 )
 
 # Socket.IO ASGI app 생성
@@ -39,15 +46,28 @@ class SocketManager:
             'thumbnail': data.get('thumbnail'),
             'step': 'info'
         })
-        print(f"Emitted info: {data.get('title')}")
+        logger.debug("Emitted info: %s", data.get('title'))
+
+    async def emit_queued(self, data: dict):
+        """입장 대기 안내 전송 (step: 'queued')"""
+        await self.sio.emit('queued', {
+            'lane': data.get('lane'),
+            'position': data.get('position'),
+            'estimated_wait': data.get('estimated_wait'),
+            'step': 'queued'
+        })
+        logger.debug("Emitted queued: position %s", data.get('position'))
 
     async def emit_transcription(self, data: dict):
         """전사 결과 전송 (step: 'transcription')"""
         await self.sio.emit('transcription', {
             'script': data.get('script'),
+            # draft: 작은 모델의 빠른 초안 (이후 final 전사가 한 번 더 전송됨)
+            'tier': data.get('tier'),
+            'model_size': data.get('model_size'),
             'step': 'transcription'
         })
-        print(f"Emitted transcription: {len(data.get('script', ''))} characters")
+        logger.debug("Emitted transcription: %d characters", len(data.get('script') or ''))
 
     async def emit_extract(self, data: dict):
         """추출 데이터 전송 (step: 'extract')"""
@@ -55,7 +75,7 @@ class SocketManager:
             **data,
             'step': 'extract'
         })
-        print(f"Emitted extract data")
+        logger.debug("Emitted extract data")
 
     async def emit_conclusion(self, data: dict):
         """결론 데이터 전송 (step: 'conclusion')"""
@@ -63,7 +83,7 @@ class SocketManager:
             **data,
             'step': 'conclusion'
         })
-        print(f"Emitted conclusion data")
+        logger.debug("Emitted conclusion data")
 
     @classmethod
     def get_instance(cls) -> 'SocketManager':
@@ -89,5 +109,5 @@ async def disconnect(sid):
 @sio.event
 async def message(sid, data):
     """클라이언트로부터 메시지 수신"""
-    print(f"Message from {sid}: {data}")
+    logger.debug("Message from %s: %s", sid, data)
     await sio.emit('response', {'status': 'received'}, room=sid)
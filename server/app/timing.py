@@ -0,0 +1,152 @@
+"""
+파이프라인 단계별 소요 시간 측정 및 구조화 트레이싱
+요청(작업) 단위로 StageRecorder를 ContextVar에 걸어두면
+하위 코루틴/스레드에서 stage()로 감싼 구간의 시간이 모두 기록됨
+
+- stage(): 파이프라인 단계 (Prometheus 히스토그램 + 작업별 기록 + span)
+- span(): 단계 안의 세부 구간 (LLM 호출 등, span 로그만)
+span 로그는 app.trace 로거의 DEBUG 레벨에서만 직렬화됨 (TRACE_LOG_LEVEL=DEBUG)
+"""
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional
+
+from app.metrics import PIPELINE_STAGE_SECONDS
+
+trace_logger = logging.getLogger("app.trace")
+
+_recorder: ContextVar[Optional["StageRecorder"]] = ContextVar("stage_recorder", default=None)
+_trace_id: ContextVar[Optional[str]] = ContextVar("trace_id", default=None)
+_span_id: ContextVar[Optional[str]] = ContextVar("span_id", default=None)
+
+# 현재 컨텍스트(태스크)에서 진행 중인 단계 이름 (루프 블로킹 감지 스레드가 태스크 컨텍스트에서 읽음)
+_stage_name: ContextVar[Optional[str]] = ContextVar("stage_name", default=None)
+
+
+class StageRecorder:
+    """한 작업 동안 실행된 단계들의 소요 시간 기록"""
+
+    def __init__(self):
+        self.records: List[dict] = []
+
+    def add(self, name: str, duration: float, **attrs):
+        self.records.append({"stage": name, "duration": duration, **attrs})
+
+    def totals(self) -> Dict[str, float]:
+        """단계 이름별 누적 소요 시간 (초)"""
+        totals: Dict[str, float] = {}
+        for record in self.records:
+            totals[record["stage"]] = totals.get(record["stage"], 0.0) + record["duration"]
+        return totals
+
+
+def current_trace_id() -> Optional[str]:
+    return _trace_id.get()
+
+
+def current_stage_hint(loop: Optional[asyncio.AbstractEventLoop] = None) -> Optional[str]:
+    """
+    진행 중인 단계 이름
+
+    Args:
+        loop: 지정하면 그 루프에서 지금 실행 중인 태스크의 단계 (다른 스레드에서 호출 가능)
+
+    Returns:
+        Optional[str]: 단계 밖이거나 알 수 없으면 None
+    """
+    if loop is None:
+        return _stage_name.get()
+    task = asyncio.current_task(loop)
+    # Task.get_context는 Python 3.12+
+    get_context = getattr(task, "get_context", None)
+    if get_context is None:
+        return None
+    return get_context().get(_stage_name)
+
+
+@contextmanager
+def trace_context(trace_id: Optional[str] = None) -> Iterator[str]:
+    """요청 하나에 대한 trace id 설정 (하위 span들이 같은 trace id를 가짐)"""
+    trace_id = trace_id or uuid.uuid4().hex
+    token = _trace_id.set(trace_id)
+    try:
+        yield trace_id
+    finally:
+        _trace_id.reset(token)
+
+
+@contextmanager
+def span(name: str, **attrs) -> Iterator[dict]:
+    """
+    트레이싱 구간
+
+    Args:
+        name: span 이름
+        attrs: span 속성 (yield 된 dict에 구간 안에서 값을 추가할 수 있음)
+    """
+    span_id = uuid.uuid4().hex[:16]
+    parent_id = _span_id.get()
+    token = _span_id.set(span_id)
+    started = time.perf_counter()
+    attrs.setdefault("outcome", "ok")
+    try:
+        yield attrs
+    except BaseException:
+        # 호출한 쪽이 더 구체적인 결과를 적어두었으면 그대로 둠
+        if attrs["outcome"] == "ok":
+            attrs["outcome"] = "error"
+        raise
+    finally:
+        duration = time.perf_counter() - started
+        _span_id.reset(token)
+        attrs["duration"] = duration
+        if trace_logger.isEnabledFor(logging.DEBUG):
+            trace_logger.debug(json.dumps({
+                "span": name,
+                "trace_id": _trace_id.get(),
+                "span_id": span_id,
+                "parent_id": parent_id,
+                "duration_ms": round(duration * 1000, 3),
+                **{k: v for k, v in attrs.items() if k != "duration"},
+            }, ensure_ascii=False, default=str))
+
+
+@contextmanager
+def stage(name: str, **attrs) -> Iterator[None]:
+    """
+    파이프라인 단계 구간 측정
+
+    Args:
+        name: 단계 이름 (download, load_audio, transcribe, align, classify, graph, judge ...)
+        attrs: 기록에 함께 남길 부가 정보
+    """
+    recorder = _recorder.get()
+    stage_token = _stage_name.set(name)
+    span_attrs: dict = {}
+    try:
+        with span(name, **attrs) as span_attrs:
+            yield
+    finally:
+        _stage_name.reset(stage_token)
+        duration = span_attrs.get("duration")
+        if duration is not None:
+            PIPELINE_STAGE_SECONDS.labels(stage=name).observe(duration)
+            if recorder is not None:
+                recorder.add(name, duration, **attrs)
+
+
+@contextmanager
+def record_stages() -> Iterator[StageRecorder]:
+    """현재 컨텍스트(및 하위 태스크)에서 실행되는 단계들을 기록하는 recorder 설치"""
+    recorder = StageRecorder()
+    token = _recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _recorder.reset(token)
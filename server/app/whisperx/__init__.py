@@ -5,6 +5,9 @@ from .schemas import (
     STTRequest, 
     STTResponse, 
     TranscriptionSegment, 
+    WordTiming,
+    AlignedSegment,
+    AlignmentResponse,
     YouTubeSTTResponse,
     STTWithGraphResponse,
     ClassifiedSegment,
@@ -19,6 +22,9 @@ __all__ = [
     "STTRequest", 
     "STTResponse",
     "TranscriptionSegment",
+    "WordTiming",
+    "AlignedSegment",
+    "AlignmentResponse",
     "YouTubeSTTResponse",
     "STTWithGraphResponse",
     "ClassifiedSegment",
@@ -0,0 +1,95 @@
+"""
+오디오 배열 유틸리티 (whisperx.load_audio 결과: 16kHz mono float32)
+"""
+
+import wave
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+
+def wav_duration(file_path: str) -> Optional[float]:
+    """
+    WAV 헤더에서 재생 길이 읽기 (디코딩 없이)
+
+    Returns:
+        Optional[float]: 길이 (초, WAV가 아니거나 읽을 수 없으면 None)
+    """
+    try:
+        with wave.open(file_path, 'rb') as f:
+            return f.getnframes() / float(f.getframerate())
+    except (OSError, EOFError, wave.Error):
+        return None
+
+
+def frame_energies(audio: np.ndarray, frame_ms: int = 30) -> np.ndarray:
+    """
+    프레임 단위 RMS 에너지
+
+    Args:
+        audio: 16kHz mono 오디오
+        frame_ms: 프레임 길이 (ms)
+
+    Returns:
+        np.ndarray: 프레임별 RMS (마지막 불완전 프레임 제외)
+    """
+    frame = SAMPLE_RATE * frame_ms // 1000
+    count = len(audio) // frame
+    if count == 0:
+        return np.zeros(0, dtype=np.float32)
+    frames = audio[:count * frame].reshape(count, frame)
+    return np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1))
+
+
+def split_on_silence(
+    audio: np.ndarray,
+    chunk_seconds: float,
+    search_seconds: float = 20.0,
+    frame_ms: int = 30,
+    min_silence_ms: int = 300,
+) -> List[Tuple[int, int]]:
+    """
+    목표 길이 근처의 무음 구간에서 오디오를 나눔
+
+    chunk_seconds 마다 경계 후보를 잡고 앞뒤 search_seconds 안에서
+    min_silence_ms 동안의 평균 에너지가 가장 낮은 지점을 경계로 사용
+    (발화 중간에서 잘려 단어가 깨지는 것을 피하기 위함)
+
+    Args:
+        audio: 16kHz mono 오디오
+        chunk_seconds: 목표 청크 길이 (초)
+        search_seconds: 경계 탐색 범위 (초)
+        frame_ms: 에너지 프레임 길이 (ms)
+        min_silence_ms: 무음으로 볼 최소 길이 (ms)
+
+    Returns:
+        List[Tuple[int, int]]: (시작 샘플, 끝 샘플) 목록
+    """
+    total = len(audio)
+    chunk = int(chunk_seconds * SAMPLE_RATE)
+    if chunk <= 0 or total <= chunk * 1.5:
+        return [(0, total)]
+
+    frame = SAMPLE_RATE * frame_ms // 1000
+    energies = frame_energies(audio, frame_ms)
+    window = max(1, min_silence_ms // frame_ms)
+    # 연속 window 프레임의 평균 에너지 (무음 구간 길이를 반영)
+    smoothed = np.convolve(energies, np.ones(window) / window, mode="same")
+    search = int(search_seconds * 1000 / frame_ms)
+
+    bounds = [0]
+    target = chunk
+    while total - bounds[-1] > chunk * 1.5:
+        center = target // frame
+        lo = max(bounds[-1] // frame + window, center - search)
+        hi = min(len(smoothed), center + search)
+        if lo >= hi:
+            cut = target
+        else:
+            cut = (lo + int(np.argmin(smoothed[lo:hi]))) * frame
+        bounds.append(cut)
+        target = cut + chunk
+    bounds.append(total)
+    return list(zip(bounds[:-1], bounds[1:]))
@@ -0,0 +1,212 @@
+"""
+요청 간 동적 배칭 (WHISPERX_BATCHING=1 일 때만 동작)
+
+model.transcribe()는 요청마다 VAD 구간을 batch_size 단위로 디코딩하므로
+구간이 몇 개 안 되는 Shorts 요청은 배치를 거의 채우지 못함
+여기서는 FasterWhisperPipeline.transcribe()를 단계별로 나눠
+- 요청별 작업(VAD, 언어 감지, mel 특징 추출)은 각 요청 스레드에서 수행하고
+- 디코딩은 같은 (모델, 언어) 큐에 모인 여러 요청의 구간을 짧은 시간 창 동안 모아 한 배치로 실행한 뒤
+결과를 구간별 future로 다시 각 요청에 돌려줌
+"""
+
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.metrics import WHISPERX_BATCH_SIZE
+from app.whisperx.audio_utils import SAMPLE_RATE
+from app.whisperx.speech_map import vad_chunks
+
+
+@dataclass
+class _BatchItem:
+    features: Any
+    future: asyncio.Future
+
+
+@dataclass
+class _BatchQueue:
+    model: Any
+    language: str
+    items: List[_BatchItem] = field(default_factory=list)
+    wakeup: asyncio.Event = field(default_factory=asyncio.Event)
+    task: Optional[asyncio.Task] = None
+    # 같은 모델 크기가 다시 로드돼 새 큐로 교체됨 (남은 구간만 디코딩하고 종료)
+    retired: bool = False
+
+
+def _prepare(model, audio: np.ndarray, language: Optional[str]) -> Tuple[str, List[dict], List[Any]]:
+    """요청별 전처리: VAD 구간, 언어, 구간별 mel 특징"""
+    vad_segments = vad_chunks(model, audio)
+    if not language:
+        language = model.detect_language(audio)
+    features = [
+        model.preprocess({"inputs": audio[int(seg["start"] * SAMPLE_RATE):int(seg["end"] * SAMPLE_RATE)]})["inputs"]
+        for seg in vad_segments
+    ]
+    return language, vad_segments, features
+
+
+class InferenceBatcher:
+    """
+    (모델 크기, 언어)별 디코딩 큐를 관리하는 동적 배처
+
+    환경 변수
+      WHISPERX_BATCHING: 1이면 사용 (기본 비활성)
+      WHISPERX_BATCH_SIZE: 최대 배치 크기 (기본 16)
+      WHISPERX_BATCH_WINDOW_MS: 첫 구간이 들어온 뒤 배치를 더 모으는 시간 (기본 30ms)
+    """
+
+    _instance: Optional['InferenceBatcher'] = None
+    _lock = Lock()
+
+    def __init__(self):
+        self.enabled = os.getenv("WHISPERX_BATCHING", "0") == "1"
+        self.batch_size = int(os.getenv("WHISPERX_BATCH_SIZE", "16"))
+        self.window = float(os.getenv("WHISPERX_BATCH_WINDOW_MS", "30")) / 1000
+        self._queues: Dict[Tuple[str, str], _BatchQueue] = {}
+        self._tokenizers: Dict[Tuple[str, str], Any] = {}
+        # CTranslate2 디코딩은 한 스레드에서 순서대로 실행 (배치 안에서 병렬화됨)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="whisperx-batch")
+        self.stats = {"requests": 0, "segments": 0, "batches": 0}
+
+    def _tokenizer(self, model, model_size: str, language: str):
+        """언어별 tokenizer (파이프라인의 공유 tokenizer를 건드리지 않도록 따로 보관)"""
+        key = (model_size, language)
+        if key not in self._tokenizers:
+            from faster_whisper.tokenizer import Tokenizer
+
+            self._tokenizers[key] = Tokenizer(
+                model.model.hf_tokenizer,
+                model.model.model.is_multilingual,
+                task="transcribe",
+                language=language,
+            )
+        return self._tokenizers[key]
+
+    def _decode(self, model, tokenizer, features: List[Any]) -> List[str]:
+        batch = np.stack([np.asarray(f) for f in features])
+        return model.model.generate_segment_batched(batch, tokenizer, model.options)
+
+    async def _drain(self, key: Tuple[str, str], queue: _BatchQueue):
+        """큐에 구간이 들어오면 시간 창 동안 더 모은 뒤 배치 디코딩"""
+        loop = asyncio.get_running_loop()
+        batch: List[_BatchItem] = []
+        try:
+            tokenizer = self._tokenizer(queue.model, key[0], queue.language)
+            while True:
+                if queue.retired and not queue.items:
+                    return
+                await queue.wakeup.wait()
+                deadline = loop.time() + self.window
+                while len(queue.items) < self.batch_size and loop.time() < deadline:
+                    queue.wakeup.clear()
+                    try:
+                        await asyncio.wait_for(queue.wakeup.wait(), deadline - loop.time())
+                    except asyncio.TimeoutError:
+                        break
+
+                batch, queue.items = queue.items[:self.batch_size], queue.items[self.batch_size:]
+                if not queue.items:
+                    queue.wakeup.clear()
+                if not batch:
+                    continue
+
+                self.stats["batches"] += 1
+                WHISPERX_BATCH_SIZE.observe(len(batch))
+                try:
+                    texts = await loop.run_in_executor(
+                        self._executor, self._decode, queue.model, tokenizer, [item.features for item in batch]
+                    )
+                    for item, text in zip(batch, texts):
+                        if not item.future.done():
+                            item.future.set_result(text)
+                except Exception as e:
+                    for item in batch:
+                        if not item.future.done():
+                            item.future.set_exception(e)
+                batch = []
+        finally:
+            # 취소되거나 예외로 루프가 끝나면 디코딩 중/대기 중인 구간의 요청이 영원히 기다리지 않도록 실패 처리
+            pending, queue.items = batch + queue.items, []
+            for item in pending:
+                if not item.future.done():
+                    item.future.set_exception(RuntimeError(f"WhisperX batch queue stopped: {key[0]}/{key[1]}"))
+
+    def _queue_for(self, model, model_size: str, language: str) -> _BatchQueue:
+        key = (model_size, language)
+        queue = self._queues.get(key)
+        # 드레인 태스크가 끝난 큐(예외로 종료)에는 새 구간을 넣지 않음
+        if queue is None or queue.model is not model or queue.task.done():
+            if queue is not None:
+                # 모델이 LRU로 내려갔다 다시 로드된 경우: 예전 큐는 이미 받은 구간을 예전 모델로 끝까지 디코딩
+                queue.retired = True
+                queue.wakeup.set()
+            queue = _BatchQueue(model=model, language=language)
+            queue.task = asyncio.get_running_loop().create_task(self._drain(key, queue))
+            self._queues[key] = queue
+        return queue
+
+    async def transcribe(self, model, model_size: str, audio: np.ndarray,
+                         language: Optional[str] = None) -> Dict[str, Any]:
+        """
+        model.transcribe(audio)와 같은 형식의 결과를 공유 배치로 계산
+
+        Args:
+            model: WhisperX FasterWhisperPipeline
+            model_size: 모델 크기 (배치 큐 구분용)
+            audio: 16kHz mono 오디오
+            language: 언어 코드 (None/"auto"면 자동 감지)
+
+        Returns:
+            Dict[str, Any]: {"segments": [...], "language": str}
+        """
+        if language == "auto":
+            language = None
+        language, vad_segments, features = await asyncio.to_thread(_prepare, model, audio, language)
+
+        self.stats["requests"] += 1
+        self.stats["segments"] += len(features)
+        loop = asyncio.get_running_loop()
+        queue = self._queue_for(model, model_size, language)
+        futures = []
+        for feature in features:
+            future = loop.create_future()
+            queue.items.append(_BatchItem(feature, future))
+            futures.append(future)
+        if futures:
+            queue.wakeup.set()
+        texts = await asyncio.gather(*futures)
+
+        return {
+            "segments": [
+                {"text": text, "start": round(seg["start"], 3), "end": round(seg["end"], 3)}
+                for seg, text in zip(vad_segments, texts)
+            ],
+            "language": language,
+        }
+
+    def get_info(self) -> dict:
+        batches = self.stats["batches"]
+        return {
+            "enabled": self.enabled,
+            "batch_size": self.batch_size,
+            "window_ms": self.window * 1000,
+            **self.stats,
+            "avg_batch_fill": round(self.stats["segments"] / batches, 2) if batches else 0.0,
+            "queues": [f"{size}/{lang}" for size, lang in self._queues],
+        }
+
+    @classmethod
+    def get_instance(cls) -> 'InferenceBatcher':
+        """싱글톤 인스턴스 반환"""
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
@@ -3,11 +3,16 @@ STT 결과 캐시 서비스
 """
 
 import json
-import hashlib
 import os
+import hashlib
 from pathlib import Path
-from typing import Optional
-from app.whisperx.schemas import STTResponse
+from typing import Dict, List, Optional, Tuple
+from app.artifacts import ArtifactStore
+from app.whisperx.schemas import (
+    AlignmentResponse, ArgumentGraph, SentenceType, STTResponse, STTWithGraphResponse
+)
+from app.whisperx.similarity import candidate_pairs
+from app.whisperx.system_prompt import RELATIONSHIP_PROMPT, SENTENCE_CLASSIFICATION_PROMPT
 
 
 class STTCacheService:
@@ -32,11 +37,11 @@ class STTCacheService:
         Returns:
             str: 캐시 키 (해시값)
         """
-        # 파일의 수정 시간과 크기도 포함하여 캐시 키 생성
-        try:
-            stat = os.stat(file_path)
-            cache_input = f"{file_path}_{language}_{stat.st_mtime}_{stat.st_size}"
-        except OSError:
+        # 파일의 수정 시간과 크기도 포함하여 캐시 키 생성 (보관소가 삭제한 파일은 삭제 직전 값)
+        fingerprint = ArtifactStore.get_instance().fingerprint(file_path)
+        if fingerprint:
+            cache_input = f"{file_path}_{language}_{fingerprint}"
+        else:
             cache_input = f"{file_path}_{language}"
         
         return hashlib.md5(cache_input.encode()).hexdigest()
@@ -158,4 +163,265 @@ class STTCacheService:
             "cached_files": len(cache_files),
             "total_size_bytes": total_size,
             "total_size_mb": round(total_size / (1024 * 1024), 2)
-        }
\ No newline at end of file
+        }
+
+
+class AlignmentCacheService:
+    def __init__(self, cache_dir: str = "cache/align"):
+        """
+        단어 타임스탬프(강제 정렬) 캐시 서비스 초기화
+        전사 결과와 별도로 저장하고, 전사 텍스트가 바뀌면 다른 키가 됨
+        
+        Args:
+            cache_dir: 캐시 디렉토리 경로
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+    
+    def _get_cache_file_path(self, file_path: str, language: str, full_text: str) -> Path:
+        """
+        오디오 파일, 언어, 전사 텍스트로 캐시 파일 경로 생성
+        
+        Args:
+            file_path: 오디오 파일 경로
+            language: 정렬 언어 코드
+            full_text: 정렬 대상 전사 텍스트
+            
+        Returns:
+            Path: 캐시 파일 경로
+        """
+        text_hash = hashlib.md5(full_text.encode()).hexdigest()
+        fingerprint = ArtifactStore.get_instance().fingerprint(file_path)
+        if fingerprint:
+            cache_input = f"{file_path}_{language}_{fingerprint}_{text_hash}"
+        else:
+            cache_input = f"{file_path}_{language}_{text_hash}"
+        
+        return self.cache_dir / f"{hashlib.md5(cache_input.encode()).hexdigest()}.json"
+    
+    def get_cached_alignment(self, file_path: str, language: str, full_text: str) -> Optional[AlignmentResponse]:
+        """
+        캐시된 정렬 결과 조회
+        
+        Returns:
+            Optional[AlignmentResponse]: 캐시된 결과 (없으면 None)
+        """
+        try:
+            cache_file = self._get_cache_file_path(file_path, language, full_text)
+            if not cache_file.exists():
+                return None
+            
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                return AlignmentResponse(**json.load(f))
+            
+        except Exception as e:
+            print(f"정렬 캐시 조회 오류: {e}")
+            return None
+    
+    def save_alignment(self, file_path: str, language: str, full_text: str, alignment: AlignmentResponse) -> bool:
+        """
+        정렬 결과를 캐시에 저장
+        
+        Returns:
+            bool: 저장 성공 여부
+        """
+        try:
+            cache_file = self._get_cache_file_path(file_path, language, full_text)
+            with open(cache_file, 'w', encoding='utf-8') as f:
+                json.dump(alignment.dict(), f, ensure_ascii=False)
+            return True
+            
+        except Exception as e:
+            print(f"정렬 캐시 저장 오류: {e}")
+            return False
+    
+    def get_cache_info(self) -> dict:
+        """
+        캐시 정보 조회
+        
+        Returns:
+            dict: 캐시 정보
+        """
+        cache_files = list(self.cache_dir.glob("*.json"))
+        total_size = sum(f.stat().st_size for f in cache_files)
+        
+        return {
+            "cache_dir": str(self.cache_dir),
+            "cached_files": len(cache_files),
+            "total_size_bytes": total_size,
+            "total_size_mb": round(total_size / (1024 * 1024), 2)
+        }
+
+
+# 그래프 생성 방식(분류/관계 추론 로직, 저장 형식)이 바뀌면 올려서 이전 캐시를 무효화
+GRAPH_CACHE_VERSION = 1
+# 겹치는 구간 재사용으로 인정할 최소 공유 세그먼트 수
+GRAPH_REUSE_MIN_SEGMENTS = 3
+
+
+class GraphReuse:
+    """
+    이전 그래프에서 재사용할 수 있는 분류/관계 결과
+
+    겹치는 구간의 세그먼트 텍스트가 같으면 분류를, 두 세그먼트가 모두 이전 그래프에 있고
+    그때도 관계를 분석한 쌍이면 관계 결과를 그대로 씀
+    """
+
+    def __init__(self, graph: ArgumentGraph):
+        self.classifications: Dict[str, SentenceType] = {}
+        for node in graph.nodes:
+            self.classifications.setdefault(node.text, node.classification)
+        edges = {(edge.source_id, edge.target_id): edge for edge in graph.edges}
+        # 이전 그래프에서 분석한 쌍 (엣지가 없으면 none 또는 낮은 신뢰도였던 쌍)
+        self.relationships: Dict[Tuple[str, str], Tuple[str, float]] = {}
+        nodes = graph.nodes
+        for i, j in candidate_pairs(nodes):
+            edge = edges.get((nodes[i].id, nodes[j].id))
+            result = (edge.relationship, edge.confidence) if edge is not None else ("none", 0.0)
+            self.relationships.setdefault((nodes[i].text, nodes[j].text), result)
+
+    def classification(self, text: str) -> Optional[SentenceType]:
+        return self.classifications.get(text)
+
+    def relationship(self, text1: str, text2: str) -> Optional[Tuple[str, float]]:
+        return self.relationships.get((text1, text2))
+
+
+class GraphCacheService:
+    def __init__(self, cache_dir: str = "cache/graph", config: Optional[dict] = None):
+        """
+        논증 그래프 캐시 서비스 초기화
+        세그먼트 텍스트가 같으면 (같은 영상, 지문 색인으로 전사를 재사용한 재업로드) 그래프 재사용
+        일부 구간만 겹치면 그 구간의 분류/관계 결과만 재사용
+        
+        Args:
+            cache_dir: 캐시 디렉토리 경로
+            config: 그래프 결과에 영향을 주는 설정 (모델, 재분할, 장거리 후보 등 - 캐시 키에 포함)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.cache_dir / "index.jsonl"
+        self.config_hash = self._get_config_hash(config or {})
+    
+    @staticmethod
+    def _get_config_hash(config: dict) -> str:
+        """캐시 버전, 프롬프트, 설정으로 만든 해시 (하나라도 바뀌면 다른 캐시 사용)"""
+        cache_input = json.dumps({
+            "version": GRAPH_CACHE_VERSION,
+            "classification_prompt": hashlib.md5(SENTENCE_CLASSIFICATION_PROMPT.encode()).hexdigest(),
+            "relationship_prompt": hashlib.md5(RELATIONSHIP_PROMPT.encode()).hexdigest(),
+            **config,
+        }, sort_keys=True, default=str)
+        return hashlib.md5(cache_input.encode()).hexdigest()[:12]
+    
+    @staticmethod
+    def _text_hash(text: str) -> str:
+        return hashlib.md5(text.encode()).hexdigest()[:16]
+    
+    def _get_cache_file_path(self, segment_texts: List[str]) -> Path:
+        """
+        세그먼트 텍스트 목록으로 캐시 파일 경로 생성
+        
+        Args:
+            segment_texts: 그래프를 만든 세그먼트 텍스트 (순서 포함)
+            
+        Returns:
+            Path: 캐시 파일 경로
+        """
+        text_hash = hashlib.md5("\n".join(segment_texts).encode()).hexdigest()
+        return self.cache_dir / f"{text_hash}.{self.config_hash}.json"
+    
+    def get_cached_graph(self, segment_texts: List[str]) -> Optional[STTWithGraphResponse]:
+        """
+        캐시된 그래프 결과 조회
+        
+        Returns:
+            Optional[STTWithGraphResponse]: 캐시된 결과 (없으면 None)
+        """
+        try:
+            cache_file = self._get_cache_file_path(segment_texts)
+            if not cache_file.exists():
+                return None
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                return STTWithGraphResponse(**json.load(f))
+            
+        except Exception as e:
+            print(f"그래프 캐시 조회 오류: {e}")
+            return None
+    
+    def find_overlapping_graph(self, segment_texts: List[str]) -> Optional[GraphReuse]:
+        """
+        같은 설정으로 만든 그래프 중 세그먼트를 가장 많이 공유하는 그래프의 재사용 정보
+        
+        Args:
+            segment_texts: 이번 그래프의 세그먼트 텍스트
+            
+        Returns:
+            Optional[GraphReuse]: 공유 세그먼트가 GRAPH_REUSE_MIN_SEGMENTS 이상인 그래프가 없으면 None
+        """
+        if not self.index_path.exists():
+            return None
+        try:
+            wanted = {self._text_hash(text) for text in segment_texts}
+            best_file, best_shared = None, 0
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    entry = json.loads(line)
+                    if entry["config"] != self.config_hash:
+                        continue
+                    shared = len(wanted.intersection(entry["texts"]))
+                    if shared > best_shared:
+                        best_file, best_shared = entry["file"], shared
+            if best_file is None or best_shared < GRAPH_REUSE_MIN_SEGMENTS:
+                return None
+            cache_file = self.cache_dir / best_file
+            if not cache_file.exists():
+                return None
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                cached = STTWithGraphResponse(**json.load(f))
+            print(f"그래프 부분 재사용: {best_shared}/{len(segment_texts)} 세그먼트 ({best_file})")
+            return GraphReuse(cached.argument_graph)
+            
+        except Exception as e:
+            print(f"그래프 캐시 부분 조회 오류: {e}")
+            return None
+    
+    def save_graph(self, segment_texts: List[str], result: STTWithGraphResponse) -> bool:
+        """
+        그래프 결과를 캐시에 저장 (겹치는 구간 조회용 세그먼트 색인도 추가)
+        
+        Returns:
+            bool: 저장 성공 여부
+        """
+        try:
+            cache_file = self._get_cache_file_path(segment_texts)
+            with open(cache_file, 'w', encoding='utf-8') as f:
+                json.dump(result.dict(), f, ensure_ascii=False)
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({
+                    "file": cache_file.name,
+                    "config": self.config_hash,
+                    "texts": sorted({self._text_hash(text) for text in segment_texts}),
+                }) + "\n")
+            return True
+            
+        except Exception as e:
+            print(f"그래프 캐시 저장 오류: {e}")
+            return False
+    
+    def get_cache_info(self) -> dict:
+        """
+        캐시 정보 조회
+        
+        Returns:
+            dict: 캐시 정보
+        """
+        cache_files = list(self.cache_dir.glob("*.json"))
+        total_size = sum(f.stat().st_size for f in cache_files)
+        
+        return {
+            "cache_dir": str(self.cache_dir),
+            "cached_files": len(cache_files),
+            "total_size_bytes": total_size,
+            "total_size_mb": round(total_size / (1024 * 1024), 2)
+        }
@@ -0,0 +1,319 @@
+"""
+세그먼트 CLAIM/FACT 로컬 사전 분류기
+
+Gemini 분류 결과(라벨)를 JSONL로 쌓아 두고, 문자 n-gram 해시 특징 위의 로지스틱 회귀를 학습해
+확신도가 임계값 이상인 세그먼트는 로컬에서 바로 분류하고 나머지만 LLM으로 보냄
+라벨은 LLM 응답만 기록하므로 로컬 예측이 학습 데이터로 되돌아가지 않음
+"""
+
+import asyncio
+import json
+import os
+import re
+import time
+import unicodedata
+import zlib
+from pathlib import Path
+from threading import Lock
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.metrics import SEGMENT_CLASSIFICATIONS_TOTAL
+from app.whisperx.schemas import SentenceType
+
+# 특징 해시 공간 크기 (float32 가중치 1MB)
+FEATURE_DIM = 1 << 18
+# 문자 n-gram 길이 (한국어는 음절 단위라 2~4글자면 어미/조사 패턴이 잡힘)
+NGRAM_SIZES = (2, 3, 4)
+
+# Gemini 응답의 "분류: CLAIM" 줄
+_LABEL_RE = re.compile(r"분류\s*[:：]\s*\**\s*(CLAIM|FACT)", re.IGNORECASE)
+_SPACE_RE = re.compile(r"\s+")
+
+
+def parse_label(reply: str) -> Optional[str]:
+    """
+    LLM 분류 응답에서 라벨 추출 (학습 데이터로 쓸 수 있을 만큼 명확한 경우만)
+
+    Returns:
+        Optional[str]: "CLAIM" / "FACT" (형식이 다르거나 실패 응답이면 None)
+    """
+    match = _LABEL_RE.search(reply or "")
+    if match:
+        return match.group(1).upper()
+    upper = (reply or "").upper()
+    if ("CLAIM" in upper) != ("FACT" in upper):
+        return SentenceType.CLAIM.value if "CLAIM" in upper else SentenceType.FACT.value
+    return None
+
+
+def hashed_features(text: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    문자 n-gram 해시 특징 (L2 정규화된 등장 횟수)
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (특징 인덱스, 값)
+    """
+    normalized = _SPACE_RE.sub(" ", unicodedata.normalize("NFKC", text or "").lower()).strip()
+    if not normalized:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+    padded = f" {normalized} "
+    hashes = [
+        zlib.crc32(f"{n}:{padded[i:i + n]}".encode("utf-8")) % FEATURE_DIM
+        for n in NGRAM_SIZES
+        for i in range(len(padded) - n + 1)
+    ]
+    if not hashes:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+    indices, counts = np.unique(np.asarray(hashes, dtype=np.int64), return_counts=True)
+    values = counts.astype(np.float32)
+    values /= np.linalg.norm(values)
+    return indices, values
+
+
+class SegmentClassifier:
+    """
+    해시 n-gram 로지스틱 회귀 분류기 (P(CLAIM) 예측)
+
+    환경 변수
+      LOCAL_CLASSIFIER: 1이면 확신도가 높은 세그먼트를 로컬에서 분류 (기본 비활성)
+      LOCAL_CLASSIFIER_THRESHOLD: 로컬 분류로 인정할 최소 확신도 max(p, 1-p) (기본 0.9)
+      LOCAL_CLASSIFIER_LOG_LABELS: 1이면 LLM 분류 결과를 학습용으로 기록 (기본: LOCAL_CLASSIFIER와 같음)
+      LOCAL_CLASSIFIER_MIN_SAMPLES: 학습에 필요한 최소 라벨 수 (기본 300)
+      LOCAL_CLASSIFIER_MIN_ACCURACY: 검증 세트에서 확신 예측 정확도가 이보다 낮으면 사용하지 않음 (기본 0.9)
+      LOCAL_CLASSIFIER_MIN_CONFIDENT: 정확도를 믿을 수 있는 최소 확신 검증 샘플 수 (기본 20)
+      LOCAL_CLASSIFIER_RETRAIN_EVERY: 새 라벨이 이만큼 쌓이면 재학습 (기본 200)
+      LOCAL_CLASSIFIER_DIR: 라벨/모델 저장 디렉토리 (기본 cache/classifier)
+    """
+
+    _instance: Optional['SegmentClassifier'] = None
+    _lock = Lock()
+
+    def __init__(self):
+        self.enabled = os.getenv("LOCAL_CLASSIFIER", "0") == "1"
+        self.threshold = float(os.getenv("LOCAL_CLASSIFIER_THRESHOLD", "0.9"))
+        self.log_labels = os.getenv("LOCAL_CLASSIFIER_LOG_LABELS", "1" if self.enabled else "0") == "1"
+        self.min_samples = int(os.getenv("LOCAL_CLASSIFIER_MIN_SAMPLES", "300"))
+        self.min_accuracy = float(os.getenv("LOCAL_CLASSIFIER_MIN_ACCURACY", "0.9"))
+        self.min_confident = int(os.getenv("LOCAL_CLASSIFIER_MIN_CONFIDENT", "20"))
+        self.retrain_every = int(os.getenv("LOCAL_CLASSIFIER_RETRAIN_EVERY", "200"))
+        self.dir = Path(os.getenv("LOCAL_CLASSIFIER_DIR", "cache/classifier"))
+        self.labels_path = self.dir / "labels.jsonl"
+        self.model_path = self.dir / "model.npz"
+
+        # (가중치, 편향) 튜플을 통째로 교체해 예측 중 재학습과 충돌하지 않게 함
+        self._model: Optional[Tuple[np.ndarray, float]] = None
+        self.meta: dict = {}
+        self._train_lock = Lock()
+        self._training: Optional[asyncio.Task] = None
+        self._new_labels = 0
+        self.stats = {"local": 0, "escalated": 0}
+        self._load_model()
+
+    # ---------------- 모델 저장/로드 ---------------- #
+    def _load_model(self):
+        try:
+            with np.load(self.model_path) as data:
+                self._model = (data["weights"].astype(np.float32), float(data["bias"]))
+                self.meta = json.loads(str(data["meta"]))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"로컬 분류기 모델 로드 오류: {e}")
+
+    def _save_model(self, weights: np.ndarray, bias: float, meta: dict):
+        try:
+            self.dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.model_path.with_suffix(".tmp.npz")
+            np.savez_compressed(tmp_path, weights=weights, bias=np.float32(bias), meta=json.dumps(meta))
+            os.replace(tmp_path, self.model_path)
+        except Exception as e:
+            print(f"로컬 분류기 모델 저장 오류: {e}")
+
+    @property
+    def ready(self) -> bool:
+        """학습된 모델이 있고 충분한 수의 확신 검증 샘플에서 정확도 기준을 넘었는지"""
+        return (
+            self._model is not None
+            and self.meta.get("holdout_confident", 0) >= self.min_confident
+            and self.meta.get("holdout_accuracy", 0.0) >= self.min_accuracy
+        )
+
+    # ---------------- 예측 ---------------- #
+    def predict_proba(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        세그먼트들의 P(CLAIM) 일괄 계산
+
+        Returns:
+            np.ndarray: 텍스트별 CLAIM 확률 (모델이 없으면 0.5)
+        """
+        return self._proba(self._model, texts)
+
+    @staticmethod
+    def _proba(model: Optional[Tuple[np.ndarray, float]], texts: Sequence[str]) -> np.ndarray:
+        if model is None or not texts:
+            return np.full(len(texts), 0.5, dtype=np.float32)
+        weights, bias = model
+        features = [hashed_features(text) for text in texts]
+        rows = np.repeat(np.arange(len(texts)), [len(indices) for indices, _ in features])
+        indices = np.concatenate([indices for indices, _ in features])
+        values = np.concatenate([values for _, values in features])
+        scores = np.bincount(rows, weights=weights[indices] * values, minlength=len(texts)) + bias
+        return 1.0 / (1.0 + np.exp(-scores))
+
+    def classify_batch(self, texts: Sequence[str]) -> List[Optional[str]]:
+        """
+        확신도가 임계값 이상인 세그먼트만 로컬 분류
+
+        Args:
+            texts: 세그먼트 텍스트 목록
+
+        Returns:
+            List[Optional[str]]: "CLAIM" / "FACT" (LLM으로 보내야 하면 None)
+        """
+        labels: List[Optional[str]] = [None] * len(texts)
+        if self.enabled and self.ready:
+            for i, (text, p) in enumerate(zip(texts, self.predict_proba(texts))):
+                if (text or "").strip() and max(p, 1.0 - p) >= self.threshold:
+                    labels[i] = SentenceType.CLAIM.value if p >= 0.5 else SentenceType.FACT.value
+        local = sum(1 for label in labels if label is not None)
+        self.stats["local"] += local
+        self.stats["escalated"] += len(labels) - local
+        SEGMENT_CLASSIFICATIONS_TOTAL.labels(source="local").inc(local)
+        SEGMENT_CLASSIFICATIONS_TOTAL.labels(source="llm").inc(len(labels) - local)
+        return labels
+
+    # ---------------- 라벨 기록 / 학습 ---------------- #
+    def record(self, texts: Sequence[str], replies: Sequence[str]):
+        """
+        LLM 분류 결과를 학습 라벨로 기록하고 충분히 쌓였으면 백그라운드 재학습
+
+        Args:
+            texts: LLM으로 분류한 세그먼트 텍스트
+            replies: 같은 순서의 LLM 응답
+        """
+        if not self.log_labels:
+            return
+        rows = []
+        for text, reply in zip(texts, replies):
+            label = parse_label(reply)
+            if label and (text or "").strip():
+                rows.append({"text": text.strip(), "label": label, "created_at": time.time()})
+        if not rows:
+            return
+        try:
+            self.dir.mkdir(parents=True, exist_ok=True)
+            with open(self.labels_path, 'a', encoding='utf-8') as f:
+                for row in rows:
+                    f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        except Exception as e:
+            print(f"로컬 분류기 라벨 저장 오류: {e}")
+            return
+
+        self._new_labels += len(rows)
+        if self._new_labels >= self.retrain_every and (self._training is None or self._training.done()):
+            self._new_labels = 0
+            try:
+                self._training = asyncio.get_running_loop().create_task(asyncio.to_thread(self.train))
+            except RuntimeError:
+                self.train()
+
+    def _load_labels(self) -> Tuple[List[str], np.ndarray]:
+        """라벨 기록 로드 (같은 텍스트는 마지막 라벨 사용)"""
+        latest = {}
+        try:
+            with open(self.labels_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    row = json.loads(line)
+                    latest[row["text"]] = 1.0 if row["label"] == SentenceType.CLAIM.value else 0.0
+        except FileNotFoundError:
+            pass
+        texts = list(latest)
+        return texts, np.asarray([latest[text] for text in texts], dtype=np.float32)
+
+    @staticmethod
+    def _fit(features, targets: np.ndarray, epochs: int = 8, lr: float = 0.5, l2: float = 1e-6,
+             seed: int = 0) -> Tuple[np.ndarray, float]:
+        """SGD 로지스틱 회귀 (희소 특징이라 샘플마다 등장한 가중치만 갱신)"""
+        weights = np.zeros(FEATURE_DIM, dtype=np.float32)
+        bias = 0.0
+        # 클래스 불균형 보정
+        positive = float(targets.mean()) if len(targets) else 0.5
+        class_weight = {1.0: 0.5 / max(positive, 1e-3), 0.0: 0.5 / max(1.0 - positive, 1e-3)}
+        rng = np.random.default_rng(seed)
+        for epoch in range(epochs):
+            step = lr / (1.0 + epoch)
+            for i in rng.permutation(len(targets)):
+                indices, values = features[i]
+                score = float(weights[indices] @ values) + bias
+                p = 1.0 / (1.0 + np.exp(-score))
+                grad = (p - targets[i]) * class_weight[float(targets[i])]
+                weights[indices] -= step * (grad * values + l2 * weights[indices])
+                bias -= step * grad
+        return weights, bias
+
+    def train(self) -> dict:
+        """
+        라벨 기록으로 모델 학습
+
+        10%를 떼어 확신 예측 정확도/비율을 측정한 뒤 전체 데이터로 다시 학습
+
+        Returns:
+            dict: 학습 메타 정보 (라벨이 부족하면 skipped)
+        """
+        with self._train_lock:
+            texts, targets = self._load_labels()
+            if len(texts) < self.min_samples:
+                return {"skipped": True, "samples": len(texts)}
+            started = time.perf_counter()
+            features = [hashed_features(text) for text in texts]
+
+            holdout = np.arange(len(texts)) % 10 == 0
+            train_idx = np.flatnonzero(~holdout)
+            trial = self._fit([features[i] for i in train_idx], targets[train_idx])
+            proba = self._proba(trial, [texts[i] for i in np.flatnonzero(holdout)])
+            confident = np.maximum(proba, 1.0 - proba) >= self.threshold
+            correct = (proba >= 0.5) == (targets[holdout] >= 0.5)
+            accuracy = float(correct[confident].mean()) if confident.any() else 0.0
+
+            weights, bias = self._fit(features, targets)
+            meta = {
+                "samples": len(texts),
+                "claim_ratio": round(float(targets.mean()), 3),
+                "holdout_accuracy": round(accuracy, 4),
+                "holdout_coverage": round(float(confident.mean()), 4),
+                "holdout_confident": int(confident.sum()),
+                "threshold": self.threshold,
+                "trained_at": time.time(),
+                "train_seconds": round(time.perf_counter() - started, 2),
+            }
+            self._model = (weights, bias)
+            self.meta = meta
+            self._save_model(weights, bias, meta)
+            print(f"Local classifier trained on {len(texts)} labels: holdout accuracy {accuracy:.3f} "
+                  f"over {meta['holdout_confident']} confident samples, "
+                  f"coverage {meta['holdout_coverage']:.3f} at threshold {self.threshold}")
+            return meta
+
+    def get_info(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "ready": self.ready,
+            "threshold": self.threshold,
+            "model": self.meta,
+            "local": self.stats["local"],
+            "escalated": self.stats["escalated"],
+        }
+
+    @classmethod
+    def get_instance(cls) -> 'SegmentClassifier':
+        """싱글톤 인스턴스 반환"""
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
@@ -0,0 +1,348 @@
+"""
+오디오 지문 색인 (FINGERPRINT_ENABLED=1 일 때만 동작)
+
+같은 클립이 다른 영상 ID로 다시 올라오는 경우(일부 잘림, 재인코딩 포함)
+스펙트로그램 피크 쌍(landmark) 해시로 이전에 전사한 오디오를 찾아
+겹치는 구간의 전사 세그먼트를 재사용하고 나머지 구간만 전사
+
+- 지문: 8kHz 스펙트로그램의 지역 최대 피크 -> (f1, f2, dt) 피크 쌍 해시 + 앵커 시간
+- 색인: sqlite3 (해시 -> 오디오, 시간), 전사 결과(STTResponse JSON)는 오디오 행에 함께 보관
+- 매칭: 같은 해시의 (색인 시간 - 질의 시간) 차이가 한 값에 몰리면 같은 오디오의 겹치는 구간
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from app.metrics import record_cache
+from app.timing import stage
+from app.whisperx.audio_utils import SAMPLE_RATE
+from app.whisperx.schemas import STTResponse
+from app.whisperx.speech_map import SpeechMap
+from app.whisperx.tiering import TierPolicy
+
+# 스펙트로그램 설정 (8kHz, 64ms 창, 32ms 간격)
+_RATE = 8000
+_N_FFT = 512
+_HOP = 256
+FRAME_SECONDS = _HOP / _RATE
+# 피크 주변 최대값 비교 범위 (주파수 bin, 프레임)
+_PEAK_FREQ_RADIUS = 10
+_PEAK_TIME_RADIUS = 15
+# 피크가 되려면 블록 중앙값보다 이만큼 커야 함 (자연로그, 약 17dB)
+_PEAK_MIN_LOG_RATIO = 2.0
+# 앵커 피크 하나에 묶는 뒤쪽 피크 수와 시간 범위 (프레임)
+_FAN_OUT = 5
+_MAX_DT = 63
+_BLOCK_FRAMES = 1024
+
+
+def _max_filter(values: np.ndarray, radius: int, axis: int) -> np.ndarray:
+    """1차원 최대값 필터 (가장자리는 -inf 패딩)"""
+    pad = [(0, 0)] * values.ndim
+    pad[axis] = (radius, radius)
+    padded = np.pad(values, pad, constant_values=-np.inf)
+    windows = np.lib.stride_tricks.sliding_window_view(padded, 2 * radius + 1, axis=axis)
+    return windows.max(axis=-1)
+
+
+def _peaks(audio: np.ndarray) -> List[Tuple[int, int]]:
+    """스펙트로그램 지역 최대 피크 [(프레임, 주파수 bin)] (시간 순)"""
+    # 0~4kHz 대역만 사용 (음성/음악 지문에 충분하고 계산량이 절반)
+    samples = audio[:len(audio) // 2 * 2].reshape(-1, 2).mean(axis=1)
+    count = 1 + (len(samples) - _N_FFT) // _HOP if len(samples) >= _N_FFT else 0
+    window = np.hanning(_N_FFT).astype(np.float32)
+    peaks: List[Tuple[int, int]] = []
+    margin = _PEAK_TIME_RADIUS
+    for block_start in range(0, count, _BLOCK_FRAMES):
+        # 블록 경계의 피크도 앞뒤 프레임과 비교하도록 여유 프레임 포함
+        lo = max(0, block_start - margin)
+        hi = min(count, block_start + _BLOCK_FRAMES + margin)
+        index = np.arange(_N_FFT)[None, :] + _HOP * np.arange(lo, hi)[:, None]
+        spectrum = np.log(np.abs(np.fft.rfft(samples[index] * window, axis=1)) + 1e-6)
+        local_max = _max_filter(_max_filter(spectrum, _PEAK_FREQ_RADIUS, 1), _PEAK_TIME_RADIUS, 0)
+        threshold = np.median(spectrum) + _PEAK_MIN_LOG_RATIO
+        frames, bins = np.nonzero((spectrum == local_max) & (spectrum > threshold))
+        frames = frames + lo
+        keep = (frames >= block_start) & (frames < block_start + _BLOCK_FRAMES)
+        peaks.extend(zip(frames[keep].tolist(), bins[keep].tolist()))
+    peaks.sort()
+    return peaks
+
+
+def landmarks(audio: np.ndarray) -> np.ndarray:
+    """
+    16kHz mono 오디오의 landmark 지문
+
+    Returns:
+        np.ndarray: (N, 2) int64 배열 [해시, 앵커 프레임]
+    """
+    peaks = _peaks(audio)
+    pairs = []
+    for i, (t1, f1) in enumerate(peaks):
+        fanned = 0
+        for t2, f2 in peaks[i + 1:]:
+            dt = t2 - t1
+            if dt > _MAX_DT:
+                break
+            if dt == 0:
+                continue
+            pairs.append(((f1 << 15) | (f2 << 6) | dt, t1))
+            fanned += 1
+            if fanned >= _FAN_OUT:
+                break
+    if not pairs:
+        return np.zeros((0, 2), dtype=np.int64)
+    return np.asarray(pairs, dtype=np.int64)
+
+
+@dataclass
+class FingerprintMatch:
+    """이전에 색인된 오디오와 겹치는 구간"""
+    key: str
+    score: float
+    # 색인 오디오 시간 = 질의 오디오 시간 + offset
+    offset: float
+    start: float
+    end: float
+    stt: STTResponse
+
+
+@dataclass
+class FingerprintLookup:
+    """질의 오디오 지문과 재사용 가능한 전사 세그먼트"""
+    landmarks: np.ndarray
+    match: Optional[FingerprintMatch] = None
+    segments: Optional[List[dict]] = None
+
+    @property
+    def language(self) -> Optional[str]:
+        return self.match.stt.language if self.match else None
+
+    def remaining_map(self, duration: float, speech_map: Optional[SpeechMap]) -> Optional[SpeechMap]:
+        """
+        재사용 구간을 뺀, 새로 전사해야 하는 구간
+
+        Args:
+            duration: 질의 오디오 길이 (초)
+            speech_map: 발화 구간 (없으면 전체를 발화로 봄)
+
+        Returns:
+            Optional[SpeechMap]: 새로 전사할 구간 (재사용할 세그먼트가 없으면 speech_map 그대로)
+        """
+        if not self.segments:
+            return speech_map
+        covered_start = self.segments[0]["start"]
+        covered_end = max(segment["end"] for segment in self.segments)
+        base = speech_map.spans if speech_map else [(0.0, duration)]
+        spans = []
+        for start, end in base:
+            for lo, hi in ((start, min(end, covered_start)), (max(start, covered_end), end)):
+                # 1초 미만의 자투리는 전사하지 않음
+                if hi - lo >= 1.0:
+                    spans.append((lo, hi))
+        return SpeechMap(duration=duration, spans=spans)
+
+
+class FingerprintIndex:
+    """
+    전사된 오디오의 지문 색인
+
+    환경 변수
+      FINGERPRINT_ENABLED: 1이면 사용 (기본 비활성)
+      FINGERPRINT_DB_PATH: sqlite 파일 (기본 cache/fingerprint/index.sqlite3)
+      FINGERPRINT_MIN_MATCHES: 같은 시간 차이로 일치해야 하는 최소 해시 수 (기본 30)
+      FINGERPRINT_MIN_SCORE: 겹치는 구간 안에서 일치한 해시 비율 최소값 (기본 0.05)
+    """
+
+    _instance: Optional['FingerprintIndex'] = None
+    _lock = Lock()
+
+    def __init__(self):
+        self.enabled = os.getenv("FINGERPRINT_ENABLED", "0") == "1"
+        self.db_path = Path(os.getenv("FINGERPRINT_DB_PATH", "cache/fingerprint/index.sqlite3"))
+        self.min_matches = int(os.getenv("FINGERPRINT_MIN_MATCHES", "30"))
+        self.min_score = float(os.getenv("FINGERPRINT_MIN_SCORE", "0.05"))
+        self._db_lock = Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.stats = {"lookups": 0, "matches": 0, "reused_seconds": 0.0}
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS audio ("
+                "id INTEGER PRIMARY KEY, key TEXT UNIQUE, duration REAL, "
+                "model_size TEXT, transcript TEXT, created REAL)"
+            )
+            conn.execute("CREATE TABLE IF NOT EXISTS hashes (hash INTEGER, audio_id INTEGER, t INTEGER)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_hashes_hash ON hashes(hash)")
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def audio_key(file_path: str) -> str:
+        """downloads/<video_id>.wav -> video_id"""
+        return Path(file_path).stem
+
+    # ---------------- 조회 ---------------- #
+    def find_match(self, query: np.ndarray) -> Optional[FingerprintMatch]:
+        """
+        질의 지문과 가장 많이 겹치는 색인 오디오
+
+        Args:
+            query: landmarks() 결과
+
+        Returns:
+            Optional[FingerprintMatch]: 기준을 넘는 일치가 없으면 None
+        """
+        if len(query) == 0:
+            return None
+        with self._db_lock:
+            conn = self._connect()
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS query (hash INTEGER, t INTEGER)")
+            conn.execute("DELETE FROM query")
+            conn.executemany("INSERT INTO query VALUES (?, ?)", query.tolist())
+            rows = conn.execute(
+                "SELECT h.audio_id, h.t - q.t, q.t FROM query q JOIN hashes h ON h.hash = q.hash"
+            ).fetchall()
+            conn.execute("DELETE FROM query")
+        if len(rows) < self.min_matches:
+            return None
+
+        hits = np.asarray(rows, dtype=np.int64)
+        # (오디오, 시간 차이)별 일치 수 (재인코딩으로 한 프레임 어긋난 해시도 같은 차이로 봄)
+        pairs, counts = np.unique(hits[:, :2], axis=0, return_counts=True)
+        lookup = {(int(a), int(d)): int(c) for (a, d), c in zip(pairs, counts)}
+        smoothed = [
+            c + lookup.get((a, d - 1), 0) + lookup.get((a, d + 1), 0)
+            for (a, d), c in lookup.items()
+        ]
+        best = int(np.argmax(smoothed))
+        (audio_id, delta), matched = list(lookup.keys())[best], smoothed[best]
+        if matched < self.min_matches:
+            return None
+
+        aligned = hits[(hits[:, 0] == audio_id) & (np.abs(hits[:, 1] - delta) <= 1)]
+        start_frame, end_frame = int(aligned[:, 2].min()), int(aligned[:, 2].max())
+        in_span = np.count_nonzero((query[:, 1] >= start_frame) & (query[:, 1] <= end_frame))
+        score = min(1.0, matched / max(1, in_span))
+        if score < self.min_score:
+            return None
+
+        with self._db_lock:
+            row = self._connect().execute(
+                "SELECT key, transcript FROM audio WHERE id = ?", (audio_id,)
+            ).fetchone()
+        if row is None or not row[1]:
+            return None
+        return FingerprintMatch(
+            key=row[0],
+            score=round(score, 3),
+            offset=delta * FRAME_SECONDS,
+            start=start_frame * FRAME_SECONDS,
+            end=(end_frame + _MAX_DT) * FRAME_SECONDS,
+            stt=STTResponse(**json.loads(row[1])),
+        )
+
+    @staticmethod
+    def _reusable_segments(match: FingerprintMatch, duration: float) -> List[dict]:
+        """색인 전사 중 질의 오디오의 겹치는 구간에 들어오는 세그먼트 (질의 시간으로 이동)"""
+        segments = []
+        for segment in match.stt.segments:
+            start, end = segment.start - match.offset, segment.end - match.offset
+            # 겹치는 구간 밖으로 0.5초 이상 나가는 세그먼트는 잘린 발화일 수 있어 다시 전사
+            if start < max(0.0, match.start - 0.5) or end > min(duration, match.end + 0.5):
+                continue
+            segments.append({"start": round(max(0.0, start), 3), "end": round(min(duration, end), 3),
+                             "text": segment.text})
+        return segments
+
+    async def lookup(self, audio: np.ndarray, file_path: str, model_size: str) -> Optional[FingerprintLookup]:
+        """
+        오디오 지문을 만들고 재사용할 수 있는 이전 전사 조회
+
+        Args:
+            audio: 16kHz mono 오디오
+            file_path: 오디오 파일 경로 (로그용)
+            model_size: 요청 모델 크기 (색인 전사의 모델이 이보다 작으면 재사용하지 않음)
+
+        Returns:
+            Optional[FingerprintLookup]: 비활성화 시 None, 그 외에는 지문(+ 일치 결과)
+        """
+        if not self.enabled:
+            return None
+        duration = len(audio) / SAMPLE_RATE
+        with stage("fingerprint"):
+            query = await asyncio.to_thread(landmarks, audio)
+            try:
+                match = await asyncio.to_thread(self.find_match, query)
+            except Exception as e:
+                print(f"[WARN] Fingerprint lookup failed: {e}")
+                match = None
+
+        self.stats["lookups"] += 1
+        tiers = TierPolicy.get_instance().tiers
+        if match is not None and match.stt.model_size in tiers and model_size in tiers \
+                and tiers.index(match.stt.model_size) < tiers.index(model_size):
+            print(f"Fingerprint match {match.key} was transcribed with a smaller model - not reused")
+            match = None
+        result = FingerprintLookup(landmarks=query, match=match)
+        if match is not None:
+            result.segments = self._reusable_segments(match, duration) or None
+        record_cache("fingerprint", hit=bool(result.segments))
+        if result.segments:
+            reused = result.segments[-1]["end"] - result.segments[0]["start"]
+            self.stats["matches"] += 1
+            self.stats["reused_seconds"] += reused
+            print(f"Fingerprint match for {self.audio_key(file_path)}: {match.key} "
+                  f"(score {match.score}, offset {match.offset:+.2f}s), "
+                  f"reusing {len(result.segments)} segments / {reused:.1f}s")
+        return result
+
+    # ---------------- 등록 ---------------- #
+    def register(self, file_path: str, query: np.ndarray, duration: float, stt: STTResponse):
+        """최종 전사 결과와 지문을 색인에 저장 (같은 키는 교체)"""
+        key = self.audio_key(file_path)
+        with self._db_lock:
+            conn = self._connect()
+            with conn:
+                row = conn.execute("SELECT id FROM audio WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    conn.execute("DELETE FROM hashes WHERE audio_id = ?", (row[0],))
+                    conn.execute("DELETE FROM audio WHERE id = ?", (row[0],))
+                cursor = conn.execute(
+                    "INSERT INTO audio (key, duration, model_size, transcript, created) VALUES (?, ?, ?, ?, ?)",
+                    (key, duration, stt.model_size, json.dumps(stt.dict(), ensure_ascii=False), time.time()),
+                )
+                audio_id = cursor.lastrowid
+                conn.executemany(
+                    "INSERT INTO hashes (hash, audio_id, t) VALUES (?, ?, ?)",
+                    ((int(h), audio_id, int(t)) for h, t in query),
+                )
+
+    def get_info(self) -> dict:
+        info = {"enabled": self.enabled, **{k: round(v, 1) if isinstance(v, float) else v for k, v in self.stats.items()}}
+        if self.enabled and self.db_path.exists():
+            with self._db_lock:
+                info["indexed_audio"] = self._connect().execute("SELECT COUNT(*) FROM audio").fetchone()[0]
+        return info
+
+    @classmethod
+    def get_instance(cls) -> 'FingerprintIndex':
+        """싱글톤 인스턴스 반환"""
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
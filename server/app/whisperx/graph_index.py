@@ -0,0 +1,150 @@
+"""
+색인된 논증 그래프
+
+노드/엣지를 추가할 때 id→노드 맵, 관계별 인접 리스트, 유형별 개수, CLAIM-EVIDENCE 매핑을 함께 갱신해
+요약/매핑 조회 때마다 노드와 엣지를 다시 훑지 않도록 함
+"""
+
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+from app.whisperx.schemas import ArgumentGraph, ClassifiedSegment, GraphEdge, SentenceType
+
+# CLAIM-EVIDENCE 매핑에 포함할 관계 (FACT가 CLAIM을 지지하거나 관련됨)
+EVIDENCE_RELATIONSHIPS = ("supports", "relates")
+
+
+class IndexedArgumentGraph:
+    """
+    논증 그래프 + 증분 색인
+
+    Attributes:
+        nodes: 추가 순서의 노드
+        edges: 추가 순서의 엣지
+        node_by_id: 노드 id -> 노드
+        adjacency: 관계 유형 -> source id -> target id 목록
+        type_counts: 노드 유형별 개수
+        relationship_counts: 관계 유형별 엣지 개수
+    """
+
+    def __init__(self, nodes: Iterable[ClassifiedSegment] = (), edges: Iterable[GraphEdge] = ()):
+        self.nodes: List[ClassifiedSegment] = []
+        self.edges: List[GraphEdge] = []
+        self.node_by_id: Dict[str, ClassifiedSegment] = {}
+        self.adjacency: Dict[str, Dict[str, List[str]]] = {}
+        self.type_counts: Counter = Counter()
+        self.relationship_counts: Dict[str, int] = {}
+        self._confidence_sum = 0.0
+        # CLAIM id -> EVIDENCE(FACT) id 목록 (엣지 추가 순서)
+        self._claim_evidence: Dict[str, List[str]] = {}
+        self._evidence_uses: Counter = Counter()
+        for node in nodes:
+            self.add_node(node)
+        for edge in edges:
+            self.add_edge(edge)
+
+    @classmethod
+    def from_graph(cls, graph: ArgumentGraph) -> 'IndexedArgumentGraph':
+        return cls(graph.nodes, graph.edges)
+
+    # ---------------- 갱신 ---------------- #
+    def add_node(self, node: ClassifiedSegment):
+        self.nodes.append(node)
+        self.node_by_id[node.id] = node
+        self.type_counts[node.classification] += 1
+
+    def add_edge(self, edge: GraphEdge):
+        self.edges.append(edge)
+        self.adjacency.setdefault(edge.relationship, {}).setdefault(edge.source_id, []).append(edge.target_id)
+        self.relationship_counts[edge.relationship] = self.relationship_counts.get(edge.relationship, 0) + 1
+        self._confidence_sum += edge.confidence
+
+        if edge.relationship not in EVIDENCE_RELATIONSHIPS:
+            return
+        source_type = self._type_of(edge.source_id)
+        target_type = self._type_of(edge.target_id)
+        if source_type == SentenceType.FACT and target_type == SentenceType.CLAIM:
+            claim_id, evidence_id = edge.target_id, edge.source_id
+        elif source_type == SentenceType.CLAIM and target_type == SentenceType.FACT:
+            # CLAIM이 FACT를 지지 (역방향 - 일반적이지 않지만 처리)
+            claim_id, evidence_id = edge.source_id, edge.target_id
+        else:
+            return
+        self._claim_evidence.setdefault(claim_id, []).append(evidence_id)
+        self._evidence_uses[evidence_id] += 1
+
+    def _type_of(self, node_id: str) -> Optional[SentenceType]:
+        node = self.node_by_id.get(node_id)
+        return node.classification if node is not None else None
+
+    # ---------------- 조회 ---------------- #
+    @property
+    def graph(self) -> ArgumentGraph:
+        """응답/캐시용 ArgumentGraph (노드/엣지 리스트 공유)"""
+        return ArgumentGraph(nodes=self.nodes, edges=self.edges)
+
+    def neighbors(self, node_id: str, relationship: str) -> List[str]:
+        """node_id에서 relationship 관계로 나가는 target id 목록"""
+        return self.adjacency.get(relationship, {}).get(node_id, [])
+
+    def summary(self) -> dict:
+        """generate_graph_summary와 같은 형식의 요약"""
+        return {
+            "total_segments": len(self.nodes),
+            "claims": self.type_counts[SentenceType.CLAIM],
+            "facts": self.type_counts[SentenceType.FACT],
+            "relationships": len(self.edges),
+            "relationship_types": dict(self.relationship_counts),
+            "avg_confidence": self._confidence_sum / len(self.edges) if self.edges else 0.0,
+        }
+
+    def claim_evidence_mapping(self) -> Dict[str, List[str]]:
+        """CLAIM id -> 해당 CLAIM을 지지/관련하는 FACT id 목록"""
+        return {claim_id: list(evidence_ids) for claim_id, evidence_ids in self._claim_evidence.items()}
+
+    def claim_evidence_summary(self) -> dict:
+        """get_claim_evidence_summary와 같은 형식의 요약"""
+        claims = self.type_counts[SentenceType.CLAIM]
+        facts = self.type_counts[SentenceType.FACT]
+        supported_claims = sum(1 for evidence_ids in self._claim_evidence.values() if evidence_ids)
+        used_evidences = len(self._evidence_uses)
+        return {
+            "total_claims": claims,
+            "total_facts": facts,
+            "supported_claims": supported_claims,
+            "unsupported_claims": claims - supported_claims,
+            "used_evidences": used_evidences,
+            "unused_evidences": facts - used_evidences,
+            "claim_evidence_pairs": sum(self._evidence_uses.values()),
+            "claim_evidence_mapping": self.claim_evidence_mapping(),
+        }
+
+    def format_claim_evidence_text(self) -> str:
+        """CLAIM-EVIDENCE 관계 텍스트 (로그/디버깅용, 요청할 때만 생성)"""
+        def _text(node_id: str) -> str:
+            node = self.node_by_id.get(node_id)
+            return node.text if node is not None else "Unknown"
+
+        result = ["=== CLAIM-EVIDENCE 관계 ===\n"]
+        for claim_id, evidence_ids in self._claim_evidence.items():
+            result.append(f"주장 ({claim_id}): {_text(claim_id)}")
+            if evidence_ids:
+                result.append("  지지 근거:")
+                for evidence_id in evidence_ids:
+                    result.append(f"    - ({evidence_id}): {_text(evidence_id)}")
+            else:
+                result.append("  지지 근거: 없음")
+            result.append("")
+
+        # 지지받지 못한 CLAIM들
+        unsupported_claims = [
+            node.id for node in self.nodes
+            if node.classification == SentenceType.CLAIM and node.id not in self._claim_evidence
+        ]
+        if unsupported_claims:
+            result.append("=== 지지받지 못한 주장들 ===")
+            for claim_id in unsupported_claims:
+                result.append(f"주장 ({claim_id}): {_text(claim_id)}")
+            result.append("")
+
+        return "\n".join(result)
@@ -5,7 +5,7 @@ CLAIM과 FACT 간의 관계를 분석하여 그래프로 구성
 
 import re
 import os
-from typing import List, Tuple
+from typing import List, Optional, Tuple, Union
 # from google import genai
 import google.generativeai as genai
 from app.whisperx.schemas import (
@@ -15,6 +15,11 @@ from app.whisperx.schemas import (
     SentenceType
 )
 from app.whisperx.system_prompt import RELATIONSHIP_PROMPT
+from app.whisperx.similarity import candidate_pairs
+from app.whisperx.graph_index import IndexedArgumentGraph
+from app.whisperx.cache_service import GraphReuse
+from app.llm.resilience import estimate_tokens, resilient_call
+from app.llm.backends import get_llm_backend
 
 class ArgumentGraphService:
     def __init__(self, key):
@@ -58,14 +63,17 @@ class ArgumentGraphService:
                 두 문장 간의 관계를 분석해주세요.
             """
 
-            response = self.client.models.generate_content(
-                model=os.getenv("GEMINI_MODEL"),
-                contents=prompt
+            model_id = os.getenv("GEMINI_MODEL")
+            backend = get_llm_backend()
+
+            # provider rate limit / 재시도 / 서킷 브레이커 적용
+            result_text = await resilient_call(
+                "gemini",
+                model_id,
+                lambda: backend.generate_text(model_id, prompt),
+                estimate_tokens(prompt),
             )
             
-            # 응답 파싱
-            result_text = response.text
-            
             # 관계 추출
             relationship_match = re.search(r'관계:\s*(supports|contradicts|relates|none)', result_text)
             relationship = relationship_match.group(1) if relationship_match else "none"
@@ -95,8 +103,28 @@ class ArgumentGraphService:
         Returns:
             ArgumentGraph: 구성된 논증 그래프
         """
+        indexed = await self.build_indexed_argument_graph(segments, classification_results)
+        return indexed.graph
+    
+    async def build_indexed_argument_graph(
+        self, 
+        segments: List[dict], 
+        classification_results: List[str],
+        reuse: Optional[GraphReuse] = None
+    ) -> IndexedArgumentGraph:
+        """
+        논증 그래프를 구성하면서 요약/CLAIM-EVIDENCE 색인을 함께 갱신
+        
+        Args:
+            segments: 원본 세그먼트들
+            classification_results: Gemini 분류 결과들
+            reuse: 겹치는 구간의 이전 그래프 (이미 분석한 쌍은 관계 분석 생략)
+            
+        Returns:
+            IndexedArgumentGraph: 색인된 논증 그래프
+        """
         # 분류된 세그먼트 노드 생성
-        nodes = []
+        graph = IndexedArgumentGraph()
         for i, (segment, classification_text) in enumerate(zip(segments, classification_results)):
             classification = self.parse_classification_result(classification_text)
             
@@ -107,60 +135,40 @@ class ArgumentGraphService:
                 text=segment.text,
                 classification=classification
             )
-            nodes.append(node)
+            graph.add_node(node)
         
-        # 엣지 생성 (모든 노드 쌍에 대해 관계 분석)
-        edges = []
-        
-        # 인접한 세그먼트들과 CLAIM-FACT 쌍들에 대해서만 관계 분석
-        for i in range(len(nodes)):
-            for j in range(i+1, min(i+3, len(nodes))):  # 최대 2개 뒤까지만 확인
-                node1, node2 = nodes[i], nodes[j]
-                
-                # CLAIM과 FACT 간의 관계만 분석 (또는 인접한 세그먼트)
-                should_analyze = (
-                    (node1.classification != node2.classification) or  # 다른 타입
-                    (j == i + 1)  # 인접한 세그먼트
+        # 엣지 생성: 인접한 세그먼트들과 가까운 CLAIM-FACT 쌍 (+ GRAPH_LONG_RANGE=1 이면 의미가 가까운 장거리 쌍)
+        nodes = graph.nodes
+        for i, j in candidate_pairs(nodes):
+            node1, node2 = nodes[i], nodes[j]
+            known = reuse.relationship(node1.text, node2.text) if reuse is not None else None
+            if known is not None:
+                relationship, confidence = known
+            else:
+                relationship, confidence = await self.analyze_relationship(node1, node2)
+            
+            # 의미있는 관계만 엣지로 추가
+            if relationship != "none" and confidence > 0.3:
+                edge = GraphEdge(
+                    source_id=node1.id,
+                    target_id=node2.id,
+                    relationship=relationship,
+                    confidence=confidence
                 )
-                
-                if should_analyze:
-                    relationship, confidence = await self.analyze_relationship(node1, node2)
-                    
-                    # 의미있는 관계만 엣지로 추가
-                    if relationship != "none" and confidence > 0.3:
-                        edge = GraphEdge(
-                            source_id=node1.id,
-                            target_id=node2.id,
-                            relationship=relationship,
-                            confidence=confidence
-                        )
-                        edges.append(edge)
+                graph.add_edge(edge)
         
-        return ArgumentGraph(nodes=nodes, edges=edges)
+        return graph
     
-    def generate_graph_summary(self, graph: ArgumentGraph) -> dict:
+    def generate_graph_summary(self, graph: Union[ArgumentGraph, IndexedArgumentGraph]) -> dict:
         """
         그래프 분석 요약 생성
         
         Args:
-            graph: 논증 그래프
+            graph: 논증 그래프 (색인된 그래프면 다시 훑지 않고 카운터에서 바로 계산)
             
         Returns:
             dict: 분석 요약
         """
-        claims = [node for node in graph.nodes if node.classification == SentenceType.CLAIM]
-        facts = [node for node in graph.nodes if node.classification == SentenceType.FACT]
-        
-        # 관계 유형별 통계
-        relationship_counts = {}
-        for edge in graph.edges:
-            relationship_counts[edge.relationship] = relationship_counts.get(edge.relationship, 0) + 1
-        
-        return {
-            "total_segments": len(graph.nodes),
-            "claims": len(claims),
-            "facts": len(facts),
-            "relationships": len(graph.edges),
-            "relationship_types": relationship_counts,
-            "avg_confidence": sum(edge.confidence for edge in graph.edges) / len(graph.edges) if graph.edges else 0.0
-        }
\ No newline at end of file
+        if not isinstance(graph, IndexedArgumentGraph):
+            graph = IndexedArgumentGraph.from_graph(graph)
+        return graph.summary()
@@ -0,0 +1,107 @@
+"""
+전사 전 언어 식별
+
+오디오 앞부분만으로 Whisper 언어 감지를 먼저 실행해
+- 전사 시 언어를 지정 (파이프라인이 자체 감지를 다시 하지 않음)
+- 정렬 모델을 전사와 동시에 미리 로드할 수 있게 함
+결과는 영상(오디오 파일 이름) 단위로 캐시
+"""
+
+import asyncio
+import json
+import os
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Optional
+
+from app.metrics import record_cache
+from app.timing import stage
+from app.whisperx.audio_utils import SAMPLE_RATE
+
+
+class LanguageIdentifier:
+    """
+    영상별 언어 식별 + 캐시
+
+    환경 변수
+      LANGID_ENABLED: 0이면 사용 안 함 (기본 1)
+      LANGID_SECONDS: 언어 감지에 쓸 앞부분 길이 (기본 30초, Whisper 입력 창 길이)
+      LANGID_CACHE_PATH: 캐시 파일 (기본 cache/langid/languages.json)
+    """
+
+    _instance: Optional['LanguageIdentifier'] = None
+    _lock = Lock()
+
+    def __init__(self):
+        self.enabled = os.getenv("LANGID_ENABLED", "1") == "1"
+        self.seconds = float(os.getenv("LANGID_SECONDS", "30"))
+        self.cache_path = Path(os.getenv("LANGID_CACHE_PATH", "cache/langid/languages.json"))
+        self._languages: Dict[str, str] = {}
+        self._cache_lock = Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                self._languages = json.load(f)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"언어 식별 캐시 로드 오류: {e}")
+
+    def _save(self):
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.cache_path, 'w', encoding='utf-8') as f:
+                json.dump(self._languages, f, ensure_ascii=False)
+        except Exception as e:
+            print(f"언어 식별 캐시 저장 오류: {e}")
+
+    @staticmethod
+    def video_key(file_path: str) -> str:
+        """downloads/<video_id>.wav -> video_id"""
+        return Path(file_path).stem
+
+    def get_cached(self, file_path: str) -> Optional[str]:
+        return self._languages.get(self.video_key(file_path))
+
+    async def identify(self, model, audio, file_path: str) -> Optional[str]:
+        """
+        오디오 앞부분으로 언어 감지
+
+        Args:
+            model: WhisperX FasterWhisperPipeline
+            audio: 16kHz mono 오디오
+            file_path: 오디오 파일 경로 (캐시 키)
+
+        Returns:
+            Optional[str]: 언어 코드 (비활성화 또는 감지 실패 시 None)
+        """
+        if not self.enabled:
+            return None
+        cached = self.get_cached(file_path)
+        record_cache("langid", hit=cached is not None)
+        if cached:
+            return cached
+
+        head = audio[:int(self.seconds * SAMPLE_RATE)]
+        try:
+            with stage("language_id"):
+                language = await asyncio.to_thread(model.detect_language, head)
+        except Exception as e:
+            print(f"[WARN] Language identification failed: {e}")
+            return None
+
+        with self._cache_lock:
+            self._languages[self.video_key(file_path)] = language
+            self._save()
+        return language
+
+    @classmethod
+    def get_instance(cls) -> 'LanguageIdentifier':
+        """싱글톤 인스턴스 반환"""
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
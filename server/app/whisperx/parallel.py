@@ -0,0 +1,242 @@
+"""
+긴 오디오 병렬 전사 (CPU 전용 노드용)
+
+오디오를 무음 경계에서 청크로 나누고, 각자 WhisperX 모델을 가진 프로세스 풀 worker들이
+청크를 나눠 전사(선택적으로 정렬까지)한 뒤 타임스탬프 순서로 이어 붙임
+worker마다 모델을 따로 올리므로 메모리는 worker 수만큼 늘어남 (large-v2 int8 기준 worker당 ~2GB)
+"""
+
+import asyncio
+import multiprocessing
+import os
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from threading import Lock
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.whisperx.audio_utils import SAMPLE_RATE, split_on_silence
+
+# ---------------- worker 프로세스 ---------------- #
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_worker(model_size: str, compute_type: str, threads: int):
+    """worker 시작 시 intra-op 스레드 수를 고정하고 모델 로드"""
+    os.environ["OMP_NUM_THREADS"] = str(threads)
+    import torch
+    import whisperx
+
+    torch.set_num_threads(threads)
+    _worker_state["model"] = whisperx.load_model(
+        model_size, "cpu", compute_type=compute_type, threads=threads
+    )
+    _worker_state["align_models"] = {}
+
+
+def _shift(segments: List[dict], offset: float) -> List[dict]:
+    """청크 기준 타임스탬프를 원본 오디오 기준으로 이동"""
+    for segment in segments:
+        for key in ("start", "end"):
+            if segment.get(key) is not None:
+                segment[key] = round(segment[key] + offset, 3)
+        for word in segment.get("words", []):
+            for key in ("start", "end"):
+                if word.get(key) is not None:
+                    word[key] = round(word[key] + offset, 3)
+    return segments
+
+
+def _transcribe_chunk(audio: np.ndarray, offset: float, language: Optional[str],
+                      batch_size: int, align: bool) -> dict:
+    """worker에서 청크 하나 전사 (+ 정렬)"""
+    import whisperx
+
+    result = _worker_state["model"].transcribe(audio, batch_size=batch_size, language=language)
+    detected = result.get("language", language)
+    segments = result.get("segments", [])
+    aligned = False
+
+    if align and segments:
+        try:
+            align_models = _worker_state["align_models"]
+            if detected not in align_models:
+                align_models[detected] = whisperx.load_align_model(language_code=detected, device="cpu")
+            align_model, metadata = align_models[detected]
+            segments = whisperx.align(
+                segments, align_model, metadata, audio, "cpu", return_char_alignments=False
+            )["segments"]
+            aligned = True
+        except Exception as e:
+            print(f"[WARN] Chunk alignment failed at {offset:.1f}s: {e}")
+
+    return {"language": detected, "segments": _shift(segments, offset), "aligned": aligned}
+
+
+# ---------------- 메인 프로세스 ---------------- #
+class ParallelTranscriber:
+    """
+    청크 병렬 전사기
+
+    환경 변수
+      WHISPERX_PARALLEL: 1이면 사용 (기본 비활성, CPU 장치에서만 동작)
+      WHISPERX_PARALLEL_MIN_SECONDS: 이 길이 이상인 오디오만 병렬 처리 (기본 600초)
+      WHISPERX_PARALLEL_WORKERS: worker 프로세스 수 (기본 코어 수 / 4)
+      WHISPERX_WORKER_THREADS: worker당 CTranslate2/torch 스레드 수 (기본 코어 수 / worker 수)
+      WHISPERX_CHUNK_SECONDS: 목표 청크 길이 (기본 0 = worker당 2개 청크가 되도록 60~600초 사이 자동)
+      WHISPERX_PARALLEL_ALIGN: 1이면 worker에서 청크별 정렬까지 수행 (기본 1)
+      WHISPERX_PARALLEL_MAX_POOLS: 동시에 유지할 모델별 worker 풀 수 (기본 1, 사용 중인 풀은 내리지 않음)
+    """
+
+    _instance: Optional['ParallelTranscriber'] = None
+    _lock = Lock()
+
+    def __init__(self):
+        cpu_count = os.cpu_count() or 1
+        self.enabled = os.getenv("WHISPERX_PARALLEL", "0") == "1"
+        self.min_seconds = float(os.getenv("WHISPERX_PARALLEL_MIN_SECONDS", "600"))
+        self.workers = int(os.getenv("WHISPERX_PARALLEL_WORKERS", str(max(1, cpu_count // 4))))
+        self.threads = int(os.getenv("WHISPERX_WORKER_THREADS", str(max(1, cpu_count // self.workers))))
+        self.chunk_seconds = float(os.getenv("WHISPERX_CHUNK_SECONDS", "0"))
+        self.align = os.getenv("WHISPERX_PARALLEL_ALIGN", "1") == "1"
+        self.max_pools = max(1, int(os.getenv("WHISPERX_PARALLEL_MAX_POOLS", "1")))
+        # (model_size, compute_type) -> worker 풀 (최근 사용 순)
+        self._pools: "OrderedDict[tuple, ProcessPoolExecutor]" = OrderedDict()
+        self._in_use: Counter = Counter()
+        self._pool_lock = Lock()
+
+    def should_use(self, duration_seconds: float, device: str) -> bool:
+        """병렬 전사 대상 여부 (GPU는 단일 프로세스 배치가 더 효율적이라 제외)"""
+        return self.enabled and device == "cpu" and self.workers > 1 and duration_seconds >= self.min_seconds
+
+    def _acquire_pool(self, model_size: str, compute_type: str) -> ProcessPoolExecutor:
+        """
+        모델 크기별 worker 풀을 빌림 (_release_pool로 반환)
+
+        티어별로 다른 모델 크기가 동시에 요청돼도 서로의 풀을 내리지 않도록 풀을 모델별로 두고,
+        MAX_POOLS를 넘으면 사용 중이 아닌 풀만 오래된 순으로 종료
+        """
+        key = (model_size, compute_type)
+        with self._pool_lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                print(f"Starting {self.workers} WhisperX workers ({model_size}, {self.threads} threads each)")
+                # torch/CTranslate2 상태를 fork로 복제하면 교착될 수 있어 spawn 사용
+                pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(model_size, compute_type, self.threads),
+                )
+                self._pools[key] = pool
+            self._pools.move_to_end(key)
+            self._in_use[key] += 1
+            self._prune_pools()
+            return pool
+
+    def _release_pool(self, model_size: str, compute_type: str):
+        with self._pool_lock:
+            key = (model_size, compute_type)
+            self._in_use[key] -= 1
+            if self._in_use[key] <= 0:
+                del self._in_use[key]
+            self._prune_pools()
+
+    def _prune_pools(self):
+        """풀 수가 MAX_POOLS를 넘으면 사용 중이 아닌 풀부터 종료 (_pool_lock 안에서 호출)"""
+        for key in list(self._pools):
+            if len(self._pools) <= self.max_pools:
+                break
+            if self._in_use[key] > 0:
+                continue
+            print(f"Stopping WhisperX workers ({key[0]})")
+            self._pools.pop(key).shutdown(wait=False)
+
+    def _target_chunk_seconds(self, duration_seconds: float) -> float:
+        if self.chunk_seconds > 0:
+            return self.chunk_seconds
+        return min(600.0, max(60.0, duration_seconds / (self.workers * 2)))
+
+    async def transcribe(
+        self,
+        audio: np.ndarray,
+        language: Optional[str],
+        model_size: str,
+        compute_type: str,
+        batch_size: int = 16,
+        align: Optional[bool] = None,
+    ) -> Dict[str, Any]:
+        """
+        오디오를 청크로 나눠 병렬 전사
+
+        Args:
+            audio: 16kHz mono 오디오
+            language: 언어 코드 (None/"auto"면 청크별 자동 감지 후 다수결)
+            model_size: WhisperX 모델 크기
+            compute_type: CTranslate2 연산 타입
+            batch_size: worker 내부 배치 크기
+            align: 청크별 정렬 여부 (None이면 WHISPERX_PARALLEL_ALIGN 설정)
+
+        Returns:
+            Dict[str, Any]: model.transcribe 결과 형식 ({"segments", "language"} + "aligned", "chunks")
+        """
+        if language == "auto":
+            language = None
+        align = self.align if align is None else align
+        duration = len(audio) / SAMPLE_RATE
+        chunks = split_on_silence(audio, self._target_chunk_seconds(duration))
+        pool = self._acquire_pool(model_size, compute_type)
+        loop = asyncio.get_running_loop()
+
+        try:
+            results = await asyncio.gather(*(
+                loop.run_in_executor(
+                    pool, _transcribe_chunk,
+                    audio[start:end], start / SAMPLE_RATE, language, batch_size, align,
+                )
+                for start, end in chunks
+            ))
+        finally:
+            self._release_pool(model_size, compute_type)
+
+        segments = sorted(
+            (segment for result in results for segment in result["segments"]),
+            key=lambda segment: segment.get("start", 0.0),
+        )
+        languages = Counter(result["language"] for result in results if result["segments"])
+        return {
+            "segments": segments,
+            "language": language or (languages.most_common(1)[0][0] if languages else None),
+            "aligned": align and all(result["aligned"] for result in results if result["segments"]),
+            "chunks": len(chunks),
+        }
+
+    def shutdown(self):
+        """worker 풀 종료"""
+        with self._pool_lock:
+            for pool in self._pools.values():
+                pool.shutdown(wait=False, cancel_futures=True)
+            self._pools.clear()
+            self._in_use.clear()
+
+    def get_info(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "workers": self.workers,
+            "threads_per_worker": self.threads,
+            "min_seconds": self.min_seconds,
+            "chunk_seconds": self.chunk_seconds or "auto",
+            "align_per_chunk": self.align,
+            "max_pools": self.max_pools,
+            "pool_models": [model_size for model_size, _ in self._pools],
+        }
+
+    @classmethod
+    def get_instance(cls) -> 'ParallelTranscriber':
+        """싱글톤 인스턴스 반환"""
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
@@ -0,0 +1,128 @@
+"""
+전사 세그먼트 -> 문장 단위 세그먼트 재분할
+
+WhisperX 세그먼트는 한 문장이 여러 조각으로 나뉘거나 여러 문장이 합쳐져 있어
+분류/관계 추론 호출 수가 늘고 조각끼리의 관계를 묻게 됨
+문장부호(없으면 한국어 종결어미)로 문장 경계를 찾아 세그먼트를 합치고 나누며,
+시간은 단어 타임스탬프(정렬 결과가 있으면) 또는 글자 수 비율로 계산
+"""
+
+import re
+from dataclasses import dataclass
+from typing import List, Sequence
+
+from app.whisperx.schemas import TranscriptionSegment
+
+# 문장 끝 문장부호 (닫는 따옴표/괄호 포함)
+_TERMINAL_PUNCT = re.compile(r"[.?!。？！…]+[\"'”’」』)\]]*$")
+_ANY_TERMINAL_PUNCT = re.compile(r"[.?!。？！…]")
+# 마침표로 끝나도 문장 끝이 아닌 약어 (U.S., e.g., Dr., 이름 이니셜 J.)
+_ABBREVIATION = re.compile(r"^(?:[A-Za-z]\.){2,}$|^[A-Z]\.$")
+_ABBREVIATION_WORDS = {"mr.", "mrs.", "ms.", "dr.", "prof.", "st.", "jr.", "sr.", "vs.", "etc.", "no.", "inc.", "co.", "ltd."}
+
+# 문장부호가 없는 전사에서 쓸 한국어 종결어미 (어절 끝, 용언 활용형만)
+# 하십시오체/해요체: 니다, 니까, 어요/아요/여요, 이에요/예요, 세요/네요/군요/죠 등
+_KOREAN_ENDING = re.compile(
+    r"(?:니다|니까|[어아여워와봐줘져해돼]요|[이에예]요|(?:세|네|군|지|데|래|대|까|나|거든|잖아)요|죠)~?$"
+)
+# 해라체 "-다"는 앞 글자가 용언 어간/선어말어미일 때만 (했다, 겠다, 한다, 먹는다, 중요하다, 없다)
+# 받침 ㅆ(과거/미래), ㄴ(현재 -ㄴ다/-는다)이거나 자주 쓰는 어간인 경우
+_PLAIN_ENDING = re.compile(r"([가-힣])다~?$")
+_PLAIN_ENDING_STEMS = set("하이없않같많좋싫크작높낮맞싶적쉽렵롭")
+_HANGUL_BASE = 0xAC00
+_FINAL_SSANGSIOS = 20
+_FINAL_NIEUN = 4
+# 종결어미처럼 끝나지만 명사/부사인 어절
+_NOT_ENDINGS = {"판다", "과다", "최다", "사이다"}
+# 이보다 짧은 문장은 다음 문장과 합침 (추임새, "네." 같은 짧은 응답)
+MIN_SENTENCE_CHARS = 8
+# 종결이 없어도 이 길이를 넘으면 문장을 끊음
+MAX_SENTENCE_CHARS = 200
+# 어절 사이 쉼이 이보다 길면 문장 경계로 봄 (초)
+MAX_PAUSE_SECONDS = 1.5
+
+
+@dataclass
+class _Token:
+    text: str
+    start: float
+    end: float
+    # 세그먼트에 문장부호가 전혀 없으면 종결어미로 문장 끝을 판단
+    use_endings: bool
+
+
+def _tokens(segment) -> List[_Token]:
+    """세그먼트를 시간이 붙은 어절로 분해 (단어 타임스탬프가 없으면 글자 수 비율로 보간)"""
+    text = (segment.text or "").strip()
+    if not text:
+        return []
+    use_endings = _ANY_TERMINAL_PUNCT.search(text) is None
+
+    words = getattr(segment, "words", None) or []
+    if words and all(w.start is not None and w.end is not None for w in words):
+        return [_Token(w.word.strip(), w.start, w.end, use_endings) for w in words if w.word.strip()]
+
+    parts = text.split()
+    total = sum(len(p) for p in parts) or 1
+    span = max(0.0, segment.end - segment.start)
+    tokens, consumed = [], 0
+    for part in parts:
+        start = segment.start + span * consumed / total
+        consumed += len(part)
+        tokens.append(_Token(part, start, segment.start + span * consumed / total, use_endings))
+    return tokens
+
+
+def _is_korean_ending(word: str) -> bool:
+    """어절이 한국어 종결형으로 끝나는지 (필요, 중요, 바다 같은 명사는 제외)"""
+    if word in _NOT_ENDINGS:
+        return False
+    if _KOREAN_ENDING.search(word):
+        return True
+    match = _PLAIN_ENDING.search(word)
+    if match is None:
+        return False
+    stem = match.group(1)
+    final = (ord(stem) - _HANGUL_BASE) % 28
+    return final in (_FINAL_SSANGSIOS, _FINAL_NIEUN) or stem in _PLAIN_ENDING_STEMS
+
+
+def _ends_sentence(token: _Token) -> bool:
+    if _TERMINAL_PUNCT.search(token.text):
+        word = token.text.rstrip("\"'”’」』)]")
+        return not (_ABBREVIATION.match(word) or word.lower() in _ABBREVIATION_WORDS)
+    return token.use_endings and _is_korean_ending(token.text)
+
+
+def resegment(segments: Sequence[TranscriptionSegment]) -> List[TranscriptionSegment]:
+    """
+    세그먼트를 문장 단위로 다시 나눔
+
+    Args:
+        segments: 전사 세그먼트 (AlignedSegment면 단어 타임스탬프 사용)
+
+    Returns:
+        List[TranscriptionSegment]: 문장 단위 세그먼트 (start/end는 원본 시간 기준)
+    """
+    sentences: List[TranscriptionSegment] = []
+    current: List[_Token] = []
+
+    def _flush():
+        if current:
+            sentences.append(TranscriptionSegment(
+                start=round(current[0].start, 3),
+                end=round(current[-1].end, 3),
+                text=" ".join(token.text for token in current),
+            ))
+            current.clear()
+
+    for segment in segments:
+        for token in _tokens(segment):
+            if current and token.start - current[-1].end > MAX_PAUSE_SECONDS:
+                _flush()
+            current.append(token)
+            length = sum(len(t.text) + 1 for t in current)
+            if (_ends_sentence(token) and length >= MIN_SENTENCE_CHARS) or length >= MAX_SENTENCE_CHARS:
+                _flush()
+    _flush()
+    return sentences
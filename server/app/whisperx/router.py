@@ -4,13 +4,22 @@ from fastapi import APIRouter, HTTPException, BackgroundTasks
 from app.whisperx.service import WhisperXService
 from app.whisperx.graph_service import ArgumentGraphService
 from app.whisperx.schemas import (
+    AlignmentResponse,
     STTRequest, 
     STTResponse, 
     STTWithGraphResponse,
     TranscriptionSegment
 )
 from app.whisperx.system_prompt import get_classification_prompt
-import google.generativeai as genai
+from app.whisperx.audio_utils import wav_duration
+from app.whisperx.tiering import TierPolicy
+from app.whisperx.resegment import resegment
+from app.whisperx.classifier import SegmentClassifier
+from app.artifacts import ArtifactEvictedError, ArtifactStore
+from app.llm.resilience import estimate_tokens, resilient_call
+from app.llm.backends import get_llm_backend
+from app.timing import stage
+from app.metrics import QUEUE_DEPTH, record_cache
 from typing import List, Optional
 from dotenv import load_dotenv
 
@@ -20,9 +29,16 @@ router = APIRouter()
 # 싱글톤 인스턴스 사용
 key = os.getenv("GEMINI_API_KEY")
 whisperx_service = WhisperXService.get_instance()
+artifacts = ArtifactStore.get_instance()
 graph_service = ArgumentGraphService(key=key)
 
-client = genai.configure(api_key=key)
+CLASSIFY_MODEL = "gemini-2.5-flash-lite"
+# 세그먼트 분류 동시 요청 수 상한 (긴 영상에서 Gemini rate limit 보호)
+CLASSIFY_CONCURRENCY = int(os.getenv("CLASSIFY_CONCURRENCY", "8"))
+# 세그먼트 텍스트가 같은(또는 일부 겹치는) 전사의 논증 그래프 재사용 여부 (기본 비활성)
+GRAPH_CACHE = os.getenv("GRAPH_CACHE", "0") == "1"
+# 분류 전에 세그먼트를 문장 단위로 재분할할지 여부 (기본 비활성)
+RESEGMENT = os.getenv("RESEGMENT", "0") == "1"
 
 async def get_classify_text(text: str):
     """
@@ -32,11 +48,15 @@ async def get_classify_text(text: str):
         system_prompt = get_classification_prompt()
         prompt = f"{system_prompt}\n\n분류할 텍스트:\n{text}"
         
-        response = client.models.generate_content(
-            model="gemini-2.5-flash-lite",
-            contents=prompt
+        backend = get_llm_backend()
+
+        # provider rate limit / 재시도 / 서킷 브레이커 적용
+        return await resilient_call(
+            "gemini",
+            CLASSIFY_MODEL,
+            lambda: backend.generate_text(CLASSIFY_MODEL, prompt),
+            estimate_tokens(prompt),
         )
-        return response.text
     except Exception as e:
         print(f"분류 오류: {e}")
         return "분류 실패"
@@ -47,25 +67,28 @@ async def transcribe_audio(request: STTRequest):
     오디오 파일을 텍스트로 변환하고 각 세그먼트를 분류
     """
     try:
-        # 기존 STT 변환 파일 체크
-        existing_result = exist_text_translate(request.file_path, request.language)
-        
-        if existing_result:
-            # 기존 결과 사용
-            result = existing_result
-        else:
-            # 새로 STT 변환 수행
-            result: STTResponse = await whisperx_service.transcribe_audio(
-                file_path=request.file_path,
-                language=request.language
-            )
-            
-            # 결과를 캐시에 저장
-            from app.whisperx.cache_service import STTCacheService
-            cache_service = STTCacheService()
-            cache_service.save_result(request.file_path, request.language, result)
-        
-        return result
+        # 처리 중에 보관소 용량 정리/전사 후 삭제로 오디오가 지워지지 않도록 pin
+        with artifacts.pin(request.file_path):
+            # 기존 STT 변환 파일 체크
+            existing_result = exist_text_translate(request.file_path, request.language)
+
+            if existing_result:
+                # 기존 결과 사용
+                result = existing_result
+            else:
+                # 새로 STT 변환 수행
+                result: STTResponse = await whisperx_service.transcribe_audio(
+                    file_path=request.file_path,
+                    language=request.language,
+                    model_size=TierPolicy.get_instance().select(wav_duration(request.file_path))
+                )
+
+                # 결과를 캐시에 저장
+                from app.whisperx.cache_service import STTCacheService
+                cache_service = STTCacheService()
+                cache_service.save_result(request.file_path, request.language, result)
+
+            return result
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -95,65 +118,107 @@ def exist_text_translate(file_path: str, language: str) -> Optional[STTResponse]
         cached_result = cache_service.get_cached_result(file_path, language)
         if cached_result:
             print("캐시된 STT 결과 사용")
+            record_cache("stt", hit=True)
             return cached_result
     
+    record_cache("stt", hit=False)
     print("기존 STT 변환 파일 없음 - 새로 변환 진행")
     return None
 
+def _graph_cache_config() -> dict:
+    """그래프 결과에 영향을 주는 설정 (그래프 캐시 키에 포함)"""
+    classifier = SegmentClassifier.get_instance()
+    return {
+        "classify_model": CLASSIFY_MODEL,
+        "relationship_model": os.getenv("GEMINI_MODEL"),
+        "resegment": RESEGMENT,
+        "long_range": os.getenv("GRAPH_LONG_RANGE", "0"),
+        "long_range_top_k": os.getenv("GRAPH_LONG_RANGE_TOP_K", "3"),
+        "long_range_min_similarity": os.getenv("GRAPH_LONG_RANGE_MIN_SIMILARITY", "0.2"),
+        "local_classifier": classifier.threshold if classifier.enabled else None,
+    }
+
 async def extract_transcribe_with_graph(result: STTResponse, segments: List[TranscriptionSegment]):
+    # 조각난/합쳐진 전사 세그먼트를 문장 단위로 정리 (그래프 노드 수 = 분류/관계 LLM 호출 수)
+    if RESEGMENT:
+        with stage("resegment"):
+            sentences = resegment(segments)
+        print(f"Resegmented {len(segments)} segments into {len(sentences)} sentences")
+        segments = sentences
+
+    # 같은 세그먼트로 만든 그래프가 있으면 재사용하고, 일부만 겹치면 겹치는 구간의 분류/관계만 재사용
+    # (GRAPH_CACHE=0 이면 항상 새로 생성)
+    from app.whisperx.cache_service import GraphCacheService
+    segment_texts = [seg.text for seg in segments]
+    graph_cache = GraphCacheService(config=_graph_cache_config()) if GRAPH_CACHE else None
+    reuse = None
+    if graph_cache is not None:
+        cached = graph_cache.get_cached_graph(segment_texts)
+        record_cache("graph", hit=cached is not None)
+        if cached:
+            return cached
+        reuse = graph_cache.find_overlapping_graph(segment_texts)
+
      # 각 세그먼트 분류
-    classification_tasks = [get_classify_text(seg.text) for seg in segments]
-    classification_results = await asyncio.gather(*classification_tasks)
-    
-    # 논증 그래프 구성
-    argument_graph = await graph_service.build_argument_graph(
-        segments, classification_results
-    )
-    
-    # CLAIM-EVIDENCE 매핑 생성
-    from app.whisperx.convert_claim_fact_mapped import (
-        convert_to_claim_evidence, 
-        get_claim_evidence_summary,
-        format_claim_evidence_text
-    )
+    semaphore = asyncio.Semaphore(CLASSIFY_CONCURRENCY)
+
+    waiting = QUEUE_DEPTH.labels(queue="classify_waiting")
+
+    async def _classify(text: str):
+        waiting.inc()
+        try:
+            await semaphore.acquire()
+        finally:
+            waiting.dec()
+        try:
+            return await get_classify_text(text)
+        finally:
+            semaphore.release()
+
+    # 겹치는 구간에서 이미 분류한 세그먼트와 로컬 분류기가 확신하는 세그먼트는 바로 분류하고 나머지만 LLM으로 보냄
+    classifier = SegmentClassifier.get_instance()
+    with stage("classify", segments=len(segments)):
+        classification_results: List[Optional[str]] = [None] * len(segment_texts)
+        if reuse is not None:
+            for i, text in enumerate(segment_texts):
+                known = reuse.classification(text)
+                if known is not None:
+                    classification_results[i] = known.value
+        unknown = [i for i, label in enumerate(classification_results) if label is None]
+        for i, label in zip(unknown, classifier.classify_batch([segment_texts[i] for i in unknown])):
+            classification_results[i] = label
+        pending = [i for i, label in enumerate(classification_results) if label is None]
+        llm_results = await asyncio.gather(*(_classify(segment_texts[i]) for i in pending))
+        for i, reply in zip(pending, llm_results):
+            classification_results[i] = reply
+    classifier.record([segment_texts[i] for i in pending], llm_results)
     
-    claim_evidence = convert_to_claim_evidence(argument_graph)
-    claim_evidence_summary = get_claim_evidence_summary(argument_graph)
-    claim_evidence_text = format_claim_evidence_text(argument_graph)
+    # 논증 그래프 구성 (요약/CLAIM-EVIDENCE 매핑 색인을 엣지 추가와 함께 갱신)
+    with stage("graph"):
+        indexed_graph = await graph_service.build_indexed_argument_graph(
+            segments, classification_results, reuse=reuse
+        )
+    argument_graph = indexed_graph.graph
     
-    # 결과 출력 (로깅용)
+    # 결과 출력 (로깅용, 텍스트는 필요할 때만 생성)
     # print("==== CLAIM-EVIDENCE 매핑 =====")
-    # print(claim_evidence_text)
-    
-    # 분석 요약 생성
-    summary = graph_service.generate_graph_summary(argument_graph)    
-    # print("=== 논증 그래프 분석 결과 ===")
-    # print(f"총 세그먼트: {summary['total_segments']}")
-    # print(f"주장(CLAIM): {summary['claims']}")
-    # print(f"사실(FACT): {summary['facts']}")
-    # print(f"관계: {summary['relationships']}")
-    # print(f"관계 유형: {summary['relationship_types']}")
-    # print(f"평균 신뢰도: {summary['avg_confidence']:.2f}")
+    # print(indexed_graph.format_claim_evidence_text())
     
-    # print("\n=== 그래프 노드 ===")
-    # for node in argument_graph.nodes:
-    #     print(f"{node.id} ({node.classification}): {node.text}")
-    
-    # print("\n=== 그래프 엣지 ===")
-    # for edge in argument_graph.edges:
-    #     print(f"{edge.source_id} --[{edge.relationship}({edge.confidence:.2f})]-> {edge.target_id}")
-
-    # 요약에 CLAIM-EVIDENCE 정보 추가
+    # 분석 요약 + CLAIM-EVIDENCE 정보
+    summary = graph_service.generate_graph_summary(indexed_graph)
     summary.update({
-        "claim_evidence_mapping": claim_evidence,
-        "claim_evidence_summary": claim_evidence_summary
+        "claim_evidence_mapping": indexed_graph.claim_evidence_mapping(),
+        "claim_evidence_summary": indexed_graph.claim_evidence_summary()
     })
    
-    return STTWithGraphResponse(
+    response = STTWithGraphResponse(
         full_text=result.full_text,
         argument_graph=argument_graph,
         summary=summary
     )
+    if graph_cache is not None:
+        graph_cache.save_graph(segment_texts, response)
+    return response
 
 async def extract_with_graph(request) -> STTWithGraphResponse:
     try:
@@ -173,24 +238,27 @@ async def transcribe_with_graph(request: STTRequest):
     오디오 파일을 텍스트로 변환하고 논증 그래프 생성
     """
     try:
-        # 기존 STT 변환 파일 체크
-        existing_result = exist_text_translate(request.file_path, request.language)
-        
-        if existing_result:
-            # 기존 결과 사용
-            result = existing_result
-        else:
-            # 새로 STT 변환 수행
-            result: STTResponse = await whisperx_service.transcribe_audio(
-                file_path=request.file_path,
-                language=request.language
-            )
-            
-            # 결과를 캐시에 저장
-            from app.whisperx.cache_service import STTCacheService
-            cache_service = STTCacheService()
-            cache_service.save_result(request.file_path, request.language, result)
-        
+        # 처리 중에 보관소 용량 정리/전사 후 삭제로 오디오가 지워지지 않도록 pin
+        with artifacts.pin(request.file_path):
+            # 기존 STT 변환 파일 체크
+            existing_result = exist_text_translate(request.file_path, request.language)
+
+            if existing_result:
+                # 기존 결과 사용
+                result = existing_result
+            else:
+                # 새로 STT 변환 수행
+                result: STTResponse = await whisperx_service.transcribe_audio(
+                    file_path=request.file_path,
+                    language=request.language,
+                    model_size=TierPolicy.get_instance().select(wav_duration(request.file_path))
+                )
+
+                # 결과를 캐시에 저장
+                from app.whisperx.cache_service import STTCacheService
+                cache_service = STTCacheService()
+                cache_service.save_result(request.file_path, request.language, result)
+
         segments: List[TranscriptionSegment] = result.segments
         return await extract_transcribe_with_graph(result, segments)
     except FileNotFoundError as e:
@@ -202,6 +270,41 @@ async def transcribe_with_graph(request: STTRequest):
         )
 
 
+@router.post("/align", response_model=AlignmentResponse)
+async def align_transcription(request: STTRequest):
+    """
+    전사 결과의 단어 단위 타임스탬프 조회
+    전사/정렬 결과가 캐시에 있으면 재사용하고, 없으면 전사 후 정렬 수행
+    """
+    try:
+        # 처리 중에 보관소 용량 정리/전사 후 삭제로 오디오가 지워지지 않도록 pin
+        with artifacts.pin(request.file_path):
+            result = exist_text_translate(request.file_path, request.language)
+            if not result:
+                result = await whisperx_service.transcribe_audio(
+                    file_path=request.file_path,
+                    language=request.language,
+                    model_size=TierPolicy.get_instance().select(wav_duration(request.file_path))
+                )
+                from app.whisperx.cache_service import STTCacheService
+                STTCacheService().save_result(request.file_path, request.language, result)
+
+            language = None if request.language == "auto" else request.language
+            return await whisperx_service.align_transcript(request.file_path, result, language=language)
+    except ArtifactEvictedError as e:
+        raise HTTPException(
+            status_code=410,
+            detail=f"전사 후 오디오 파일이 삭제되어 단어 타임스탬프를 계산할 수 없습니다. 영상을 다시 다운로드해 주세요: {str(e)}"
+        )
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"단어 타임스탬프 정렬 중 오류가 발생했습니다: {str(e)}"
+        )
+
+
 @router.get("/models/info")
 async def get_models_info():
     """
@@ -209,6 +312,7 @@ async def get_models_info():
     """
     try:
         info = whisperx_service.get_loaded_models_info()
+        info["classifier"] = SegmentClassifier.get_instance().get_info()
         return info
     except Exception as e:
         raise HTTPException(
@@ -222,9 +326,13 @@ async def get_cache_info():
     STT 캐시 정보 조회
     """
     try:
-        from app.whisperx.cache_service import STTCacheService
+        from app.artifacts import ArtifactStore
+        from app.whisperx.cache_service import AlignmentCacheService, GraphCacheService, STTCacheService
         cache_service = STTCacheService()
         info = cache_service.get_cache_info()
+        info["alignment"] = AlignmentCacheService().get_cache_info()
+        info["artifacts"] = ArtifactStore.get_instance().get_stats()
+        info["graph"] = GraphCacheService().get_cache_info()
         return info
     except Exception as e:
         raise HTTPException(
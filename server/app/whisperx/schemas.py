@@ -32,10 +32,33 @@ class TranscriptionSegment(BaseModel):
         }
 
 
+class WordTiming(BaseModel):
+    """단어 단위 타임스탬프 (강제 정렬 결과)"""
+    word: str = Field(..., description="Word text")
+    start: Optional[float] = Field(None, description="Start time in seconds")
+    end: Optional[float] = Field(None, description="End time in seconds")
+    score: Optional[float] = Field(None, description="Alignment score")
+
+
+class AlignedSegment(TranscriptionSegment):
+    """단어 타임스탬프가 포함된 전사 세그먼트"""
+    words: List[WordTiming] = Field(default_factory=list, description="Word-level timings")
+
+
+class AlignmentResponse(BaseModel):
+    """강제 정렬(단어 타임스탬프) 결과"""
+    language: str = Field(..., description="Alignment language code")
+    segments: List[AlignedSegment] = Field(..., description="Aligned segments")
+
+
 class STTResponse(BaseModel):
     """STT 변환 응답"""
+    language: Optional[str] = Field(None, description="Detected or requested language code")
     segments: List[TranscriptionSegment] = Field(..., description="Transcription segments")
     full_text: str = Field(..., description="Complete transcribed text")
+    model_size: Optional[str] = Field(None, description="전사에 사용한 WhisperX 모델 크기")
+    tier: Optional[str] = Field(None, description="전사 단계 (draft: 빠른 초안, final: 최종, caption: YouTube 자막)")
+    audio_skipped_ratio: Optional[float] = Field(None, description="전사 전에 비발화 구간으로 건너뛴 오디오 비율")
     
     class Config:
         json_schema_extra = {
@@ -50,6 +73,9 @@ class STTResponse(BaseModel):
                     }
                 ],
                 "full_text": "안녕하세요, 이것은 예시 텍스트입니다.",
+                "model_size": "large-v2",
+                "tier": "final",
+                "audio_skipped_ratio": 0.12,
             }
         }
 
@@ -1,11 +1,34 @@
 import whisperx
 import torch
+import asyncio
+import hashlib
 import os
+import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from threading import Lock
-from app.whisperx.schemas import STTResponse, TranscriptionSegment
+from app.whisperx.schemas import (
+    AlignedSegment,
+    AlignmentResponse,
+    STTResponse,
+    TranscriptionSegment,
+    WordTiming,
+)
+from app.whisperx.cache_service import AlignmentCacheService
+from app.artifacts import ArtifactStore
+from app.whisperx.audio_utils import SAMPLE_RATE
+from app.whisperx.parallel import ParallelTranscriber
+from app.whisperx.batcher import InferenceBatcher
+from app.whisperx.tiering import BATCHED_MODE, DEFAULT_MODE, FINAL_TIER, PARALLEL_MODE, TierPolicy
+from app.whisperx.language_id import LanguageIdentifier
+from app.whisperx.speech_map import SpeechTrimmer
+from app.whisperx.fingerprint import FingerprintIndex
+from app.timing import stage
+from app.metrics import WHISPERX_SECONDS, record_cache
 
+# 정렬 단계 WHISPERX_SECONDS의 model 라벨 (언어별 wav2vec2 정렬 모델, 언어는 stage 속성에 기록)
+ALIGN_MODEL_LABEL = "wav2vec2"
 
 def exist_text_translate(path: str) -> bool:
     return os.path.exists(path)
@@ -28,26 +51,42 @@ class WhisperXService:
             
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
         self.compute_type = "float16" if torch.cuda.is_available() else "int8"
-        self.models: Dict[str, Any] = {}  # 모델 크기별 캐시
+        self.models: "OrderedDict[str, Any]" = OrderedDict()  # 모델 크기별 캐시 (최근 사용 순)
+        # 동시에 메모리에 둘 전사 모델 수 (티어링/초안 전사로 여러 크기가 쓰여도 이 수를 넘으면 오래된 모델부터 내림)
+        self.max_models = max(1, int(os.getenv("WHISPERX_MAX_MODELS", "2")))
         self.align_models: Dict[str, tuple] = {}  # 언어별 정렬 모델 캐시
         self._model_lock = Lock()  # 모델 로딩 동기화
+        # 단어 타임스탬프 정렬 시점: lazy(요청 시), background(전사 후 백그라운드), eager(전사 중 즉시)
+        self.align_mode = os.getenv("WHISPERX_ALIGN_MODE", "lazy")
+        self._alignment_tasks: Dict[str, asyncio.Task] = {}
         self._initialized = True
         
         print(f"WhisperX Service initialized - Device: {self.device}, Compute Type: {self.compute_type}")
     
     def _load_model(self, model_size: str = "large-v2"):
-        """WhisperX 모델 로드 (싱글톤 캐시)"""
-        if model_size not in self.models:
-            with self._model_lock:
-                if model_size not in self.models:
-                    print(f"Loading WhisperX model: {model_size}")
-                    self.models[model_size] = whisperx.load_model(
-                        model_size, 
-                        self.device, 
-                        compute_type=self.compute_type
-                    )
-                    print(f"Model {model_size} loaded successfully")
-        return self.models[model_size]
+        """WhisperX 모델 로드 (최대 max_models개를 LRU로 캐시)"""
+        with self._model_lock:
+            model = self.models.get(model_size)
+            if model is not None:
+                self.models.move_to_end(model_size)
+                return model
+            # 새 모델을 올리기 전에 자리를 비움
+            # 전사 중인 요청과 배치 큐는 내린 모델의 참조를 들고 있어 받은 작업을 끝까지 수행함
+            # (다시 로드되면 InferenceBatcher가 예전 큐를 비울 때까지 돌린 뒤 종료)
+            while len(self.models) >= self.max_models:
+                evicted, _ = self.models.popitem(last=False)
+                print(f"Unloading WhisperX model: {evicted}")
+                if torch.cuda.is_available():
+                    torch.cuda.empty_cache()
+            print(f"Loading WhisperX model: {model_size}")
+            model = whisperx.load_model(
+                model_size,
+                self.device,
+                compute_type=self.compute_type
+            )
+            self.models[model_size] = model
+            print(f"Model {model_size} loaded successfully")
+            return model
     
     def _load_align_model(self, language_code: str):
         """정렬 모델 로드 (싱글톤 캐시)"""
@@ -71,7 +110,8 @@ class WhisperXService:
         self, 
         file_path: str, 
         language: Optional[str] = None,
-        model_size: str = "large-v2"
+        model_size: str = "large-v2",
+        tier: str = FINAL_TIER
     ) -> STTResponse:
         """
         오디오 파일을 텍스트로 변환
@@ -80,6 +120,7 @@ class WhisperXService:
             file_path: 오디오 파일 경로
             language: 언어 코드 (None이면 자동 감지)
             model_size: WhisperX 모델 크기
+            tier: 결과에 기록할 전사 단계 (draft/final)
             
         Returns:
             STTResponse: 전사 결과
@@ -91,33 +132,85 @@ class WhisperXService:
         model = self._load_model(model_size)
         
         # 오디오 로드
-        audio = whisperx.load_audio(file_path)
+        with stage("load_audio"):
+            audio = whisperx.load_audio(file_path)
         
-        # 전사 수행
-        result = model.transcribe(audio, batch_size=16)
+        if language == "auto":
+            language = None
+
+        # 같은 내용이 이미 전사된 적이 있으면 (다른 영상 ID로 다시 올라온 클립 등) 겹치는 구간의 전사 재사용
+        fingerprint = await FingerprintIndex.get_instance().lookup(audio, file_path, model_size)
+        reused_segments = fingerprint.segments if fingerprint is not None else None
+
+        # 비발화 구간(인트로, 배경 음악, 무음)을 뺀 오디오만 전사 (타임스탬프는 전사 후 원본 시간으로 변환)
+        vad_map = await SpeechTrimmer.get_instance().speech_map(model, audio, file_path)
+        speech_map = vad_map
+        if reused_segments:
+            speech_map = fingerprint.remaining_map(len(audio) / SAMPLE_RATE, speech_map)
+            language = language or fingerprint.language
+        asr_audio = speech_map.compact(audio) if speech_map else audio
+
+        # 언어 미지정 시 앞부분으로 먼저 언어 식별 (전사 파이프라인의 자체 감지 생략)
+        if language is None:
+            language = await LanguageIdentifier.get_instance().identify(model, asr_audio, file_path)
+
+        # 정렬이 필요한 모드면 전사와 동시에 정렬 모델 미리 로드
+        align_prefetch = None
+        if language and self.align_mode in ("eager", "background") and language not in self.align_models:
+            # run_in_executor는 즉시 스레드에 제출되므로 동기 전사 중에도 로드가 진행됨
+            align_prefetch = asyncio.get_running_loop().run_in_executor(None, self._load_align_model, language)
+
+        # 전사 수행 (긴 오디오는 청크로 나눠 worker 프로세스들에서 병렬 전사)
+        duration = len(asr_audio) / SAMPLE_RATE
+        transcribe_started = time.perf_counter()
+        parallel = ParallelTranscriber.get_instance()
+        if len(asr_audio) == 0:
+            # 전부 재사용된 구간이면 전사 생략
+            result = {"segments": [], "language": language}
+            mode = None
+        elif parallel.should_use(duration, self.device):
+            mode = PARALLEL_MODE
+            with stage("transcribe", model_size=model_size, mode=mode), \
+                    WHISPERX_SECONDS.labels(phase="transcribe", model=model_size).time():
+                result = await parallel.transcribe(
+                    asr_audio, language, model_size, self.compute_type, align=self.align_mode == "eager"
+                )
+        elif InferenceBatcher.get_instance().enabled:
+            # 동시에 들어온 다른 요청들의 VAD 구간과 함께 배치 디코딩
+            mode = BATCHED_MODE
+            with stage("transcribe", model_size=model_size, mode=mode), \
+                    WHISPERX_SECONDS.labels(phase="transcribe", model=model_size).time():
+                result = await InferenceBatcher.get_instance().transcribe(model, model_size, asr_audio, language)
+        else:
+            mode = DEFAULT_MODE
+            with stage("transcribe", model_size=model_size), \
+                    WHISPERX_SECONDS.labels(phase="transcribe", model=model_size).time():
+                result = model.transcribe(asr_audio, batch_size=16, language=language)
+        # 모델 선택 정책의 real-time factor 보정 (전사 경로별로 따로 기록)
+        if mode is not None:
+            TierPolicy.get_instance().observe(model_size, mode, duration, time.perf_counter() - transcribe_started)
         
         # 언어 감지 결과
-        detected_language = result.get("language", language or "en")
+        detected_language = result.get("language") or language or "en"
+        if align_prefetch is not None:
+            await align_prefetch
         
-        # 정렬 모델 로드 및 정렬 수행 
-        try:
-            align_model, metadata = self._load_align_model(detected_language)
-            if not align_model or not metadata:
-                raise RuntimeError("Alignment model or metadata not loaded")
-
-            aligned = whisperx.align(
-                result["segments"],
-                align_model,
-                metadata,
-                audio,
-                self.device,
-                return_char_alignments=False,
-            )
-            result["segments"] = aligned["segments"]
-            result["aligned"] = True
-
-        except Exception as e:
-            print(f"[WARN] Alignment failed: {e}. Using original timestamps.")
+        # eager 모드에서만 전사 중에 정렬 (병렬 전사에서 청크별로 이미 정렬했으면 생략)
+        # 그 외에는 단어 타임스탬프가 필요한 호출자가 align_transcript()로 따로 요청
+        if self.align_mode == "eager" and not result.get("aligned") and result.get("segments"):
+            try:
+                result["segments"] = await asyncio.to_thread(
+                    self._align_segments, result["segments"], detected_language, asr_audio
+                )
+                result["aligned"] = True
+            except Exception as e:
+                print(f"[WARN] Alignment failed: {e}. Using original timestamps.")
+                result["aligned"] = False
+        if speech_map is not None:
+            speech_map.remap_segments(result.get("segments", []))
+        if reused_segments:
+            result["segments"] = sorted(result.get("segments", []) + reused_segments, key=lambda seg: seg["start"])
+            # 재사용한 세그먼트에는 단어 타임스탬프가 없음
             result["aligned"] = False
         # 화자 분리 (선택사항)
         # diarize_model = whisperx.DiarizationPipeline(use_auth_token=YOUR_HF_TOKEN, device=device)
@@ -140,12 +233,149 @@ class WhisperXService:
         
         full_text = " ".join(full_text_parts)
         
-        return STTResponse(
+        response = STTResponse(
             file_path=file_path,
             language=detected_language,
             segments=segments,
-            full_text=full_text
+            full_text=full_text,
+            model_size=model_size,
+            tier=tier,
+            # 재사용 구간은 빼고 VAD가 건너뛴 비발화 비율만 보고
+            audio_skipped_ratio=round(vad_map.skipped_ratio, 4) if vad_map else None
         )
+
+        if fingerprint is not None and tier == FINAL_TIER:
+            # 최종 전사만 지문 색인에 등록 (이후 같은 내용의 업로드가 재사용)
+            try:
+                await asyncio.to_thread(
+                    FingerprintIndex.get_instance().register,
+                    file_path, fingerprint.landmarks, len(audio) / SAMPLE_RATE, response
+                )
+            except Exception as e:
+                print(f"[WARN] Fingerprint registration failed: {e}")
+
+        if result.get("aligned"):
+            # 이미 계산된 단어 타임스탬프는 정렬 캐시에 보관
+            if AlignmentCacheService().save_alignment(
+                file_path, detected_language, full_text,
+                self._to_alignment(detected_language, result["segments"])
+            ):
+                ArtifactStore.get_instance().mark_aligned(file_path)
+        elif self.align_mode == "background":
+            self.schedule_alignment(file_path, response, audio)
+
+        return response
+
+    def _align_segments(self, segments: List[dict], language: str, audio) -> List[dict]:
+        """
+        whisperx.align으로 단어 단위 타임스탬프 계산
+
+        Returns:
+            List[dict]: words가 포함된 세그먼트 (정렬 모델이 없으면 예외)
+        """
+        align_model, metadata = self._load_align_model(language)
+        if not align_model or not metadata:
+            raise RuntimeError("Alignment model or metadata not loaded")
+
+        with stage("align", language=language), \
+                WHISPERX_SECONDS.labels(phase="align", model=ALIGN_MODEL_LABEL).time():
+            aligned = whisperx.align(
+                segments,
+                align_model,
+                metadata,
+                audio,
+                self.device,
+                return_char_alignments=False,
+            )
+        return aligned["segments"]
+
+    @staticmethod
+    def _to_alignment(language: str, segments: List[dict]) -> AlignmentResponse:
+        return AlignmentResponse(
+            language=language,
+            segments=[
+                AlignedSegment(
+                    start=segment.get("start", 0.0),
+                    end=segment.get("end", 0.0),
+                    text=segment.get("text", "").strip(),
+                    words=[
+                        WordTiming(
+                            word=word.get("word", ""),
+                            start=word.get("start"),
+                            end=word.get("end"),
+                            score=word.get("score"),
+                        )
+                        for word in segment.get("words", [])
+                    ],
+                )
+                for segment in segments
+            ],
+        )
+
+    async def _compute_alignment(self, file_path: str, stt: STTResponse, language: str, audio=None) -> AlignmentResponse:
+        if audio is None:
+            # lazy 정렬은 전사 후 삭제된 오디오를 다시 읽어야 할 수 있음
+            ArtifactStore.get_instance().ensure_available(file_path)
+            audio = await asyncio.to_thread(whisperx.load_audio, file_path)
+        segments = [{"start": s.start, "end": s.end, "text": s.text} for s in stt.segments]
+        aligned = await asyncio.to_thread(self._align_segments, segments, language, audio)
+        alignment = self._to_alignment(language, aligned)
+        if AlignmentCacheService().save_alignment(file_path, language, stt.full_text, alignment):
+            ArtifactStore.get_instance().mark_aligned(file_path)
+        return alignment
+
+    def schedule_alignment(self, file_path: str, stt: STTResponse, audio=None,
+                           language: Optional[str] = None) -> asyncio.Task:
+        """
+        전사 결과의 단어 타임스탬프 정렬을 백그라운드 태스크로 시작 (같은 전사에 대한 중복 실행 방지)
+
+        Returns:
+            asyncio.Task: AlignmentResponse를 반환하는 태스크
+        """
+        language = language or stt.language or "en"
+        key = f"{file_path}:{language}:{hashlib.md5(stt.full_text.encode()).hexdigest()}"
+        task = self._alignment_tasks.get(key)
+        if task is None:
+            # 정렬이 끝날 때까지 오디오 보관 (요청이 먼저 끝나도 삭제되지 않도록)
+            artifacts = ArtifactStore.get_instance()
+            artifacts.acquire(file_path)
+            task = asyncio.create_task(self._compute_alignment(file_path, stt, language, audio))
+            self._alignment_tasks[key] = task
+
+            def _done(finished: asyncio.Task):
+                self._alignment_tasks.pop(key, None)
+                artifacts.release(file_path)
+                if not finished.cancelled() and finished.exception() is not None:
+                    print(f"[WARN] Alignment failed for {file_path}: {finished.exception()}")
+
+            task.add_done_callback(_done)
+        return task
+
+    def has_alignment(self, file_path: str, stt: STTResponse, language: Optional[str] = None) -> bool:
+        """전사 결과의 단어 정렬이 캐시되어 있는지 (오디오 삭제 판단용)"""
+        language = language or stt.language or "en"
+        return AlignmentCacheService().get_cached_alignment(file_path, language, stt.full_text) is not None
+
+    async def align_transcript(self, file_path: str, stt: STTResponse,
+                               language: Optional[str] = None) -> AlignmentResponse:
+        """
+        전사 결과의 단어 단위 타임스탬프 조회 (캐시에 없으면 계산)
+
+        Args:
+            file_path: 오디오 파일 경로
+            stt: 정렬할 전사 결과
+            language: 정렬 언어 (None이면 전사 결과의 언어)
+
+        Returns:
+            AlignmentResponse: 단어 타임스탬프가 포함된 세그먼트
+        """
+        language = language or stt.language or "en"
+        cached = AlignmentCacheService().get_cached_alignment(file_path, language, stt.full_text)
+        record_cache("align", hit=cached is not None)
+        if cached:
+            return cached
+        # 요청이 취소돼도 진행 중인 정렬은 끝까지 수행해 캐시에 남김
+        return await asyncio.shield(self.schedule_alignment(file_path, stt, language=language))
     
     def cleanup_models(self):
         """메모리 정리"""
@@ -161,16 +391,25 @@ class WhisperXService:
             
             if torch.cuda.is_available():
                 torch.cuda.empty_cache()
-            
+
             print("All WhisperX models cleaned up from memory")
+
+        ParallelTranscriber.get_instance().shutdown()
     
     def get_loaded_models_info(self):
         """로드된 모델 정보 반환"""
         return {
             "whisper_models": list(self.models.keys()),
+            "max_models": self.max_models,
             "align_models": list(self.align_models.keys()),
             "device": self.device,
-            "compute_type": self.compute_type
+            "compute_type": self.compute_type,
+            "align_mode": self.align_mode,
+            "parallel": ParallelTranscriber.get_instance().get_info(),
+            "batching": InferenceBatcher.get_instance().get_info(),
+            "tiering": TierPolicy.get_instance().get_info(),
+            "speech_trim": SpeechTrimmer.get_instance().get_info(),
+            "fingerprint": FingerprintIndex.get_instance().get_info()
         }
     
     @classmethod
@@ -0,0 +1,117 @@
+"""
+논증 그래프 관계 분석 후보 쌍 선택
+
+인접한 노드만 비교하면 몇 분 뒤에 나오는 근거를 놓치고, 전체 쌍을 비교하면 LLM 호출이 O(n²)이 됨
+노드 텍스트를 CPU에서 임베딩해 노드마다 의미가 가까운 반대 유형(CLAIM↔FACT) 노드 top-k만
+장거리 후보로 추가해 호출 수를 노드 수에 비례하게 유지
+"""
+
+import os
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from app.whisperx.classifier import hashed_features
+from app.whisperx.schemas import ClassifiedSegment, SentenceType
+
+# 기존 동작: 최대 2개 뒤까지의 노드와 비교
+LOCAL_WINDOW = 2
+# 임베딩 차원 (문자 n-gram 해시 특징을 부호 해싱으로 압축)
+EMBEDDING_DIM = 512
+# 유사도 행렬을 한 번에 계산할 행 수
+_BLOCK_ROWS = 512
+
+
+def embed_texts(texts: Sequence[str], dim: int = EMBEDDING_DIM) -> np.ndarray:
+    """
+    텍스트를 L2 정규화된 dense 벡터로 변환
+
+    문자 n-gram 해시 특징을 dim 차원으로 부호 해싱하므로 모델 없이 CPU에서 바로 계산되고
+    같은 용어/고유명사/수치를 공유하는 문장일수록 코사인 유사도가 높음
+
+    Returns:
+        np.ndarray: (len(texts), dim) float32 행렬
+    """
+    matrix = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        indices, values = hashed_features(text)
+        if not len(indices):
+            continue
+        signs = np.where((indices // dim) % 2 == 0, 1.0, -1.0).astype(np.float32)
+        np.add.at(matrix[row], indices % dim, values * signs)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms > 0, norms, 1.0)
+
+
+def local_pairs(nodes: Sequence[ClassifiedSegment]) -> List[Tuple[int, int]]:
+    """인접 세그먼트, 그리고 LOCAL_WINDOW 안의 CLAIM-FACT 쌍 (기존 선택 규칙)"""
+    pairs = []
+    for i in range(len(nodes)):
+        for j in range(i + 1, min(i + LOCAL_WINDOW + 1, len(nodes))):
+            if nodes[i].classification != nodes[j].classification or j == i + 1:
+                pairs.append((i, j))
+    return pairs
+
+
+def long_range_pairs(
+    nodes: Sequence[ClassifiedSegment],
+    top_k: int,
+    min_similarity: float,
+) -> List[Tuple[int, int]]:
+    """
+    LOCAL_WINDOW 밖에서 의미가 가까운 CLAIM-FACT 쌍
+
+    노드 수가 영상 하나 분량(수백 개)이라 근사 색인 대신 유사도 행렬에서 바로 top-k를 고름
+
+    Args:
+        nodes: 시간 순서의 그래프 노드
+        top_k: 노드당 추가할 최대 후보 수
+        min_similarity: 후보로 인정할 최소 코사인 유사도
+
+    Returns:
+        List[Tuple[int, int]]: (앞 노드 index, 뒤 노드 index) 쌍
+    """
+    n = len(nodes)
+    if n <= LOCAL_WINDOW + 1 or top_k <= 0:
+        return []
+    embeddings = embed_texts([node.text for node in nodes])
+    is_claim = np.array([node.classification == SentenceType.CLAIM for node in nodes])
+    positions = np.arange(n)
+    k = min(top_k, n - 1)
+
+    pairs = set()
+    # 긴 영상에서도 메모리가 n² 으로 커지지 않게 행 블록 단위로 계산
+    for block in range(0, n, _BLOCK_ROWS):
+        rows = positions[block:block + _BLOCK_ROWS]
+        similarity = embeddings[rows] @ embeddings.T
+        # 같은 유형끼리, 자기 자신, 로컬 창 안의 쌍은 제외
+        mask = (is_claim[rows, None] == is_claim[None, :]) | (np.abs(rows[:, None] - positions[None, :]) <= LOCAL_WINDOW)
+        similarity[mask] = -np.inf
+        candidates = np.argpartition(-similarity, k - 1, axis=1)[:, :k]
+        for offset, i in enumerate(rows):
+            for j in candidates[offset]:
+                if similarity[offset, j] >= min_similarity:
+                    pairs.add((min(int(i), int(j)), max(int(i), int(j))))
+    return sorted(pairs)
+
+
+def candidate_pairs(nodes: Sequence[ClassifiedSegment]) -> List[Tuple[int, int]]:
+    """
+    관계 분석할 노드 쌍
+
+    환경 변수
+      GRAPH_LONG_RANGE: 1이면 임베딩 유사도 기반 장거리 CLAIM-FACT 쌍 추가 (기본 비활성)
+      GRAPH_LONG_RANGE_TOP_K: 노드당 장거리 후보 수 (기본 3)
+      GRAPH_LONG_RANGE_MIN_SIMILARITY: 장거리 후보 최소 코사인 유사도 (기본 0.2)
+
+    Returns:
+        List[Tuple[int, int]]: 시간 순서의 (앞 노드 index, 뒤 노드 index) 쌍
+    """
+    pairs = local_pairs(nodes)
+    if os.getenv("GRAPH_LONG_RANGE", "0") == "1":
+        top_k = int(os.getenv("GRAPH_LONG_RANGE_TOP_K", "3"))
+        min_similarity = float(os.getenv("GRAPH_LONG_RANGE_MIN_SIMILARITY", "0.2"))
+        extra = long_range_pairs(nodes, top_k, min_similarity)
+        print(f"Graph candidate pairs: {len(pairs)} local + {len(extra)} long-range for {len(nodes)} nodes")
+        pairs = sorted(set(pairs) | set(extra))
+    return pairs
@@ -0,0 +1,260 @@
+"""
+전사 전 발화 구간 추출 (SPEECH_TRIM=1 일 때만 동작)
+
+VAD로 찾은 발화 구간만 이어 붙인 오디오를 전사해 인트로/배경 음악/무음을 건너뛰고,
+전사 결과의 타임스탬프는 구간 대응표로 원본 영상 시간으로 되돌림
+발화 구간 목록(speech map)은 영상(오디오 파일 이름) 단위로 캐시
+"""
+
+import asyncio
+import json
+import os
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from pathlib import Path
+from threading import Lock
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from app.metrics import WHISPERX_AUDIO_SKIPPED_RATIO, record_cache
+from app.timing import stage
+from app.whisperx.audio_utils import SAMPLE_RATE
+
+# FasterWhisperPipeline.transcribe 기본값과 동일
+CHUNK_SIZE = 30
+
+
+def vad_chunks(model, audio: np.ndarray) -> List[dict]:
+    """
+    transcribe()와 같은 방식으로 VAD 구간을 구하고 chunk_size 이하로 병합
+
+    Returns:
+        List[dict]: {start, end, segments: [(start, end), ...]} (segments는 병합 전 발화 구간)
+    """
+    from whisperx.vads import Pyannote, Vad
+
+    if issubclass(type(model.vad_model), Vad):
+        waveform = model.vad_model.preprocess_audio(audio)
+        merge_chunks = model.vad_model.merge_chunks
+    else:
+        waveform = Pyannote.preprocess_audio(audio)
+        merge_chunks = Pyannote.merge_chunks
+    segments = model.vad_model({"waveform": waveform, "sample_rate": SAMPLE_RATE})
+    return merge_chunks(
+        segments,
+        CHUNK_SIZE,
+        onset=model._vad_params["vad_onset"],
+        offset=model._vad_params["vad_offset"],
+    )
+
+
+@dataclass
+class SpeechMap:
+    """
+    원본 오디오의 발화 구간과 압축 오디오(발화 구간만 이어 붙인 오디오) 시간 대응표
+    """
+    duration: float
+    spans: List[Tuple[float, float]]
+    # 각 구간이 압축 오디오에서 시작하는 시간 (spans와 같은 순서)
+    _offsets: List[float] = field(default_factory=list, repr=False)
+
+    def __post_init__(self):
+        self.spans = [(float(start), float(end)) for start, end in self.spans]
+        offsets, position = [], 0.0
+        for start, end in self.spans:
+            offsets.append(position)
+            position += end - start
+        self._offsets = offsets
+
+    @property
+    def speech_seconds(self) -> float:
+        return sum(end - start for start, end in self.spans)
+
+    @property
+    def skipped_ratio(self) -> float:
+        if self.duration <= 0:
+            return 0.0
+        return max(0.0, 1.0 - self.speech_seconds / self.duration)
+
+    def compact(self, audio: np.ndarray) -> np.ndarray:
+        """발화 구간만 이어 붙인 오디오"""
+        if not self.spans:
+            return audio[:0]
+        return np.concatenate([
+            audio[int(start * SAMPLE_RATE):int(end * SAMPLE_RATE)] for start, end in self.spans
+        ])
+
+    def to_original(self, t: float, is_end: bool = False) -> float:
+        """
+        압축 오디오 시간 -> 원본 시간
+
+        구간 경계에 걸린 시간은 시작이면 다음 구간 시작, 끝이면 이전 구간 끝으로 대응
+        """
+        if not self.spans:
+            return t
+        index = (bisect_left if is_end else bisect_right)(self._offsets, t) - 1
+        index = min(max(index, 0), len(self.spans) - 1)
+        start, end = self.spans[index]
+        return round(min(end, start + max(0.0, t - self._offsets[index])), 3)
+
+    def remap_segments(self, segments: List[dict]) -> List[dict]:
+        """전사 세그먼트(및 단어)의 start/end를 원본 시간으로 변환"""
+        for segment in segments:
+            if segment.get("start") is not None:
+                segment["start"] = self.to_original(segment["start"])
+            if segment.get("end") is not None:
+                segment["end"] = self.to_original(segment["end"], is_end=True)
+            for word in segment.get("words", []) or []:
+                if word.get("start") is not None:
+                    word["start"] = self.to_original(word["start"])
+                if word.get("end") is not None:
+                    word["end"] = self.to_original(word["end"], is_end=True)
+        return segments
+
+    def to_dict(self) -> dict:
+        return {"duration": self.duration, "spans": [list(span) for span in self.spans]}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'SpeechMap':
+        return cls(duration=data["duration"], spans=[tuple(span) for span in data["spans"]])
+
+
+def build_speech_map(
+    raw_spans: List[Tuple[float, float]],
+    duration: float,
+    pad: float = 0.25,
+    min_gap: float = 1.0,
+) -> SpeechMap:
+    """
+    VAD 발화 구간에 앞뒤 여유를 붙이고 짧은 쉼은 그대로 두도록 가까운 구간을 합침
+
+    Args:
+        raw_spans: VAD 발화 구간 (초)
+        duration: 원본 오디오 길이 (초)
+        pad: 구간 앞뒤 여유 (단어 앞뒤가 잘리지 않도록)
+        min_gap: 이보다 짧은 구간 사이 간격은 건너뛰지 않음
+
+    Returns:
+        SpeechMap: 병합된 발화 구간
+    """
+    spans: List[Tuple[float, float]] = []
+    for start, end in sorted(raw_spans):
+        start, end = max(0.0, start - pad), min(duration, end + pad)
+        if end <= start:
+            continue
+        if spans and start - spans[-1][1] < min_gap:
+            spans[-1] = (spans[-1][0], max(spans[-1][1], end))
+        else:
+            spans.append((start, end))
+    return SpeechMap(duration=duration, spans=spans)
+
+
+class SpeechTrimmer:
+    """
+    영상별 speech map 계산 + 캐시
+
+    환경 변수
+      SPEECH_TRIM: 1이면 전사 전에 비발화 구간 제거 (기본 비활성)
+      SPEECH_TRIM_PAD_MS: 발화 구간 앞뒤 여유 (기본 250ms)
+      SPEECH_TRIM_MIN_GAP_MS: 이보다 짧은 비발화 구간은 남김 (기본 1000ms)
+      SPEECH_TRIM_MIN_SKIP: 건너뛸 비율이 이보다 작으면 원본 오디오를 그대로 전사 (기본 0.05)
+      SPEECH_TRIM_CACHE_DIR: 캐시 디렉토리 (기본 cache/speech)
+    """
+
+    _instance: Optional['SpeechTrimmer'] = None
+    _lock = Lock()
+
+    def __init__(self):
+        self.enabled = os.getenv("SPEECH_TRIM", "0") == "1"
+        self.pad = float(os.getenv("SPEECH_TRIM_PAD_MS", "250")) / 1000
+        self.min_gap = float(os.getenv("SPEECH_TRIM_MIN_GAP_MS", "1000")) / 1000
+        self.min_skip = float(os.getenv("SPEECH_TRIM_MIN_SKIP", "0.05"))
+        self.cache_dir = Path(os.getenv("SPEECH_TRIM_CACHE_DIR", "cache/speech"))
+        self.stats = {"videos": 0, "audio_seconds": 0.0, "skipped_seconds": 0.0}
+
+    def _cache_file(self, file_path: str) -> Path:
+        # downloads/<video_id>.wav -> cache/speech/<video_id>.json
+        return self.cache_dir / f"{Path(file_path).stem}.json"
+
+    def _load(self, file_path: str, duration: float) -> Optional[SpeechMap]:
+        try:
+            with open(self._cache_file(file_path), 'r', encoding='utf-8') as f:
+                speech_map = SpeechMap.from_dict(json.load(f))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Speech map 캐시 로드 오류: {e}")
+            return None
+        # 같은 이름의 다른 오디오(다시 받은 파일 등)면 사용하지 않음
+        if abs(speech_map.duration - duration) > 0.5:
+            return None
+        return speech_map
+
+    def _save(self, file_path: str, speech_map: SpeechMap):
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(self._cache_file(file_path), 'w', encoding='utf-8') as f:
+                json.dump(speech_map.to_dict(), f)
+        except Exception as e:
+            print(f"Speech map 캐시 저장 오류: {e}")
+
+    def _detect(self, model, audio: np.ndarray, duration: float) -> SpeechMap:
+        raw_spans = [span for chunk in vad_chunks(model, audio) for span in chunk["segments"]]
+        return build_speech_map(raw_spans, duration, self.pad, self.min_gap)
+
+    async def speech_map(self, model, audio: np.ndarray, file_path: str) -> Optional[SpeechMap]:
+        """
+        오디오의 발화 구간 조회 (캐시에 없으면 VAD 실행)
+
+        Args:
+            model: WhisperX FasterWhisperPipeline (VAD 모델 사용)
+            audio: 16kHz mono 오디오
+            file_path: 오디오 파일 경로 (캐시 키)
+
+        Returns:
+            Optional[SpeechMap]: 잘라낼 만한 비발화 구간이 있으면 speech map (비활성화, 실패, 건너뛸 구간이 적으면 None)
+        """
+        if not self.enabled:
+            return None
+        duration = len(audio) / SAMPLE_RATE
+        speech_map = self._load(file_path, duration)
+        record_cache("speech_map", hit=speech_map is not None)
+        if speech_map is None:
+            try:
+                with stage("speech_map"):
+                    speech_map = await asyncio.to_thread(self._detect, model, audio, duration)
+            except Exception as e:
+                print(f"[WARN] Speech activity detection failed: {e}")
+                return None
+            self._save(file_path, speech_map)
+
+        skipped = speech_map.skipped_ratio
+        WHISPERX_AUDIO_SKIPPED_RATIO.observe(skipped)
+        self.stats["videos"] += 1
+        self.stats["audio_seconds"] += duration
+        print(f"Speech trimming: {speech_map.speech_seconds:.1f}s of {duration:.1f}s is speech "
+              f"({skipped * 100:.1f}% skipped, {len(speech_map.spans)} spans)")
+        if skipped < self.min_skip or not speech_map.spans:
+            return None
+        self.stats["skipped_seconds"] += duration * skipped
+        return speech_map
+
+    def get_info(self) -> dict:
+        audio_seconds = self.stats["audio_seconds"]
+        return {
+            "enabled": self.enabled,
+            "videos": self.stats["videos"],
+            "audio_seconds": round(audio_seconds, 1),
+            "skipped_seconds": round(self.stats["skipped_seconds"], 1),
+            "skipped_percent": round(self.stats["skipped_seconds"] / audio_seconds * 100, 1) if audio_seconds else 0.0,
+        }
+
+    @classmethod
+    def get_instance(cls) -> 'SpeechTrimmer':
+        """싱글톤 인스턴스 반환"""
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
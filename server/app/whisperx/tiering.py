@@ -0,0 +1,166 @@
+"""
+전사 모델 크기 선택 정책
+
+오디오 길이와 지연시간 SLO로 전사 모델 크기를 고르고,
+필요하면 작은 모델로 먼저 초안(draft)을 만든 뒤 큰 모델로 다시 전사하도록 결정
+모델별 real-time factor(전사 시간 / 오디오 길이)는 실제 전사 시간으로 계속 보정
+"""
+
+import json
+import os
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+from app.whisperx.batcher import InferenceBatcher
+from app.whisperx.parallel import ParallelTranscriber
+
+# CPU int8 기준 대략적인 초기 real-time factor (실측으로 보정됨)
+_DEFAULT_RTF = {
+    "tiny": 0.03,
+    "base": 0.05,
+    "small": 0.12,
+    "medium": 0.3,
+    "large-v2": 0.6,
+    "large-v3": 0.6,
+}
+
+DRAFT_TIER = "draft"
+FINAL_TIER = "final"
+# 모델 대신 YouTube 자막 트랙에서 만든 전사
+CAPTION_TIER = "caption"
+
+# 전사 경로 (경로마다 real-time factor가 크게 달라 따로 보정)
+PARALLEL_MODE = "parallel"
+BATCHED_MODE = "batched"
+DEFAULT_MODE = "default"
+
+
+def _load_rtf_overrides() -> Dict[str, float]:
+    """STT_RTF 환경 변수 파싱 (형식이 잘못되면 경고 후 무시)"""
+    raw = os.getenv("STT_RTF", "{}")
+    try:
+        overrides = json.loads(raw)
+        if not isinstance(overrides, dict):
+            raise ValueError("not a JSON object")
+        return {str(model): float(value) for model, value in overrides.items()}
+    except (ValueError, TypeError) as e:
+        print(f"Ignoring invalid STT_RTF {raw!r}: {e}")
+        return {}
+
+
+class TierPolicy:
+    """
+    오디오 길이 기반 모델 선택기
+
+    환경 변수
+      STT_TIERING: 1이면 길이/SLO로 모델 선택 (기본 비활성 = 항상 STT_DEFAULT_MODEL)
+      STT_DEFAULT_MODEL: 기본 모델 (기본 large-v2)
+      STT_MODEL_TIERS: 작은 것부터 큰 순서의 후보 모델 (기본 tiny,base,small,medium,large-v2)
+      STT_LATENCY_SLO_SECONDS: 전사 목표 소요 시간 (기본 120초)
+      STT_RTF: 모델별 초기 real-time factor 재정의 (JSON, 예: {"small": 0.1})
+      STT_DRAFT: 1이면 선택 모델보다 작은 초안 모델로 먼저 전사 (기본 비활성)
+      STT_DRAFT_MODEL: 초안 모델 (기본 base)
+    """
+
+    _instance: Optional['TierPolicy'] = None
+    _lock = Lock()
+
+    def __init__(self):
+        self.enabled = os.getenv("STT_TIERING", "0") == "1"
+        self.default_model = os.getenv("STT_DEFAULT_MODEL", "large-v2")
+        self.tiers: List[str] = [
+            m.strip() for m in os.getenv("STT_MODEL_TIERS", "tiny,base,small,medium,large-v2").split(",") if m.strip()
+        ]
+        self.slo = float(os.getenv("STT_LATENCY_SLO_SECONDS", "120"))
+        self.draft_enabled = os.getenv("STT_DRAFT", "0") == "1"
+        self.draft = os.getenv("STT_DRAFT_MODEL", "base")
+        # 모델별 초기값 (보정 전, 모든 전사 경로 공통)
+        self.rtf: Dict[str, float] = dict(_DEFAULT_RTF)
+        self.rtf.update(_load_rtf_overrides())
+        # (모델, 전사 경로) -> 실측으로 보정한 real-time factor
+        self.observed_rtf: Dict[Tuple[str, str], float] = {}
+        self._rtf_lock = Lock()
+        self._device: Optional[str] = None
+
+    def expected_mode(self, duration: float) -> str:
+        """duration 길이 오디오가 WhisperXService에서 거칠 전사 경로"""
+        if self._device is None:
+            import torch
+            self._device = "cuda" if torch.cuda.is_available() else "cpu"
+        if ParallelTranscriber.get_instance().should_use(duration, self._device):
+            return PARALLEL_MODE
+        if InferenceBatcher.get_instance().enabled:
+            return BATCHED_MODE
+        return DEFAULT_MODE
+
+    def estimate_seconds(self, model_size: str, duration: float, mode: str = DEFAULT_MODE) -> float:
+        """모델로 duration 길이 오디오를 mode 경로에서 전사하는 데 걸릴 예상 시간"""
+        observed = self.observed_rtf.get((model_size, mode))
+        if observed is not None:
+            return duration * observed
+        return duration * self.rtf.get(model_size, self.rtf.get(self.default_model, 1.0))
+
+    def select(self, duration: Optional[float]) -> str:
+        """
+        SLO 안에 끝날 것으로 예상되는 가장 큰 모델 선택
+
+        Args:
+            duration: 오디오 길이 (초, 모르면 None)
+
+        Returns:
+            str: 모델 크기 (어느 모델도 SLO를 못 맞추면 가장 작은 모델)
+        """
+        if not self.enabled or not duration or not self.tiers:
+            return self.default_model
+        mode = self.expected_mode(duration)
+        for model_size in reversed(self.tiers):
+            if self.estimate_seconds(model_size, duration, mode) <= self.slo:
+                return model_size
+        return self.tiers[0]
+
+    def draft_model(self, selected: str) -> Optional[str]:
+        """선택 모델보다 작은 초안 모델 (초안 단계가 필요 없으면 None)"""
+        if not self.draft_enabled or self.draft == selected:
+            return None
+        if self.draft in self.tiers and selected in self.tiers \
+                and self.tiers.index(self.draft) >= self.tiers.index(selected):
+            return None
+        return self.draft
+
+    def observe(self, model_size: str, mode: str, duration: float, elapsed: float, alpha: float = 0.2):
+        """
+        실제 전사 시간으로 (모델, 전사 경로)의 real-time factor 보정 (지수 이동 평균)
+
+        Args:
+            model_size: 전사에 사용한 모델
+            mode: 전사 경로 (parallel / batched / default)
+            duration: 전사한 오디오 길이 (초)
+            elapsed: 전사 소요 시간 (초)
+        """
+        if duration <= 0:
+            return
+        key = (model_size, mode)
+        with self._rtf_lock:
+            previous = self.observed_rtf.get(key, self.rtf.get(model_size))
+            current = elapsed / duration
+            self.observed_rtf[key] = current if previous is None else (1 - alpha) * previous + alpha * current
+
+    def get_info(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "default_model": self.default_model,
+            "tiers": self.tiers,
+            "latency_slo_seconds": self.slo,
+            "draft_model": self.draft if self.draft_enabled else None,
+            "rtf": {model: round(value, 4) for model, value in self.rtf.items()},
+            "observed_rtf": {f"{model}/{mode}": round(value, 4) for (model, mode), value in self.observed_rtf.items()},
+        }
+
+    @classmethod
+    def get_instance(cls) -> 'TierPolicy':
+        """싱글톤 인스턴스 반환"""
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
@@ -0,0 +1,168 @@
+"""
+YouTube 자막 트랙 -> 전사 세그먼트 변환
+
+yt-dlp 메타데이터의 subtitles(수동) / automatic_captions(자동 생성) 중
+사용할 트랙을 고르고, json3 또는 vtt 자막을 TranscriptionSegment 형식의 dict로 변환
+"""
+
+import os
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+# 음악/박수 등 발화가 아닌 자막 ([음악], [Music], (박수) ...)
+_NON_SPEECH = re.compile(r"^[\[\(（【♪].*[\]\)）】♪]$")
+_VTT_TIME = re.compile(r"(\d+):(\d{2}):(\d{2})[.,](\d{3})|(\d{2}):(\d{2})[.,](\d{3})")
+_VTT_TAG = re.compile(r"<[^>]+>")
+_PREFERRED_EXTS = ("json3", "vtt")
+
+
+@dataclass
+class CaptionTrack:
+    language: str
+    kind: str  # manual | auto
+    ext: str
+    url: str
+
+
+@dataclass
+class CaptionQuality:
+    accepted: bool
+    reason: str
+    coverage: float
+    speech_segments: int
+
+
+def _base_language(code: str) -> str:
+    """'ko-orig', 'en-US' -> 'ko', 'en'"""
+    return code.split("-")[0].lower()
+
+
+def _pick_format(formats: List[dict]) -> Optional[dict]:
+    for ext in _PREFERRED_EXTS:
+        for fmt in formats:
+            if fmt.get("ext") == ext and fmt.get("url"):
+                return fmt
+    return None
+
+
+def select_track(info: dict, languages: List[str], allow_auto: bool = True) -> Optional[CaptionTrack]:
+    """
+    사용할 자막 트랙 선택
+
+    수동 자막(선호 언어 순) -> 원본 언어 자동 자막 순으로 고름
+    자동 자막 중 번역 트랙(원본 언어가 아닌 것)은 품질이 낮아 사용하지 않음
+
+    Args:
+        info: yt-dlp extract_info 결과
+        languages: 선호 언어 코드 목록
+        allow_auto: 자동 생성 자막 허용 여부
+
+    Returns:
+        Optional[CaptionTrack]: 선택된 트랙 (없으면 None)
+    """
+    manual: Dict[str, List[dict]] = info.get("subtitles") or {}
+    for language in languages:
+        for code, formats in manual.items():
+            if _base_language(code) == language and code != "live_chat":
+                fmt = _pick_format(formats)
+                if fmt:
+                    return CaptionTrack(language, "manual", fmt["ext"], fmt["url"])
+
+    if not allow_auto:
+        return None
+    auto: Dict[str, List[dict]] = info.get("automatic_captions") or {}
+    # yt-dlp는 원본 언어 자동 자막을 '<lang>-orig'로 표시 (없으면 영상 언어 메타데이터 사용)
+    original = next(
+        (_base_language(code) for code in auto if code.endswith("-orig")),
+        _base_language(info.get("language") or ""),
+    )
+    if original not in languages:
+        return None
+    for code in (f"{original}-orig", original):
+        fmt = _pick_format(auto.get(code, []))
+        if fmt:
+            return CaptionTrack(original, "auto", fmt["ext"], fmt["url"])
+    return None
+
+
+def parse_json3(data: dict) -> List[dict]:
+    """json3 자막 이벤트 -> [{start, end, text}]"""
+    segments = []
+    for event in data.get("events", []):
+        if "segs" not in event or event.get("aAppend"):
+            continue
+        text = "".join(seg.get("utf8", "") for seg in event["segs"]).replace("\n", " ").strip()
+        if not text:
+            continue
+        start = event.get("tStartMs", 0) / 1000
+        end = start + event.get("dDurationMs", 0) / 1000
+        segments.append({"start": round(start, 3), "end": round(end, 3), "text": text})
+
+    # 자동 자막은 이벤트가 겹쳐 표시되므로 다음 이벤트 시작에서 끝나도록 자름
+    for current, following in zip(segments, segments[1:]):
+        if current["end"] > following["start"]:
+            current["end"] = following["start"]
+    return segments
+
+
+def _vtt_seconds(value: str) -> float:
+    match = _VTT_TIME.match(value.strip())
+    if not match:
+        return 0.0
+    if match.group(1) is not None:
+        h, m, s, ms = match.group(1, 2, 3, 4)
+    else:
+        h, (m, s, ms) = "0", match.group(5, 6, 7)
+    return int(h) * 3600 + int(m) * 60 + int(s) + int(ms) / 1000
+
+
+def parse_vtt(text: str) -> List[dict]:
+    """WebVTT 자막 -> [{start, end, text}] (자동 자막의 이전 줄 반복 제거)"""
+    segments = []
+    previous_line = None
+    for block in re.split(r"\n\s*\n", text.replace("\r", "")):
+        lines = [line for line in block.split("\n") if line.strip()]
+        timing = next((i for i, line in enumerate(lines) if "-->" in line), None)
+        if timing is None:
+            continue
+        start, end = (part.strip().split(" ")[0] for part in lines[timing].split("-->"))
+        words = []
+        for line in lines[timing + 1:]:
+            line = _VTT_TAG.sub("", line).strip()
+            if line and line != previous_line:
+                words.append(line)
+                previous_line = line
+        if words:
+            segments.append({
+                "start": round(_vtt_seconds(start), 3),
+                "end": round(_vtt_seconds(end), 3),
+                "text": " ".join(words),
+            })
+    return segments
+
+
+def assess_quality(segments: List[dict], duration: Optional[float], track: CaptionTrack) -> CaptionQuality:
+    """
+    자막을 전사 대신 써도 되는지 판단
+
+    환경 변수
+      CAPTION_MIN_COVERAGE: 발화 자막이 덮는 시간 / 영상 길이 최소 비율 (기본 0.5, 자동 자막에만 적용)
+      CAPTION_MIN_SEGMENTS: 발화 자막 최소 개수 (기본 3)
+    """
+    speech = speech_segments(segments)
+    covered = sum(max(0.0, seg["end"] - seg["start"]) for seg in speech)
+    coverage = covered / duration if duration else 1.0
+    min_segments = int(os.getenv("CAPTION_MIN_SEGMENTS", "3"))
+    min_coverage = float(os.getenv("CAPTION_MIN_COVERAGE", "0.5"))
+
+    if len(speech) < min_segments:
+        return CaptionQuality(False, "too few speech captions", coverage, len(speech))
+    if track.kind == "auto" and coverage < min_coverage:
+        return CaptionQuality(False, f"low coverage {coverage:.2f}", coverage, len(speech))
+    return CaptionQuality(True, f"{track.kind} captions", coverage, len(speech))
+
+
+def speech_segments(segments: List[dict]) -> List[dict]:
+    """발화가 아닌 자막 ([음악] 등) 제외"""
+    return [seg for seg in segments if not _NON_SPEECH.match(seg["text"])]
@@ -3,6 +3,7 @@ from app.youtube.service import YouTubeService
 from app.youtube.schemas import YouTubeInfo, YouTubeDownloadRequest, YouTubeDownloadResponse
 from app.whisperx.service import WhisperXService
 from app.whisperx.schemas import YouTubeSTTResponse
+from app.whisperx.tiering import TierPolicy
 
 router = APIRouter()
 youtube_service = YouTubeService()
@@ -29,7 +30,7 @@ async def download_youtube_audio(request: YouTubeDownloadRequest):
     YouTube 영상을 오디오로 다운로드
     """
     try:
-        result = await youtube_service.download_audio(request.url)
+        result = await youtube_service.download_audio(request.url, max_seconds=request.max_seconds)
         return YouTubeDownloadResponse(**result)
     except Exception as e:
         raise HTTPException(
@@ -47,12 +48,13 @@ async def process_youtube_with_stt(request: YouTubeDownloadRequest):
         youtube_info = await youtube_service.get_info(request.url)
         
         # 2. 오디오 다운로드
-        download_result = await youtube_service.download_audio(request.url)
+        download_result = await youtube_service.download_audio(request.url, max_seconds=request.max_seconds)
         
         # 3. STT 변환
+        # 언어는 자동 감지, 모델 크기는 영상 길이로 선택
         stt_result = await whisperx_service.transcribe_audio(
             file_path=download_result["file_path"],
-            language="ko"  # 기본값으로 한국어 설정
+            model_size=TierPolicy.get_instance().select(download_result["duration"])
         )
         
         return YouTubeSTTResponse(
@@ -5,11 +5,13 @@ from typing import Optional
 class YouTubeDownloadRequest(BaseModel):
     """YouTube download request"""
     url: str = Field(..., description="YouTube video URL")
+    max_seconds: Optional[int] = Field(None, description="Download only the first N seconds (0 = full audio)")
 
     class Config:
         json_schema_extra = {
             "example": {
-                "url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+                "url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+                "max_seconds": None
             }
         }
 
@@ -41,12 +43,18 @@ class YouTubeDownloadResponse(BaseModel):
     file_path: str = Field(..., description="Downloaded file path")
     title: Optional[str] = Field(None, description="Video title")
     duration: Optional[int] = Field(None, description="Video duration in seconds")
+    format_id: Optional[str] = Field(None, description="Downloaded yt-dlp format id")
+    abr: Optional[float] = Field(None, description="Audio bitrate of the downloaded format (kbps)")
+    downloaded_bytes: Optional[int] = Field(None, description="Bytes transferred for this download")
 
     class Config:
         json_schema_extra = {
             "example": {
                 "file_path": "downloads/dQw4w9WgXcQ.wav",
                 "title": "Example Video",
-                "duration": 240
+                "duration": 240,
+                "format_id": "249",
+                "abr": 50.2,
+                "downloaded_bytes": 1520000
             }
         }
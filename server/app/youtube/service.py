@@ -1,13 +1,45 @@
 import yt_dlp
+from yt_dlp.utils import download_range_func
 import os
-from pathlib import Path
+import httpx
+from collections import OrderedDict
+from typing import Optional
+from app.artifacts import ArtifactStore
+from app.metrics import DOWNLOAD_BYTES_TOTAL
 from app.youtube.schemas import YouTubeInfo
+from app.youtube.captions import assess_quality, parse_json3, parse_vtt, select_track, speech_segments
+from app.whisperx.schemas import STTResponse, TranscriptionSegment
+from app.whisperx.tiering import CAPTION_TIER
 from fastapi import HTTPException
 
+# get_info 결과를 자막 조회에 재사용하기 위해 보관하는 최근 영상 수
+_INFO_CACHE_SIZE = 64
+
 class YouTubeService:
     def __init__(self):
-        self.download_dir = Path("downloads")
-        self.download_dir.mkdir(exist_ok=True)
+        self.artifacts = ArtifactStore.get_instance()
+        self.download_dir = self.artifacts.root
+        self._info_cache: "OrderedDict[str, dict]" = OrderedDict()
+        # 자막 우선 모드: 쓸 만한 자막 트랙이 있으면 다운로드/STT 없이 자막을 전사 결과로 사용
+        self.caption_first = os.getenv("CAPTION_FIRST", "0") == "1"
+        self.caption_languages = [
+            lang.strip() for lang in os.getenv("CAPTION_LANGUAGES", "ko,en").split(",") if lang.strip()
+        ]
+        self.caption_allow_auto = os.getenv("CAPTION_ALLOW_AUTO", "1") == "1"
+        # 다운로드 프로필
+        #   asr: ASR에 충분한 가장 작은 오디오 전용 포맷 + 16kHz mono WAV 변환 (기본)
+        #   best: 최고 음질 오디오 (기존 동작)
+        self.download_profile = os.getenv("DOWNLOAD_PROFILE", "asr")
+        self.download_min_abr = int(os.getenv("DOWNLOAD_MIN_ABR", "48"))
+        self.download_fragments = int(os.getenv("DOWNLOAD_CONCURRENT_FRAGMENTS", "4"))
+        # 0보다 크면 앞부분 N초만 다운로드 (빠른 판정용, 요청별 max_seconds가 우선)
+        self.download_max_seconds = int(os.getenv("DOWNLOAD_MAX_SECONDS", "0"))
+
+    def _remember_info(self, url: str, info: dict):
+        self._info_cache[url] = info
+        self._info_cache.move_to_end(url)
+        while len(self._info_cache) > _INFO_CACHE_SIZE:
+            self._info_cache.popitem(last=False)
 
     async def get_info(self, url: str) -> YouTubeInfo:
         """YouTube 영상 정보 가져오기"""
@@ -21,6 +53,7 @@ class YouTubeService:
 
         with yt_dlp.YoutubeDL(ydl_opts) as ydl:
             info = ydl.extract_info(url, download=False)
+            self._remember_info(url, info)
 
             youtube_info = YouTubeInfo(
                 title=info.get('title'),
@@ -33,30 +66,148 @@ class YouTubeService:
 
             return youtube_info
     
-    async def download_audio(self, url: str) -> dict:
-        """YouTube 영상을 WAV로 다운로드"""
-        output_path = self.download_dir / '%(id)s.%(ext)s'
+    def _clip_seconds(self, max_seconds: Optional[int]) -> Optional[int]:
+        seconds = max_seconds if max_seconds is not None else self.download_max_seconds
+        return seconds if seconds and seconds > 0 else None
+
+    def _audio_filename(self, video_id: str, max_seconds: Optional[int]) -> str:
+        # 앞부분만 받은 오디오는 전체 오디오와 다른 파일 (STT 캐시가 섞이지 않도록)
+        clip = self._clip_seconds(max_seconds)
+        return f"{video_id}.first{clip}s.wav" if clip else f"{video_id}.wav"
+
+    def audio_path(self, url: str, max_seconds: Optional[int] = None) -> Optional[str]:
+        """download_audio가 만들 WAV 경로 (get_info로 조회한 영상만, 모르면 None)"""
+        info = self._info_cache.get(url)
+        if not info or not info.get('id'):
+            return None
+        return str(self.download_dir / self._audio_filename(info['id'], max_seconds))
+
+    def _download_options(self, max_seconds: Optional[int]) -> dict:
+        """다운로드 프로필에 맞는 yt-dlp 옵션"""
+        if self.download_profile == "best":
+            ydl_opts = {
+                'format': 'bestaudio/best',
+                'postprocessors': [{
+                    'key': 'FFmpegExtractAudio',
+                    'preferredcodec': 'wav',
+                }],
+            }
+        else:
+            # Whisper는 16kHz mono로 다시 샘플링하므로 높은 비트레이트는 버려지는 바이트
+            # 최소 비트레이트 이상인 오디오 전용 포맷 중 가장 작은 것 -> 없으면 가장 작은 오디오 -> 통합 포맷
+            ydl_opts = {
+                'format': f'bestaudio[abr>={self.download_min_abr}]/bestaudio/best',
+                'format_sort': ['+abr', '+size', 'acodec:opus'],
+                'concurrent_fragment_downloads': self.download_fragments,
+                'postprocessors': [{
+                    'key': 'FFmpegExtractAudio',
+                    'preferredcodec': 'wav',
+                }],
+                # WAV도 16kHz mono로 저장 (디스크 사용량 약 1/6)
+                'postprocessor_args': {'extractaudio': ['-ar', '16000', '-ac', '1']},
+            }
+
+        clip = self._clip_seconds(max_seconds)
+        if clip:
+            ydl_opts['download_ranges'] = download_range_func(None, [(0, clip)])
+        return ydl_opts
+
+    async def download_audio(self, url: str, max_seconds: Optional[int] = None) -> dict:
+        """
+        YouTube 영상을 WAV로 다운로드
+
+        Args:
+            url: YouTube 영상 URL
+            max_seconds: 앞부분 N초만 다운로드 (None이면 DOWNLOAD_MAX_SECONDS, 0이면 전체)
+
+        Returns:
+            dict: file_path, title, duration, format_id, abr, downloaded_bytes
+        """
+        clip = self._clip_seconds(max_seconds)
+        output_name = f'%(id)s.first{clip}s.%(ext)s' if clip else '%(id)s.%(ext)s'
+        output_path = self.download_dir / output_name
+
+        # 작업별 전송 바이트 (조각 다운로드면 조각별 진행 상황을 합산)
+        transferred = {}
+
+        def progress_hook(progress: dict):
+            if progress.get('status') in ('downloading', 'finished'):
+                key = progress.get('filename') or progress.get('tmpfilename')
+                transferred[key] = progress.get('downloaded_bytes') or progress.get('total_bytes') or 0
 
         ydl_opts = {
-            'format': 'bestaudio/best',
-            'postprocessors': [{
-                'key': 'FFmpegExtractAudio',
-                'preferredcodec': 'wav',
-            }],
+            **self._download_options(max_seconds),
             'outtmpl': str(output_path),
             'quiet': True,
             'no_warnings': True,
             'noprogress': True,
+            'progress_hooks': [progress_hook],
             'extractor_args': {'youtube': {'skip': ['hls', 'dash']}},
         }
         
         with yt_dlp.YoutubeDL(ydl_opts) as ydl:
             info = ydl.extract_info(url, download=True)
             video_id = info.get('id')
-            file_path = self.download_dir / f"{video_id}.wav"
+            file_path = self.download_dir / self._audio_filename(video_id, max_seconds)
+            self.artifacts.register(str(file_path))
+
+            downloaded_bytes = sum(transferred.values())
+            DOWNLOAD_BYTES_TOTAL.labels(profile=self.download_profile).inc(downloaded_bytes)
+            print(f"Downloaded {video_id}: format {info.get('format_id')} "
+                  f"({info.get('abr') or '?'}kbps), {downloaded_bytes / (1024 * 1024):.1f}MB transferred")
             
             return {
                 "file_path": str(file_path),
                 "title": info.get('title'),
-                "duration": info.get('duration'),
-            }
\ No newline at end of file
+                "duration": min(info.get('duration'), clip) if clip and info.get('duration') else info.get('duration'),
+                "format_id": info.get('format_id'),
+                "abr": info.get('abr'),
+                "downloaded_bytes": downloaded_bytes,
+            }
+
+    async def get_caption_transcript(self, url: str) -> Optional[STTResponse]:
+        """
+        자막 트랙을 전사 결과로 변환 (CAPTION_FIRST=1 일 때만)
+
+        Args:
+            url: YouTube 영상 URL
+
+        Returns:
+            Optional[STTResponse]: 자막 기반 전사 결과 (자막이 없거나 품질 기준 미달이면 None -> WhisperX 사용)
+        """
+        if not self.caption_first:
+            return None
+
+        info = self._info_cache.get(url)
+        if info is None:
+            await self.get_info(url)
+            info = self._info_cache.get(url, {})
+
+        track = select_track(info, self.caption_languages, self.caption_allow_auto)
+        if track is None:
+            print("No usable caption track - falling back to STT")
+            return None
+
+        try:
+            async with httpx.AsyncClient(timeout=10.0) as client:
+                response = await client.get(track.url)
+                response.raise_for_status()
+            segments = parse_json3(response.json()) if track.ext == "json3" else parse_vtt(response.text)
+        except Exception as e:
+            print(f"Caption fetch failed ({track.language}/{track.kind}): {e} - falling back to STT")
+            return None
+
+        quality = assess_quality(segments, info.get("duration"), track)
+        print(f"Caption track {track.language}/{track.kind}: {quality.reason} "
+              f"(coverage {quality.coverage:.2f}, {quality.speech_segments} segments)")
+        if not quality.accepted:
+            return None
+
+        transcript = [TranscriptionSegment(**seg) for seg in speech_segments(segments)]
+        return STTResponse(
+            language=track.language,
+            segments=transcript,
+            full_text=" ".join(seg.text for seg in transcript),
+            model_size=f"captions:{track.kind}",
+            tier=CAPTION_TIER,
+        )
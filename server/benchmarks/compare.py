@@ -0,0 +1,72 @@
+"""
+두 벤치마크 결과 비교
+
+사용 예:
+    python -m benchmarks.compare benchmarks/results/base.json benchmarks/results/head.json --threshold 0.1
+
+지연시간(p50/p95)이 threshold 비율 이상 늘었거나 처리량이 그만큼 줄었으면 종료 코드 1
+"""
+
+import argparse
+import json
+import sys
+
+
+def _load(path: str) -> dict:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _delta(old: float, new: float) -> float:
+    if not old:
+        return 0.0
+    return (new - old) / old
+
+
+def compare(base: dict, head: dict, threshold: float) -> list[str]:
+    """회귀 항목 목록을 반환하며 비교 표를 출력"""
+    regressions = []
+    print(f"base {base['meta']['commit']}  →  head {head['meta']['commit']}")
+    for scenario, head_result in head["scenarios"].items():
+        base_result = base["scenarios"].get(scenario)
+        if base_result is None:
+            continue
+        print(f"\n[{scenario}]")
+
+        rows = [("throughput_jobs_per_sec", base_result["throughput_jobs_per_sec"],
+                 head_result["throughput_jobs_per_sec"], True)]
+        for q in ("p50", "p95"):
+            rows.append((f"job_latency.{q}", base_result["job_latency"][q], head_result["job_latency"][q], False))
+        for stage, stats in head_result["stages"].items():
+            base_stats = base_result["stages"].get(stage)
+            if base_stats:
+                rows.append((f"{stage}.p50", base_stats["p50"], stats["p50"], False))
+                rows.append((f"{stage}.p95", base_stats["p95"], stats["p95"], False))
+
+        for name, old, new, higher_is_better in rows:
+            change = _delta(old, new)
+            worse = -change if higher_is_better else change
+            flag = "  REGRESSION" if worse > threshold else ""
+            print(f"  {name:32s} {old:>10.4f} → {new:>10.4f}  ({change:+.1%}){flag}")
+            if flag:
+                regressions.append(f"{scenario}.{name}")
+
+    print(f"\npeak RSS: {base['peak_rss_mb']} MB → {head['peak_rss_mb']} MB")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="벤치마크 결과 비교")
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument("--threshold", type=float, default=0.10, help="회귀로 볼 상대 변화량")
+    args = parser.parse_args()
+
+    regressions = compare(_load(args.base), _load(args.head), args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+"""
+분석 파이프라인 E2E 벤치마크
+
+analyze_video (/api/analysis), transcribe_with_graph (/api/stt/transcribe-with-graph), ask_llm (/ask)를
+fixture와 대역 백엔드(yt-dlp, LLM, 선택적으로 WhisperX)로 N개 동시 작업 실행하고
+단계별 지연시간, 처리량, 최대 RSS, 이벤트 루프 지연을 JSON으로 저장
+
+사용 예 (server/ 에서 실행):
+    python -m benchmarks.run_pipeline --fake-stt --jobs 16 --concurrency 4
+    python -m benchmarks.run_pipeline --scenario analysis --jobs 4 --concurrency 2   # 실제 WhisperX
+    python -m benchmarks.compare benchmarks/results/old.json benchmarks/results/new.json
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List
+
+SERVER_DIR = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+SCENARIOS = ("analysis", "graph", "ask")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="분석 파이프라인 벤치마크")
+    parser.add_argument("--scenario", choices=SCENARIOS + ("all",), default="all")
+    parser.add_argument("--jobs", type=int, default=8, help="시나리오별 총 작업 수")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시 실행 작업 수")
+    parser.add_argument("--fixtures", nargs="*", help="사용할 fixture 이름 (기본: 전부)")
+    parser.add_argument("--fake-stt", action="store_true", help="WhisperX 대신 fixture 전사 결과 사용")
+    parser.add_argument("--stt-rtf", type=float, default=0.0, help="--fake-stt 시 전사 real-time factor")
+    parser.add_argument("--download-latency", type=float, default=0.0, help="가짜 다운로드 지연 (초)")
+    parser.add_argument("--llm-latency", default="lognormal:0.3,0.3", help="stand-in LLM 지연 분포")
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", default="0")
+    parser.add_argument("--verdict-cache", action="store_true", help="판정 캐시 사용 (기본: 비활성)")
+    parser.add_argument("--graph-cache", action="store_true", help="논증 그래프 캐시 사용 (기본: 비활성)")
+    parser.add_argument("--ask-triage", action="store_true", help="/ask check-worthiness triage 사용 (기본: 비활성)")
+    parser.add_argument("--judge-batch", action="store_true", help="/ask 배치 판정 사용 (기본: claim별 요청)")
+    parser.add_argument("--graph-long-range", action="store_true", help="임베딩 기반 장거리 관계 후보 쌍 사용 (기본: 인접 쌍만)")
+    parser.add_argument("--resegment", action="store_true", help="분류 전 문장 단위 재분할 사용 (기본: 비활성)")
+    parser.add_argument("--output", help="결과 JSON 경로 (기본: benchmarks/results/<commit>-<시각>.json)")
+    return parser.parse_args()
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=SERVER_DIR, text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except Exception:
+        return "unknown"
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, round(q * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def _describe(values: List[float]) -> dict:
+    return {
+        "count": len(values),
+        "mean": round(statistics.fmean(values), 4) if values else 0.0,
+        "p50": round(_percentile(values, 0.50), 4),
+        "p95": round(_percentile(values, 0.95), 4),
+        "max": round(max(values), 4) if values else 0.0,
+    }
+
+
+class LoopLagSampler:
+    """주기적으로 sleep 하고 예정보다 늦게 깨어난 시간을 이벤트 루프 지연으로 기록"""
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.samples: List[float] = []
+        self._task: asyncio.Task | None = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, loop.time() - expected))
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> dict:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        return _describe(self.samples)
+
+
+async def run_jobs(make_job: Callable[[int], Awaitable[None]], jobs: int, concurrency: int) -> dict:
+    """작업들을 동시성 제한 하에 실행하고 작업별 소요 시간/단계 기록 수집"""
+    from app.timing import record_stages
+
+    semaphore = asyncio.Semaphore(concurrency)
+    records: List[dict] = []
+
+    async def _one(index: int):
+        async with semaphore:
+            with record_stages() as recorder:
+                started = time.perf_counter()
+                error = None
+                try:
+                    await make_job(index)
+                except Exception as e:
+                    error = f"{type(e).__name__}: {e}"
+                records.append({
+                    "wall": time.perf_counter() - started,
+                    "stages": recorder.totals(),
+                    "error": error,
+                })
+
+    sampler = LoopLagSampler()
+    sampler.start()
+    started = time.perf_counter()
+    await asyncio.gather(*(_one(i) for i in range(jobs)))
+    elapsed = time.perf_counter() - started
+    loop_lag = await sampler.stop()
+
+    stage_names = sorted({name for r in records for name in r["stages"]})
+    ok = [r for r in records if r["error"] is None]
+    return {
+        "jobs": jobs,
+        "concurrency": concurrency,
+        "succeeded": len(ok),
+        "errors": sorted({r["error"] for r in records if r["error"]}),
+        "elapsed_seconds": round(elapsed, 4),
+        "throughput_jobs_per_sec": round(len(ok) / elapsed, 4) if elapsed else 0.0,
+        "job_latency": _describe([r["wall"] for r in ok]),
+        "stages": {
+            name: _describe([r["stages"][name] for r in ok if name in r["stages"]])
+            for name in stage_names
+        },
+        "event_loop_lag": loop_lag,
+    }
+
+
+def configure_environment(args: argparse.Namespace, workdir: Path):
+    """app import 전에 대역 백엔드와 캐시 경로 설정 (모듈 전역 싱글톤이 import 시 환경을 읽음)"""
+    os.environ.setdefault("LLM_BACKEND", "standin")
+    os.environ["STANDIN_LATENCY"] = args.llm_latency
+    os.environ["STANDIN_ERROR_RATE"] = str(args.llm_error_rate)
+    os.environ["STANDIN_SEED"] = args.seed
+    os.environ["VERDICT_CACHE_ENABLED"] = "1" if args.verdict_cache else "0"
+    os.environ["GRAPH_CACHE"] = "1" if args.graph_cache else "0"
+    os.environ["ASK_TRIAGE"] = "1" if args.ask_triage else "0"
+    os.environ["JUDGE_BATCH"] = "1" if args.judge_batch else "0"
+    os.environ["GRAPH_LONG_RANGE"] = "1" if args.graph_long_range else "0"
+    os.environ["RESEGMENT"] = "1" if args.resegment else "0"
+    os.environ.setdefault("GEMINI_MODEL", "gemini-2.5-flash")
+    # 캐시/다운로드 디렉토리가 매 실행마다 비어 있도록 임시 작업 디렉토리 사용
+    os.chdir(workdir)
+    sys.path.insert(0, str(SERVER_DIR))
+
+
+async def main_async(args: argparse.Namespace) -> dict:
+    from benchmarks import stubs
+
+    fixtures = stubs.load_fixtures(args.fixtures, require_audio=not args.fake_stt)
+    if not fixtures:
+        raise SystemExit("사용할 fixture가 없습니다 (실제 STT 측정에는 fixtures/audio/<name>.wav 필요)")
+
+    youtube = stubs.FakeYouTubeService(fixtures, Path("downloads"), args.download_latency)
+
+    if args.fake_stt:
+        # 라우터 모듈이 import 시 get_instance()로 싱글톤을 잡으므로 먼저 대역을 심어 둠
+        from app.whisperx.service import WhisperXService
+        WhisperXService._instance = stubs.FakeWhisperXService(youtube, args.stt_rtf)
+
+    # app.analysis 패키지는 APIRouter 객체를 'router'로 재노출하므로 모듈은 import_module로 가져옴
+    analysis_router = importlib.import_module("app.analysis.router")
+    whisperx_router = importlib.import_module("app.whisperx.router")
+    ask_module = importlib.import_module("app.llm.ask")
+    from app.whisperx.schemas import STTRequest
+
+    analysis_router.youtube_service = youtube
+
+    async def _no_socket(payload: dict) -> dict:
+        return {"sent": False, "via": None, "error": "disabled in benchmark"}
+    ask_module._emit_to_socket = _no_socket
+
+    def _fixture(index: int) -> "stubs.Fixture":
+        return fixtures[index % len(fixtures)]
+
+    async def analysis_job(index: int):
+        await analysis_router.analyze_video(videoURL=stubs.fixture_url(_fixture(index), index), maxSeconds=None)
+
+    async def graph_job(index: int):
+        download = await youtube.download_audio(stubs.fixture_url(_fixture(index), index))
+        await whisperx_router.transcribe_with_graph(
+            STTRequest(file_path=download["file_path"], language=_fixture(index).transcript.get("language", "ko"))
+        )
+
+    async def ask_job(index: int):
+        fixture = _fixture(index)
+        nodes = [
+            ask_module.Node(
+                id=f"seg_{i + 1}",
+                start=seg["start"],
+                end=seg["end"],
+                text=seg["text"],
+                classification=stubs.classify_fixture_segment(seg["text"]),
+            )
+            for i, seg in enumerate(fixture.transcript["segments"])
+        ]
+        await ask_module.ask_llm(ask_module.AskRequest(argument_graph=ask_module.ArgumentGraph(nodes=nodes, edges=[])))
+
+    jobs: Dict[str, Callable[[int], Awaitable[None]]] = {
+        "analysis": analysis_job,
+        "graph": graph_job,
+        "ask": ask_job,
+    }
+    selected = SCENARIOS if args.scenario == "all" else (args.scenario,)
+
+    results = {}
+    for name in selected:
+        print(f"[bench] {name}: {args.jobs} jobs, concurrency {args.concurrency}")
+        results[name] = await run_jobs(jobs[name], args.jobs, args.concurrency)
+        summary = results[name]
+        print(f"[bench] {name}: {summary['throughput_jobs_per_sec']} jobs/s, "
+              f"p95 {summary['job_latency']['p95']}s, errors {len(summary['errors'])}")
+
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "fixtures": [f.name for f in fixtures],
+            "args": vars(args),
+        },
+        "scenarios": results,
+        # Linux에서 ru_maxrss 단위는 KB
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def main():
+    args = parse_args()
+    output = Path(args.output).resolve() if args.output else None
+    with tempfile.TemporaryDirectory(prefix="bench-") as workdir:
+        configure_environment(args, Path(workdir))
+        report = asyncio.run(main_async(args))
+        os.chdir(SERVER_DIR)
+
+    if output is None:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        output = RESULTS_DIR / f"{report['meta']['commit']}-{stamp}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"[bench] peak RSS {report['peak_rss_mb']} MB")
+    print(f"[bench] results saved: {output}")
+
+
+if __name__ == "__main__":
+    main()
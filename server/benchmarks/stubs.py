@@ -0,0 +1,153 @@
+"""
+벤치마크용 yt-dlp / WhisperX 대역 구현
+fixture 이름으로 URL을 만들고 (fixture://<name>/<job>), 다운로드/전사를 흉내냄
+"""
+
+import asyncio
+import json
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from app.timing import stage
+from app.whisperx.schemas import STTResponse, TranscriptionSegment
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+@dataclass
+class Fixture:
+    """전사 결과(필수)와 원본 오디오(선택) 한 쌍"""
+    name: str
+    transcript: dict
+    audio_path: Optional[Path]
+
+    @property
+    def duration(self) -> float:
+        segments = self.transcript.get("segments", [])
+        return float(self.transcript.get("duration") or (segments[-1]["end"] if segments else 0.0))
+
+
+def load_fixtures(names: Optional[List[str]] = None, require_audio: bool = False) -> List[Fixture]:
+    """
+    fixtures/transcripts/*.json 과 fixtures/audio/<같은 이름>.wav 를 읽어 fixture 목록 생성
+
+    Args:
+        names: 사용할 fixture 이름들 (None이면 전부)
+        require_audio: 오디오 파일이 없는 fixture 제외 (실제 WhisperX 측정 시)
+    """
+    fixtures = []
+    for path in sorted((FIXTURES_DIR / "transcripts").glob("*.json")):
+        name = path.stem
+        if names and name not in names:
+            continue
+        audio = FIXTURES_DIR / "audio" / f"{name}.wav"
+        audio_path = audio if audio.exists() else None
+        if require_audio and audio_path is None:
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            fixtures.append(Fixture(name=name, transcript=json.load(f), audio_path=audio_path))
+    return fixtures
+
+
+def fixture_url(fixture: Fixture, job_index: int) -> str:
+    return f"fixture://{fixture.name}/{job_index}"
+
+
+class FakeYouTubeService:
+    """yt-dlp 대신 fixture를 '다운로드'하는 YouTubeService 대역"""
+
+    def __init__(self, fixtures: List[Fixture], download_dir: Path, download_latency: float = 0.0):
+        self.fixtures = {f.name: f for f in fixtures}
+        self.download_dir = download_dir
+        self.download_dir.mkdir(parents=True, exist_ok=True)
+        self.download_latency = download_latency
+        self.transcripts_by_path: Dict[str, Fixture] = {}
+
+    def _resolve(self, url: str) -> tuple[Fixture, str]:
+        name, _, job = url.removeprefix("fixture://").partition("/")
+        return self.fixtures[name], job or "0"
+
+    async def get_info(self, url: str):
+        # app.youtube 패키지는 import 시 WhisperX 싱글톤을 만들므로 대역 설치 후에 import
+        from app.youtube.schemas import YouTubeInfo
+
+        fixture, _ = self._resolve(url)
+        return YouTubeInfo(
+            title=f"[bench] {fixture.name}",
+            duration=int(fixture.duration),
+            uploader="benchmark",
+            thumbnail=None,
+            description=None,
+            view_count=0,
+        )
+
+    async def get_caption_transcript(self, url: str):
+        # 벤치마크는 다운로드 + STT 경로를 측정
+        return None
+
+    def audio_path(self, url: str, max_seconds=None):
+        # 작업마다 새로 다운로드하므로 미리 알 수 있는 경로 없음
+        return None
+
+    async def download_audio(self, url: str, max_seconds=None) -> dict:
+        fixture, job = self._resolve(url)
+        if self.download_latency:
+            await asyncio.sleep(self.download_latency)
+        # 작업마다 다른 경로를 써서 STT 캐시가 작업 간에 공유되지 않도록 함
+        target = self.download_dir / f"{fixture.name}-{job}.wav"
+        if fixture.audio_path is not None:
+            shutil.copyfile(fixture.audio_path, target)
+        else:
+            target.write_bytes(b"")
+        self.transcripts_by_path[str(target)] = fixture
+        return {
+            "file_path": str(target),
+            "title": f"[bench] {fixture.name}",
+            "duration": int(fixture.duration),
+            "downloaded_bytes": target.stat().st_size,
+        }
+
+
+class FakeWhisperXService:
+    """
+    모델을 로드하지 않고 fixture 전사 결과를 반환하는 WhisperXService 대역
+
+    rtf(real-time factor) 만큼 오디오 길이에 비례해 대기하여 전사 시간을 흉내냄
+    """
+
+    def __init__(self, youtube: FakeYouTubeService, rtf: float = 0.0):
+        self.youtube = youtube
+        self.rtf = rtf
+
+    async def transcribe_audio(self, file_path: str, language: Optional[str] = None,
+                               model_size: str = "large-v2", **kwargs) -> STTResponse:
+        fixture = self.youtube.transcripts_by_path[file_path]
+        with stage("load_audio"):
+            pass
+        with stage("transcribe", model_size="fake"):
+            if self.rtf:
+                await asyncio.sleep(fixture.duration * self.rtf)
+        segments = [TranscriptionSegment(**seg) for seg in fixture.transcript["segments"]]
+        return STTResponse(
+            segments=segments,
+            full_text=fixture.transcript["full_text"],
+            model_size=model_size,
+            tier=kwargs.get("tier", "final"),
+        )
+
+    def has_alignment(self, file_path: str, stt: STTResponse, language: Optional[str] = None) -> bool:
+        # 정렬은 흉내내지 않음
+        return False
+
+    def get_loaded_models_info(self):
+        return {"whisper_models": [], "align_models": [], "device": "fake", "compute_type": "fake"}
+
+    def cleanup_models(self):
+        pass
+
+
+def classify_fixture_segment(text: str) -> str:
+    """/ask 시나리오용 간이 분류 (숫자가 있으면 FACT)"""
+    return "FACT" if any(ch.isdigit() for ch in text) else "CLAIM"
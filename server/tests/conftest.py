@@ -0,0 +1,8 @@
+import os
+import tempfile
+
+# import 시점에 만들어지는 싱글톤(오디오 보관소 등)이 저장소의 downloads/, cache/에 쓰지 않도록 임시 디렉토리 사용
+_TMP_DIR = tempfile.mkdtemp(prefix="server-tests-")
+os.environ.setdefault("ARTIFACT_DIR", os.path.join(_TMP_DIR, "downloads"))
+os.environ.setdefault("ARTIFACT_INDEX_PATH", os.path.join(_TMP_DIR, "artifacts", "index.json"))
+os.environ.setdefault("VERDICT_CACHE_PATH", "")
@@ -0,0 +1,126 @@
+import asyncio
+
+import pytest
+
+from app.analysis.admission import LONG_LANE, SHORT_LANE, AdmissionController, AdmissionRejected
+
+
+@pytest.fixture
+def controller(monkeypatch):
+    monkeypatch.setenv("ADMISSION_ENABLED", "1")
+    monkeypatch.setenv("ADMISSION_AUDIO_MINUTES_BUDGET", "10")
+    monkeypatch.setenv("ADMISSION_SHORT_RESERVED_MINUTES", "2")
+    monkeypatch.setenv("ADMISSION_SHORT_SECONDS", "60")
+    monkeypatch.setenv("ADMISSION_MIN_COST_MINUTES", "0.5")
+    monkeypatch.setenv("ADMISSION_MAX_WAIT_SECONDS", "100000")
+    monkeypatch.setenv("ADMISSION_MAX_DURATION_SECONDS", "3600")
+    return AdmissionController()
+
+
+def test_lane_and_cost(controller):
+    assert controller.lane_for(60) == SHORT_LANE
+    assert controller.lane_for(600) == LONG_LANE
+    assert controller.lane_for(None) == LONG_LANE
+    assert controller.cost_for(6) == 0.5
+    assert controller.cost_for(120) == 2
+    # 예산보다 큰 작업도 혼자서는 돌 수 있도록 예산으로 상한
+    assert controller.cost_for(3000) == 10
+
+
+def test_shorts_are_dispatched_before_long_jobs(controller):
+    started = []
+
+    async def job(name, duration, done):
+        async with controller.admit(duration):
+            started.append(name)
+            await done.wait()
+
+    async def run():
+        events = {name: asyncio.Event() for name in ("long1", "long2", "short1", "short2", "short3")}
+        tasks = {}
+
+        def start(name, duration):
+            tasks[name] = asyncio.create_task(job(name, duration, events[name]))
+
+        start("long1", 8 * 60)
+        await asyncio.sleep(0)
+        start("long2", 90)  # 8 + 1.5분은 예산 안이지만 Shorts 전용 2분을 쓸 수 없어 대기
+        await asyncio.sleep(0)
+        start("short1", 60)
+        start("short2", 60)
+        start("short3", 60)  # 예산 10분을 다 써서 대기
+        await asyncio.sleep(0)
+        assert started == ["long1", "short1", "short2"]
+        assert [len(controller.queues[SHORT_LANE]), len(controller.queues[LONG_LANE])] == [1, 1]
+
+        events["short1"].set()
+        await tasks["short1"]
+        await asyncio.sleep(0)
+        assert started[-1] == "short3"
+        assert "long2" not in started
+
+        events["long1"].set()
+        await tasks["long1"]
+        await asyncio.sleep(0)
+        assert started[-1] == "long2"
+
+        for name in ("short2", "short3", "long2"):
+            events[name].set()
+        await asyncio.gather(*tasks.values())
+        assert controller.in_flight == 0
+        assert controller.in_flight_minutes == 0
+
+    asyncio.run(run())
+
+
+def test_failed_on_queued_returns_ticket(controller):
+    async def on_queued(info):
+        raise ConnectionError("socket closed")
+
+    async def run():
+        hold = asyncio.Event()
+
+        async def long_job():
+            async with controller.admit(10 * 60):
+                await hold.wait()
+
+        holder = asyncio.create_task(long_job())
+        await asyncio.sleep(0)
+        with pytest.raises(ConnectionError):
+            async with controller.admit(5 * 60, on_queued=on_queued):
+                pass
+        assert not controller.queues[LONG_LANE]
+        hold.set()
+        await holder
+        assert controller.in_flight == 0
+        async with controller.admit(5 * 60) as ticket:
+            assert ticket.waited < 1
+
+    asyncio.run(run())
+
+
+def test_rejects_too_long_and_full_queue(controller, monkeypatch):
+    async def run():
+        with pytest.raises(AdmissionRejected) as excinfo:
+            async with controller.admit(2 * 3600):
+                pass
+        assert excinfo.value.status_code == 413
+
+        controller.max_queue[LONG_LANE] = 0
+        hold = asyncio.Event()
+
+        async def long_job():
+            async with controller.admit(10 * 60):
+                await hold.wait()
+
+        holder = asyncio.create_task(long_job())
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected) as excinfo:
+            async with controller.admit(5 * 60):
+                pass
+        assert excinfo.value.status_code == 429
+        assert excinfo.value.retry_after >= 1
+        hold.set()
+        await holder
+
+    asyncio.run(run())
@@ -0,0 +1,53 @@
+import pytest
+
+from app.artifacts import ArtifactEvictedError, ArtifactStore
+
+
+@pytest.fixture
+def make_store(tmp_path, monkeypatch):
+    monkeypatch.setenv("ARTIFACT_DIR", str(tmp_path / "downloads"))
+    monkeypatch.setenv("ARTIFACT_INDEX_PATH", str(tmp_path / "index.json"))
+    monkeypatch.setenv("ARTIFACT_DELETE_AFTER_TRANSCRIPT", "1")
+
+    def make(align_mode):
+        monkeypatch.setenv("WHISPERX_ALIGN_MODE", align_mode)
+        store = ArtifactStore()
+        path = store.root / "clip.wav"
+        path.write_bytes(b"\0" * 1024)
+        store.register(str(path))
+        return store, path
+
+    return make
+
+
+def test_lazy_mode_deletes_after_transcript(make_store):
+    store, path = make_store("lazy")
+    store.mark_transcribed(str(path))
+    assert not path.exists()
+    # 삭제 전 stat으로 캐시 키를 계속 만들 수 있음
+    assert store.fingerprint(str(path)) is not None
+    with pytest.raises(ArtifactEvictedError):
+        store.ensure_available(str(path))
+
+
+def test_background_mode_waits_for_alignment(make_store):
+    store, path = make_store("background")
+    store.mark_transcribed(str(path))
+    assert path.exists()
+    store.mark_aligned(str(path))
+    assert not path.exists()
+
+
+def test_pinned_file_is_deleted_on_release(make_store):
+    store, path = make_store("lazy")
+    with store.pin(str(path)):
+        store.mark_transcribed(str(path))
+        assert path.exists()
+    assert not path.exists()
+
+
+def test_missing_file_that_was_never_stored(make_store):
+    store, path = make_store("lazy")
+    with pytest.raises(FileNotFoundError) as excinfo:
+        store.ensure_available(str(store.root / "other.wav"))
+    assert not isinstance(excinfo.value, ArtifactEvictedError)
@@ -0,0 +1,87 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.whisperx.batcher import InferenceBatcher, _BatchItem
+
+
+class _Model:
+    pass
+
+
+@pytest.fixture
+def batcher(monkeypatch):
+    monkeypatch.setenv("WHISPERX_BATCH_WINDOW_MS", "1")
+    batcher = InferenceBatcher()
+    monkeypatch.setattr(batcher, "_tokenizer", lambda model, model_size, language: None)
+    return batcher
+
+
+def _submit(queue, features):
+    future = asyncio.get_running_loop().create_future()
+    queue.items.append(_BatchItem(features, future))
+    queue.wakeup.set()
+    return future
+
+
+def test_decodes_queued_items(batcher, monkeypatch):
+    monkeypatch.setattr(batcher, "_decode", lambda model, tokenizer, features: [f"text-{f}" for f in features])
+
+    async def run():
+        queue = batcher._queue_for(_Model(), "base", "ko")
+        futures = [_submit(queue, i) for i in range(3)]
+        return await asyncio.wait_for(asyncio.gather(*futures), 2)
+
+    assert asyncio.run(run()) == ["text-0", "text-1", "text-2"]
+
+
+def test_cancelled_drain_fails_pending_futures(batcher, monkeypatch):
+    release = threading.Event()
+
+    def decode(model, tokenizer, features):
+        release.wait(2)
+        return ["late"] * len(features)
+
+    monkeypatch.setattr(batcher, "_decode", decode)
+
+    async def run():
+        queue = batcher._queue_for(_Model(), "base", "ko")
+        decoding = _submit(queue, 0)
+        await asyncio.sleep(0.05)
+        waiting = _submit(queue, 1)
+        queue.task.cancel()
+        results = await asyncio.wait_for(asyncio.gather(decoding, waiting, return_exceptions=True), 2)
+        release.set()
+        return results
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_reloaded_model_drains_old_queue(batcher, monkeypatch):
+    release = threading.Event()
+
+    def decode(model, tokenizer, features):
+        release.wait(2)
+        return [f"{model.name}-{f}" for f in features]
+
+    monkeypatch.setattr(batcher, "_decode", decode)
+    old_model, new_model = _Model(), _Model()
+    old_model.name, new_model.name = "old", "new"
+
+    async def run():
+        old_queue = batcher._queue_for(old_model, "base", "ko")
+        decoding = _submit(old_queue, 0)
+        await asyncio.sleep(0.05)
+        waiting = _submit(old_queue, 1)
+        # 모델이 내려갔다 다시 로드됨
+        new_queue = batcher._queue_for(new_model, "base", "ko")
+        assert new_queue is not old_queue
+        fresh = _submit(new_queue, 2)
+        release.set()
+        results = await asyncio.wait_for(asyncio.gather(decoding, waiting, fresh), 2)
+        await asyncio.wait_for(old_queue.task, 2)
+        return results
+
+    assert asyncio.run(run()) == ["old-0", "old-1", "new-2"]
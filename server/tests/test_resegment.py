@@ -0,0 +1,54 @@
+import pytest
+
+from app.whisperx.resegment import _is_korean_ending, resegment
+from app.whisperx.schemas import AlignedSegment, TranscriptionSegment, WordTiming
+
+
+def _seg(start, end, text):
+    return TranscriptionSegment(start=start, end=end, text=text)
+
+
+@pytest.mark.parametrize("word", ["했다", "하겠다", "먹는다", "중요하다", "없다", "합니다", "그렇습니까", "좋아요", "맞죠"])
+def test_verbal_endings(word):
+    assert _is_korean_ending(word)
+
+
+@pytest.mark.parametrize("word", ["필요", "중요", "바다", "판다", "사이다", "그리고", "경제는"])
+def test_nouns_and_connectives_are_not_endings(word):
+    assert not _is_korean_ending(word)
+
+
+def test_merges_fragments_and_splits_on_punctuation():
+    sentences = resegment([
+        _seg(0.0, 2.0, "물가가 많이"),
+        _seg(2.0, 6.0, "올랐습니다. 정부는 대책을 발표했습니다."),
+    ])
+    assert [s.text for s in sentences] == ["물가가 많이 올랐습니다.", "정부는 대책을 발표했습니다."]
+    assert sentences[0].start == 0.0
+    assert sentences[-1].end == 6.0
+    assert sentences[0].end == sentences[1].start
+
+
+def test_abbreviations_do_not_end_sentences():
+    sentences = resegment([_seg(0.0, 5.0, "Dr. Kim said the U.S. economy grew. Prices fell sharply.")])
+    assert [s.text for s in sentences] == ["Dr. Kim said the U.S. economy grew.", "Prices fell sharply."]
+
+
+def test_unpunctuated_korean_uses_verbal_endings():
+    sentences = resegment([_seg(0.0, 6.0, "물가가 많이 올랐다 정부는 대책이 필요하다고 말했다")])
+    assert [s.text for s in sentences] == ["물가가 많이 올랐다", "정부는 대책이 필요하다고 말했다"]
+
+
+def test_long_pause_splits_using_word_timestamps():
+    words = [
+        WordTiming(word="물가가", start=0.0, end=0.5),
+        WordTiming(word="오르고", start=0.6, end=1.0),
+        WordTiming(word="환율도", start=4.0, end=4.5),
+        WordTiming(word="올랐습니다.", start=4.6, end=5.2),
+    ]
+    segment = AlignedSegment(start=0.0, end=5.2, text="물가가 오르고 환율도 올랐습니다.", words=words)
+    sentences = resegment([segment])
+    assert [(s.text, s.start, s.end) for s in sentences] == [
+        ("물가가 오르고", 0.0, 1.0),
+        ("환율도 올랐습니다.", 4.0, 5.2),
+    ]
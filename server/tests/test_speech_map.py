@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from app.whisperx.audio_utils import SAMPLE_RATE
+from app.whisperx.speech_map import SpeechMap, build_speech_map
+
+
+@pytest.fixture
+def speech_map():
+    # 원본 60초 중 10~20초, 30~40초만 발화 (압축 오디오 0~10초, 10~20초)
+    return SpeechMap(duration=60.0, spans=[(10.0, 20.0), (30.0, 40.0)])
+
+
+def test_build_speech_map_pads_and_merges_short_gaps():
+    built = build_speech_map([(40.0, 50.0), (10.0, 20.0), (20.5, 25.0)], duration=52.0)
+    assert built.spans == [(9.75, 25.25), (39.75, 50.25)]
+    # 끝은 오디오 길이를 넘지 않음
+    assert build_speech_map([(50.0, 52.0)], duration=52.0).spans == [(49.75, 52.0)]
+
+
+def test_speech_seconds_and_skipped_ratio(speech_map):
+    assert speech_map.speech_seconds == 20.0
+    assert speech_map.skipped_ratio == pytest.approx(2 / 3)
+    assert SpeechMap(duration=0.0, spans=[]).skipped_ratio == 0.0
+
+
+def test_compact_keeps_only_speech(speech_map):
+    audio = np.arange(60 * SAMPLE_RATE, dtype=np.float32)
+    compacted = speech_map.compact(audio)
+    assert len(compacted) == 20 * SAMPLE_RATE
+    assert compacted[0] == 10 * SAMPLE_RATE
+    assert compacted[10 * SAMPLE_RATE] == 30 * SAMPLE_RATE
+
+
+@pytest.mark.parametrize("t, is_end, expected", [
+    (0.0, False, 10.0),
+    (5.0, False, 15.0),
+    (15.0, True, 35.0),
+    # 구간 경계: 시작이면 다음 구간 시작, 끝이면 이전 구간 끝
+    (10.0, False, 30.0),
+    (10.0, True, 20.0),
+    # 압축 오디오 끝을 넘는 시간은 마지막 구간 끝으로 제한
+    (25.0, True, 40.0),
+])
+def test_to_original(speech_map, t, is_end, expected):
+    assert speech_map.to_original(t, is_end=is_end) == expected
+
+
+def test_remap_segments_and_words(speech_map):
+    segments = [
+        {"start": 2.0, "end": 10.0, "text": "첫 문장", "words": [
+            {"word": "첫", "start": 2.0, "end": 2.5},
+            {"word": "문장", "start": 9.0, "end": 10.0},
+        ]},
+        {"start": 10.0, "end": 12.5, "text": "두 번째", "words": [{"word": "두", "start": None, "end": None}]},
+    ]
+    speech_map.remap_segments(segments)
+    assert (segments[0]["start"], segments[0]["end"]) == (12.0, 20.0)
+    assert [(w["start"], w["end"]) for w in segments[0]["words"]] == [(12.0, 12.5), (19.0, 20.0)]
+    assert (segments[1]["start"], segments[1]["end"]) == (30.0, 32.5)
+    assert segments[1]["words"][0]["start"] is None
+
+
+def test_empty_map_is_identity():
+    empty = SpeechMap(duration=30.0, spans=[])
+    assert empty.to_original(12.3) == 12.3
+
+
+def test_dict_round_trip(speech_map):
+    restored = SpeechMap.from_dict(speech_map.to_dict())
+    assert restored.spans == speech_map.spans
+    assert restored.to_original(15.0) == 35.0
@@ -0,0 +1,43 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.llm.triage import CheckWorthinessTriage, dedup_key
+
+
+def _nodes(*texts):
+    return [SimpleNamespace(id=f"n{i}", text=text, classification="FACT") for i, text in enumerate(texts)]
+
+
+@pytest.fixture
+def triage(monkeypatch):
+    monkeypatch.setenv("ASK_TRIAGE", "0")
+    return CheckWorthinessTriage()
+
+
+def test_dedup_key_only_collapses_whitespace():
+    assert dedup_key("  물가가   3.6%\n올랐다 ") == "물가가 3.6% 올랐다"
+    assert dedup_key("물가가 3.6% 올랐다") != dedup_key("물가가 36% 올랐다")
+
+
+@pytest.mark.parametrize("first, second", [
+    ("물가가 3.6% 올랐다", "물가가 36% 올랐다"),
+    ("철수가 영희를 때렸다", "철수를 영희가 때렸다"),
+])
+def test_different_claims_are_judged_separately(triage, first, second):
+    decisions = triage.select(_nodes(first, second))
+    assert [d.action for d in decisions] == ["judge", "judge"]
+    assert decisions[1].duplicate_of is None
+
+
+def test_same_text_is_judged_once(triage):
+    decisions = triage.select(_nodes("물가가 3.6% 올랐다", "물가가  3.6%  올랐다", "물가가 36% 올랐다"))
+    assert [d.action for d in decisions] == ["judge", "duplicate", "judge"]
+    assert decisions[1].duplicate_of == "n0"
+
+
+def test_duplicates_of_skipped_nodes_are_skipped(monkeypatch):
+    monkeypatch.setenv("ASK_TRIAGE", "1")
+    monkeypatch.setenv("ASK_TRIAGE_MIN_SCORE", "0.9")
+    decisions = CheckWorthinessTriage().select(_nodes("구독 부탁드려요", "구독 부탁드려요"))
+    assert [d.action for d in decisions] == ["skip", "skip"]
@@ -0,0 +1,56 @@
+import pytest
+
+from app.llm.verdict_cache import VerdictCache, claim_signature, normalize_claim
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    monkeypatch.setenv("VERDICT_CACHE_ENABLED", "1")
+    # n-gram 유사도만으로는 적중하는 임계값에서 수치/부정 표현 확인이 막는지 검사
+    return VerdictCache(similarity_threshold=0.5, persist_path="")
+
+
+def test_normalize_claim_ignores_spacing_particles_and_fillers():
+    assert normalize_claim("음, 물가가 올랐다.") == normalize_claim("물가  올랐다")
+    assert normalize_claim("한국은행이 금리를 올렸다") == "한국은행금리올렸다"
+
+
+def test_claim_signature_extracts_numbers_and_negation():
+    assert claim_signature("관객이 3,600명 늘었다") == (("3600",), ())
+    assert claim_signature("물가가 3.6% 올랐다") == (("3.6",), ())
+    assert claim_signature("그는 회의에 안 갔다") == ((), ("안",))
+    assert claim_signature("근거가 없다") == ((), ("없",))
+    # 단어 안의 '안'은 부정으로 보지 않음
+    assert claim_signature("안전 기준을 지켰다") == ((), ())
+
+
+def test_exact_hit_requires_same_signature(cache):
+    cache.store("물가가 3.6% 올랐다", "TRUE", 0.9, "통계청 발표")
+    assert normalize_claim("물가가 3.6% 올랐다") == normalize_claim("물가가 36% 올랐다")
+    assert cache.lookup("물가가 36% 올랐다") is None
+    match = cache.lookup("물가가  3.6% 올랐다.")
+    assert match is not None and match.similarity == 1.0
+
+
+def test_fuzzy_hit_requires_same_signature(cache):
+    cache.store("2023년 국내 출생아 수는 23만 명으로 역대 최저였다", "TRUE", 0.9, "")
+    assert cache.lookup("음 2023년 국내 출생아 수는 23만 명으로 역대 최저였어") is not None
+    assert cache.lookup("2013년 국내 출생아 수는 23만 명으로 역대 최저였다") is None
+
+
+def test_negated_claim_is_not_a_hit(cache):
+    cache.store("정부가 재난 지원금을 지급했다", "TRUE", 0.9, "")
+    assert cache.lookup("정부가 재난 지원금을 지급하지 않았다") is None
+    assert cache.lookup("정부가 재난 지원금을 안 지급했다") is None
+
+
+def test_jsonl_is_compacted(tmp_path, monkeypatch):
+    monkeypatch.setenv("VERDICT_CACHE_ENABLED", "1")
+    path = tmp_path / "verdicts.jsonl"
+    cache = VerdictCache(persist_path=str(path))
+    for i in range(250):
+        cache.store("같은 주장을 계속 다시 판정했다", "TRUE", i / 250, "")
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) <= 200
+    reloaded = VerdictCache(persist_path=str(path))
+    assert reloaded.lookup("같은 주장을 계속 다시 판정했다").entry.score == pytest.approx(249 / 250)